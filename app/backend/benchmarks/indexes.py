@@ -0,0 +1,182 @@
+"""
+Compara o conjunto de índices antigo de sales (um B-tree por coluna) com o da migração
+database/migrations/versions/0002_index_audit.py: vazão de inserção e latência das consultas
+do dashboard, da listagem e dos modelos gold do dbt.
+
+Cria duas tabelas temporárias com as mesmas colunas de sales, uma com cada conjunto de
+índices, e insere nelas as mesmas linhas geradas. Nada é gravado nas tabelas da aplicação.
+Executar a partir de app/backend, com o mesmo .env do backend (Postgres no ar):
+
+    python -m benchmarks.indexes --rows 500000
+"""
+import argparse
+import random
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+from psycopg2.extras import execute_values
+from database.database import engine
+
+TABLE_SQL = """
+CREATE TEMP TABLE {table} (
+    id SERIAL PRIMARY KEY,
+    email_employee VARCHAR,
+    email_customer VARCHAR,
+    first_name VARCHAR,
+    last_name VARCHAR,
+    phone_number VARCHAR,
+    price DOUBLE PRECISION,
+    quantity INTEGER,
+    name_product VARCHAR,
+    date TIMESTAMPTZ,
+    created_at TIMESTAMPTZ DEFAULT now()
+)
+"""
+
+# Índices criados pelos modelos antes da migração (index=True em todas as colunas, inclusive na chave)
+OLD_INDEXES = [
+    "CREATE INDEX ON {table} (id)",
+    *(
+        f"CREATE INDEX ON {{table}} ({column})"
+        for column in [
+            "email_employee", "email_customer", "first_name", "last_name", "phone_number",
+            "price", "quantity", "name_product", "date", "created_at",
+        ]
+    ),
+]
+
+NEW_INDEXES = [
+    "CREATE INDEX ON {table} (date, name_product)",
+    "CREATE INDEX ON {table} (email_employee, date)",
+    "CREATE INDEX ON {table} USING brin (created_at)",
+    "CREATE INDEX ON {table} (email_customer)",
+]
+
+# Consultas no formato das que a API e o dbt executam em sales
+QUERIES = {
+    "totais do período (dashboard)": """
+        SELECT sum(price), sum(quantity), count(*), count(DISTINCT name_product)
+        FROM {table} WHERE date >= %(start)s AND date <= %(end)s
+    """,
+    "receita por dia (dashboard)": """
+        SELECT date_trunc('day', date) AS day, sum(price)
+        FROM {table} WHERE date >= %(start)s AND date <= %(end)s GROUP BY 1 ORDER BY 1
+    """,
+    "top 10 produtos (dashboard)": """
+        SELECT name_product, sum(price) AS total
+        FROM {table} WHERE date >= %(start)s AND date <= %(end)s GROUP BY 1 ORDER BY 2 DESC LIMIT 10
+    """,
+    "vendas de um vendedor (filtro)": """
+        SELECT * FROM {table} WHERE email_employee = %(employee)s AND date >= %(start)s
+        ORDER BY id LIMIT 100
+    """,
+    "página ordenada por -date": """
+        SELECT * FROM {table} ORDER BY date DESC, id DESC LIMIT 100
+    """,
+    "gold_sales_7_days": """
+        SELECT date(date), name_product, sum(price), sum(quantity), count(*)
+        FROM {table} WHERE date >= %(last_week)s GROUP BY 1, 2 ORDER BY 1
+    """,
+    "gold_sales_by_seller": """
+        SELECT email_employee, date(date), sum(price), sum(quantity), count(*)
+        FROM {table} WHERE date >= %(last_week)s GROUP BY 1, 2 ORDER BY 2, 1
+    """,
+}
+
+
+def make_rows(count: int, days: int = 365) -> list:
+    random.seed(42)
+    end = datetime.now(timezone.utc)
+    employees = [f"vendedor{i}@empresa.com" for i in range(200)]
+    products = [f"Produto {i}" for i in range(50)]
+    return [
+        (
+            random.choice(employees),
+            f"cliente{i}@email.com",
+            "Maria",
+            "Silva",
+            f"+55 11 9{i:08d}",
+            round(random.uniform(10, 5000), 2),
+            random.randint(1, 10),
+            random.choice(products),
+            end - timedelta(seconds=random.randint(0, days * 86400)),
+        )
+        for i in range(count)
+    ]
+
+
+def insert_rows(cursor, table: str, rows: list, batch_size: int) -> float:
+    start = time.perf_counter()
+    for offset in range(0, len(rows), batch_size):
+        execute_values(
+            cursor,
+            f"INSERT INTO {table} (email_employee, email_customer, first_name, last_name, phone_number, "
+            f"price, quantity, name_product, date) VALUES %s",
+            rows[offset:offset + batch_size],
+        )
+    return time.perf_counter() - start
+
+
+def time_query(cursor, sql: str, params: dict, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        cursor.execute(sql, params)
+        cursor.fetchall()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--batch-size", type=int, default=5_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    end = datetime.now(timezone.utc)
+    params = {
+        "start": end - timedelta(days=30),
+        "end": end,
+        "last_week": end - timedelta(days=6),
+        "employee": rows[0][0],
+    }
+
+    connection = engine.raw_connection()
+    try:
+        cursor = connection.cursor()
+        results = {}
+        for name, indexes in (("antes", OLD_INDEXES), ("depois", NEW_INDEXES)):
+            table = f"bench_sales_{'old' if name == 'antes' else 'new'}"
+            cursor.execute(TABLE_SQL.format(table=table))
+            for index in indexes:
+                cursor.execute(index.format(table=table))
+            connection.commit()
+
+            elapsed = insert_rows(cursor, table, rows, args.batch_size)
+            connection.commit()
+            cursor.execute(f"ANALYZE {table}")
+            cursor.execute("SELECT pg_indexes_size(%s)", (table,))
+            index_bytes = cursor.fetchone()[0]
+
+            results[name] = {
+                "linhas/s": args.rows / elapsed,
+                "índices (MB)": index_bytes / 1024 / 1024,
+                **{query: time_query(cursor, sql.format(table=table), params, args.repeat) * 1000
+                   for query, sql in QUERIES.items()},
+            }
+        connection.rollback()
+    finally:
+        connection.close()
+
+    print(f"{args.rows} linhas, {len(OLD_INDEXES)} índices antes e {len(NEW_INDEXES)} depois (além da chave primária)")
+    print(f"{'':34} {'antes':>12} {'depois':>12}")
+    for metric in results["antes"]:
+        unit = "" if metric in ("linhas/s", "índices (MB)") else " ms"
+        label = metric + unit
+        print(f"{label:34} {results['antes'][metric]:>12.1f} {results['depois'][metric]:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
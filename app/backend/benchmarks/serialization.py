@@ -0,0 +1,76 @@
+"""
+Compara a serialização de uma página de vendas pelo caminho padrão do FastAPI
+(validação Pydantic por linha com response_model + json.dumps) com json_rows_response
+(campos lidos direto do ORM e serializados com orjson).
+
+Não acessa o banco: as linhas são objetos SalesModel montados em memória.
+Executar a partir de app/backend, com o mesmo .env do backend:
+
+    python -m benchmarks.serialization
+"""
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from typing import List
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+from models.sales.sales import SalesModel
+from models.sales.sales_schema import SalesResponse
+from routes.formats import json_rows_response
+
+SIZES = [1_000, 10_000, 100_000]
+REPEAT = 3
+
+
+def make_rows(count: int) -> list:
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return [
+        SalesModel(
+            id=i,
+            email_employee=f"vendedor{i % 50}@empresa.com",
+            email_customer=f"cliente{i}@email.com",
+            first_name="Maria",
+            last_name="Silva",
+            phone_number="+55 11 99999-0000",
+            date=start + timedelta(minutes=i),
+            price=round(10 + (i % 1000) * 0.37, 2),
+            quantity=1 + i % 5,
+            name_product=f"Produto {i % 200}",
+            created_at=start,
+        )
+        for i in range(count)
+    ]
+
+
+def fastapi_body(field, rows) -> bytes:
+    # Mesmo caminho de uma rota síncrona com response_model=List[SalesResponse]
+    content = asyncio.run(serialize_response(field=field, response_content=rows))
+    return JSONResponse(content).body
+
+
+def fast_body(rows) -> bytes:
+    return json_rows_response(rows, SalesResponse).body
+
+
+def best_of(function, *args) -> float:
+    timings = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        function(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    field = create_model_field(name="Response_read_all_sales_route", type_=List[SalesResponse], mode="serialization")
+    print(f"{'linhas':>8} {'response_model (s)':>20} {'orjson (s)':>12} {'ganho':>8}")
+    for size in SIZES:
+        rows = make_rows(size)
+        slow = best_of(fastapi_body, field, rows)
+        fast = best_of(fast_body, rows)
+        print(f"{size:>8} {slow:>20.4f} {fast:>12.4f} {slow / fast:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,364 @@
+import base64
+import json
+from datetime import datetime
+from sqlalchemy import DateTime, and_, delete, func, insert, inspect, or_, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, load_only
+
+# Tamanho padrão e limite máximo de uma página nas rotas de listagem
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+# Quantidade de linhas buscadas por vez do cursor do servidor nas respostas em streaming
+STREAM_BATCH_SIZE = 1000
+
+
+class InvalidCursorError(ValueError):
+    """
+    Erro lançado quando o cursor de paginação recebido não pode ser decodificado.
+    """
+    pass
+
+
+def encode_cursor(key) -> str:
+    """
+    Codifica a chave da última linha de uma página em um cursor opaco (base64 url-safe).
+    """
+    raw = json.dumps(key, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str):
+    """
+    Decodifica um cursor gerado por encode_cursor e retorna a chave original.
+
+    Raises:
+        InvalidCursorError: Se o cursor estiver malformado.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        return json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError) as e:
+        raise InvalidCursorError("Cursor de paginação inválido") from e
+
+
+def _cursor_value(column, value):
+    """
+    Converte o valor da coluna de ordenação guardado no cursor de volta para o tipo da coluna.
+    """
+    if isinstance(column.type, DateTime) and isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError as e:
+            raise InvalidCursorError("Cursor de paginação inválido") from e
+    return value
+
+
+def load_fields(model, fields: tuple = None) -> list:
+    """
+    Opções do SELECT que carregam do banco só as colunas pedidas no parâmetro fields das rotas.
+
+    A chave primária é sempre carregada. Sem fields, ou se algum campo não for uma coluna do
+    modelo (ex.: um computed_field do schema de resposta), todas as colunas são carregadas.
+    """
+    if not fields:
+        return []
+    attributes = inspect(model).column_attrs
+    if any(name not in attributes for name in fields):
+        return []
+    return [load_only(*(getattr(model, name) for name in fields))]
+
+
+def list_statement(
+    model,
+    key_column,
+    after: str = None,
+    clauses: list = None,
+    sort_column=None,
+    descending: bool = False,
+    fields: tuple = None,
+):
+    """
+    Monta o SELECT filtrado e ordenado, começando depois do cursor informado.
+
+    Sem sort_column a ordem é pela chave e o cursor é a própria chave. Com outra coluna,
+    a chave desempata a ordenação e o cursor guarda o par [valor, chave], comparado como
+    row value: (coluna, chave) > (valor, chave), o que continua usando o índice da coluna.
+    Os nulos da coluna vêm por último na ordem crescente e primeiro na decrescente, como no
+    padrão do Postgres (ver _after_sort_key).
+
+    Args:
+        clauses (list): Condições do WHERE.
+        sort_column: Coluna de ordenação, já validada pela rota (whitelist).
+        descending (bool): Ordem decrescente.
+        fields (tuple): Colunas a carregar (ver load_fields); a coluna de ordenação é incluída para o cursor.
+    """
+    stmt = select(model).where(*(clauses or []))
+    if fields:
+        sort_field = () if sort_column is None else (sort_column.key,)
+        stmt = stmt.options(*load_fields(model, tuple(fields) + sort_field))
+    by_key = sort_column is None or sort_column.key == key_column.key
+    if by_key:
+        stmt = stmt.order_by(key_column.desc() if descending else key_column)
+    else:
+        sort = sort_column.desc().nulls_first() if descending else sort_column.asc().nulls_last()
+        stmt = stmt.order_by(sort, key_column.desc() if descending else key_column)
+    if after is None:
+        return stmt
+
+    last_key = decode_cursor(after)
+    if by_key:
+        if not isinstance(last_key, int):
+            raise InvalidCursorError("Cursor de paginação inválido")
+        return stmt.where(key_column < last_key if descending else key_column > last_key)
+
+    if not (isinstance(last_key, list) and len(last_key) == 2 and isinstance(last_key[1], int)):
+        raise InvalidCursorError("Cursor de paginação inválido")
+    value = _cursor_value(sort_column, last_key[0])
+    return stmt.where(_after_sort_key(sort_column, key_column, value, last_key[1], descending))
+
+
+def _after_sort_key(sort_column, key_column, value, key, descending: bool):
+    """
+    Condição das linhas depois de (value, key) na ordem de list_statement.
+
+    A comparação de row values não vale para nulos ((NULL, 5) > (1, 2) é NULL), então eles
+    são tratados à parte: na ordem crescente vêm depois de todos os valores e, entre si, pela
+    chave; na decrescente vêm antes de todos os valores.
+    """
+    row, bound = tuple_(sort_column, key_column), (value, key)
+    if descending:
+        if value is None:
+            return or_(and_(sort_column.is_(None), key_column < key), sort_column.is_not(None))
+        return row < bound
+    if value is None:
+        return and_(sort_column.is_(None), key_column > key)
+    return or_(row > bound, sort_column.is_(None))
+
+
+def page_statement(model, key_column, limit: int, after: str = None, **kwargs):
+    """
+    Monta o SELECT de uma página ordenada pela chave (keyset pagination).
+
+    Busca uma linha a mais do que o limite para saber se existe uma próxima página,
+    sem precisar de COUNT nem de OFFSET.
+    """
+    return list_statement(model, key_column, after, **kwargs).limit(limit + 1)
+
+
+def split_page(rows: list, key_attr: str, limit: int, sort_attr: str = None):
+    """
+    Separa a linha extra buscada por page_statement e calcula o próximo cursor.
+
+    Returns:
+        tuple: (linhas da página, próximo cursor ou None se for a última página)
+    """
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    if sort_attr is None or sort_attr == key_attr:
+        return rows, encode_cursor(getattr(last, key_attr))
+    value = getattr(last, sort_attr)
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    return rows, encode_cursor([value, getattr(last, key_attr)])
+
+
+def paginate(db: Session, model, key_column, limit: int = DEFAULT_PAGE_SIZE, after: str = None, **kwargs):
+    """
+    Executa uma página da listagem de um modelo.
+
+    Args:
+        kwargs: clauses, sort_column, descending e fields, repassados para list_statement.
+
+    Returns:
+        tuple: (objetos da página, próximo cursor ou None)
+    """
+    limit = min(limit, MAX_PAGE_SIZE)
+    rows = db.scalars(page_statement(model, key_column, limit, after, **kwargs)).all()
+    return split_page(rows, key_column.key, limit, _sort_attr(kwargs))
+
+
+def _sort_attr(kwargs: dict):
+    sort_column = kwargs.get("sort_column")
+    return None if sort_column is None else sort_column.key
+
+
+def iter_partitions(db: Session, stmt, batch_size: int = STREAM_BATCH_SIZE):
+    """
+    Executa o SELECT com cursor do lado do servidor (yield_per) e gera as linhas em blocos.
+
+    Somente um bloco de objetos fica em memória por vez, independente do tamanho da tabela.
+    """
+    result = db.execute(stmt.execution_options(yield_per=batch_size))
+    yield from result.scalars().partitions()
+
+
+def bulk_insert(db: Session, model, key_column, rows: list, fill=None) -> list:
+    """
+    Insere várias linhas em uma única transação com INSERT ... VALUES (...), (...) RETURNING.
+
+    O SQLAlchemy agrupa as linhas em INSERTs de várias linhas (insertmanyvalues), então
+    o custo é de poucos round trips e um único commit, em vez de um commit por linha.
+
+    Args:
+        rows (list): Schemas Pydantic já validados.
+        fill (callable): Recebe a sessão e os dicionários das linhas e completa colunas
+            derivadas para o lote inteiro antes do INSERT (ver fill_sales_references).
+
+    Returns:
+        list: Chaves primárias das linhas inseridas, na mesma ordem de rows.
+    """
+    if not rows:
+        return []
+    values = [row.model_dump() for row in rows]
+    if fill is not None:
+        fill(db, values)
+    stmt = insert(model).returning(key_column, sort_by_parameter_order=True)
+    ids = db.scalars(stmt, values).all()
+    db.commit()
+    return ids
+
+
+def count_matching(db: Session, model, clauses: list) -> int:
+    """
+    Conta as linhas que atendem aos filtros, usado no modo dry_run das rotas em lote.
+    """
+    return db.scalar(select(func.count()).select_from(model).where(*clauses))
+
+
+def _mutate(db: Session, key_column, clauses: list, make_stmt, chunk_size: int = None) -> list:
+    """
+    Executa um UPDATE/DELETE ... WHERE ... RETURNING sobre as linhas filtradas.
+
+    Sem chunk_size, tudo é feito em um único comando. Com chunk_size, as linhas são
+    processadas em blocos pela chave primária (keyset), com um commit por bloco, para
+    não segurar locks por muito tempo em operações grandes.
+    """
+    if chunk_size is None:
+        ids = db.scalars(make_stmt(clauses)).all()
+        db.commit()
+        return ids
+
+    ids, last_key = [], None
+    while True:
+        chunk = select(key_column).where(*clauses).order_by(key_column).limit(chunk_size)
+        if last_key is not None:
+            chunk = chunk.where(key_column > last_key)
+        chunk_ids = db.scalars(make_stmt([key_column.in_(chunk.scalar_subquery())])).all()
+        db.commit()
+        ids.extend(chunk_ids)
+        if len(chunk_ids) < chunk_size:
+            return ids
+        last_key = max(chunk_ids)
+
+
+def settable_values(model, values: dict) -> dict:
+    """
+    Remove dos valores de um UPDATE os None enviados para colunas NOT NULL.
+
+    Nos schemas de atualização todos os campos são opcionais, então um null explícito
+    ({"date": null}) chega como None; nessas colunas ele é tratado como campo não enviado,
+    em vez de o banco recusar o UPDATE.
+    """
+    columns = model.__table__.columns
+    return {
+        name: value for name, value in values.items()
+        if value is not None or name not in columns or columns[name].nullable
+    }
+
+
+def bulk_update(db: Session, model, key_column, clauses: list, values: dict, chunk_size: int = None) -> list:
+    """
+    Atualiza todas as linhas filtradas com um UPDATE ... SET ... WHERE ... RETURNING id.
+
+    Se não sobrar nenhum valor depois de settable_values, nada é alterado e são retornadas
+    as linhas que atendem aos filtros.
+
+    Returns:
+        list: Chaves primárias das linhas atualizadas.
+    """
+    values = settable_values(model, values)
+    if not values:
+        return db.scalars(select(key_column).where(*clauses).order_by(key_column)).all()
+
+    def make_stmt(where):
+        return (
+            update(model).where(*where).values(**values).returning(key_column)
+            .execution_options(synchronize_session=False)
+        )
+    return _mutate(db, key_column, clauses, make_stmt, chunk_size)
+
+
+def bulk_delete(db: Session, model, key_column, clauses: list, chunk_size: int = None) -> list:
+    """
+    Remove todas as linhas filtradas com um DELETE ... WHERE ... RETURNING id.
+
+    Returns:
+        list: Chaves primárias das linhas removidas.
+    """
+    def make_stmt(where):
+        return (
+            delete(model).where(*where).returning(key_column)
+            .execution_options(synchronize_session=False)
+        )
+    return _mutate(db, key_column, clauses, make_stmt, chunk_size)
+
+
+def update_returning(db: Session, model, key_column, key, values: dict):
+    """
+    Atualiza uma linha pela chave primária com um único UPDATE ... SET ... WHERE ... RETURNING *.
+
+    Substitui o SELECT seguido de UPDATE: não há janela entre a leitura e a escrita, e o
+    objeto retornado já vem preenchido, sem um SELECT extra ao serializar a resposta.
+
+    Os None enviados para colunas NOT NULL são ignorados (ver settable_values).
+
+    Returns:
+        O objeto atualizado, ou None se nenhuma linha tiver a chave informada.
+    """
+    values = settable_values(model, values)
+    if not values:
+        return db.get(model, key)
+    stmt = (
+        update(model).where(key_column == key).values(**values).returning(model)
+        .execution_options(populate_existing=True)
+    )
+    db_obj = db.scalars(stmt).one_or_none()
+    if db_obj is not None:
+        # Desanexa o objeto para que o commit não o expire e a serialização não faça outro SELECT
+        db.expunge(db_obj)
+    db.commit()
+    return db_obj
+
+
+async def paginate_async(db: AsyncSession, model, key_column, limit: int = DEFAULT_PAGE_SIZE, after: str = None, **kwargs):
+    """
+    Versão assíncrona de paginate, usada pelas rotas do modo DB_ASYNC.
+
+    Returns:
+        tuple: (objetos da página, próximo cursor ou None)
+    """
+    limit = min(limit, MAX_PAGE_SIZE)
+    rows = (await db.scalars(page_statement(model, key_column, limit, after, **kwargs))).all()
+    return split_page(rows, key_column.key, limit, _sort_attr(kwargs))
+
+
+async def update_returning_async(db: AsyncSession, model, key_column, key, values: dict):
+    """
+    Versão assíncrona de update_returning.
+
+    Returns:
+        O objeto atualizado, ou None se nenhuma linha tiver a chave informada.
+    """
+    values = settable_values(model, values)
+    if not values:
+        return await db.get(model, key)
+    stmt = (
+        update(model).where(key_column == key).values(**values).returning(model)
+        .execution_options(populate_existing=True)
+    )
+    db_obj = (await db.scalars(stmt)).one_or_none()
+    await db.commit()
+    return db_obj
@@ -1,20 +1,44 @@
+from datetime import date
+from typing import List
+from sqlalchemy import Date, and_, cast, extract, func, literal_column, or_, select
 from sqlalchemy.orm import Session
-from models.employee.employee_schema import EmployeeUpdate, EmployeeCreate
+from crud.base import (
+    DEFAULT_PAGE_SIZE,
+    bulk_delete,
+    bulk_insert,
+    bulk_update,
+    count_matching,
+    iter_partitions,
+    list_statement,
+    load_fields,
+    paginate,
+    update_returning,
+)
+from models.employee.employee_schema import EmployeeUpdate, EmployeeCreate, EmployeeFilter, EmployeeAnalyticsFilter
 from models.employee.employee import EmployeeModel
 
 
-def get_employee(db: Session, employee_id: int):
+def get_employee(db: Session, employee_id: int, fields: tuple = None):
     """
     Função que recebe um id e retorna somente o funcionário correspondente
     """
-    return db.query(EmployeeModel).filter(EmployeeModel.employee_id == employee_id).first()
+    return db.query(EmployeeModel).options(*load_fields(EmployeeModel, fields)).filter(EmployeeModel.employee_id == employee_id).first()
 
 
-def get_employees(db: Session):
+def get_employees(db: Session, limit: int = DEFAULT_PAGE_SIZE, after: str = None, fields: tuple = None):
     """
-    Função que retorna todos os funcionários
+    Função que retorna uma página de funcionários, ordenada pelo id
+
+    Retorna uma tupla (itens, próximo cursor), o cursor é None na última página.
+    """
+    return paginate(db, EmployeeModel, EmployeeModel.employee_id, limit=limit, after=after, fields=fields)
+
+
+def stream_employees(db: Session, after: str = None, fields: tuple = None):
     """
-    return db.query(EmployeeModel).all()
+    Função que gera todos os funcionários em blocos, ordenados pelo id, para as respostas em streaming
+    """
+    return iter_partitions(db, list_statement(EmployeeModel, EmployeeModel.employee_id, after, fields=fields))
 
 
 def create_employee(db: Session, employee: EmployeeCreate):
@@ -28,6 +52,13 @@ def create_employee(db: Session, employee: EmployeeCreate):
     return db_employee
 
 
+def create_employees_bulk(db: Session, employees: List[EmployeeCreate]):
+    """
+    Função que cria vários funcionários em uma única transação e retorna os ids criados
+    """
+    return bulk_insert(db, EmployeeModel, EmployeeModel.employee_id, employees)
+
+
 def delete_employee(db: Session, employee_id: int):
     """
     Função que deleta um funcionário
@@ -40,17 +71,164 @@ def delete_employee(db: Session, employee_id: int):
 
 def update_employee(db: Session, employee_id: int, employee: EmployeeUpdate):
     """
-    Função que atualiza um funcionário
+    Função que atualiza um funcionário com um único UPDATE ... RETURNING; retorna None se ele não existir
     """
-    db_employee = db.query(EmployeeModel).filter(EmployeeModel.employee_id == employee_id).first()
+    return update_returning(db, EmployeeModel, EmployeeModel.employee_id, employee_id, employee.model_dump(exclude_unset=True))
 
-    if db_employee is None:
-        return None
 
-    update_data = employee.model_dump(exclude_unset=True)
-    for key, value in update_data.items():
-        setattr(db_employee, key, value)
+def employees_filter_clauses(filters: EmployeeFilter) -> list:
+    """
+    Função que traduz os filtros em condições do WHERE
+    """
+    clauses = []
+    if filters.ids:
+        clauses.append(EmployeeModel.employee_id.in_(filters.ids))
+    if filters.department_id is not None:
+        clauses.append(EmployeeModel.department_id == filters.department_id)
+    if filters.job_title is not None:
+        clauses.append(EmployeeModel.job_title == filters.job_title)
+    return clauses
 
-    db.commit()
-    db.refresh(db_employee)
-    return db_employee
+
+def count_employees(db: Session, filters: EmployeeFilter) -> int:
+    """
+    Função que conta os funcionários que atendem aos filtros
+    """
+    return count_matching(db, EmployeeModel, employees_filter_clauses(filters))
+
+
+def update_employees_bulk(db: Session, filters: EmployeeFilter, values: EmployeeUpdate, chunk_size: int = None):
+    """
+    Função que atualiza todos os funcionários filtrados com um único UPDATE e retorna os ids alterados
+    """
+    return bulk_update(
+        db, EmployeeModel, EmployeeModel.employee_id, employees_filter_clauses(filters),
+        values.model_dump(exclude_unset=True), chunk_size=chunk_size,
+    )
+
+
+def delete_employees_bulk(db: Session, filters: EmployeeFilter, chunk_size: int = None):
+    """
+    Função que remove todos os funcionários filtrados com um único DELETE e retorna os ids removidos
+    """
+    return bulk_delete(db, EmployeeModel, EmployeeModel.employee_id, employees_filter_clauses(filters), chunk_size=chunk_size)
+
+
+# Intervalo de um mês, usado na série de meses da folha salarial
+ONE_MONTH = literal_column("interval '1 month'")
+
+
+def _month(column):
+    """
+    Início do mês de uma coluna de data, com a unidade como literal para que o SELECT e o
+    GROUP BY tenham a mesma expressão.
+    """
+    return cast(func.date_trunc(literal_column("'month'"), column), Date)
+
+
+def employee_analytics_clauses(filters: EmployeeAnalyticsFilter) -> list:
+    """
+    Função que traduz o filtro de data de contratação em condições do WHERE
+    """
+    clauses = []
+    if filters.hire_date_from is not None:
+        clauses.append(EmployeeModel.hire_date >= filters.hire_date_from)
+    if filters.hire_date_to is not None:
+        clauses.append(EmployeeModel.hire_date <= filters.hire_date_to)
+    return clauses
+
+
+def get_payroll(db: Session, filters: EmployeeAnalyticsFilter) -> list:
+    """
+    Função que calcula a folha salarial mensal em uma única consulta
+
+    Gera os meses desde a primeira contratação até o mês atual com generate_series e junta
+    cada mês aos funcionários ativos nele (contratados até o fim do mês e sem término antes
+    do início do mês), somando os salários. O mês atual vem da data do backend, a mesma que
+    entra no ETag e na chave do cache (DATED_PATHS), e não do current_date do banco.
+    """
+    clauses = employee_analytics_clauses(filters) + [EmployeeModel.salary > 0]
+    first_month = select(func.min(EmployeeModel.hire_date)).where(*clauses).scalar_subquery()
+    months = func.generate_series(
+        func.date_trunc(literal_column("'month'"), first_month),
+        func.date_trunc(literal_column("'month'"), cast(date.today(), Date)),
+        ONE_MONTH,
+    ).table_valued("month").render_derived()
+    active = and_(
+        EmployeeModel.hire_date < months.c.month + ONE_MONTH,
+        or_(EmployeeModel.termination_date.is_(None), EmployeeModel.termination_date >= months.c.month),
+        *clauses,
+    )
+    stmt = (
+        select(
+            cast(months.c.month, Date).label("month"),
+            func.coalesce(func.sum(EmployeeModel.salary), 0).label("salary"),
+            func.count(EmployeeModel.employee_id).label("headcount"),
+        )
+        .select_from(months)
+        .outerjoin(EmployeeModel, active)
+        .group_by(months.c.month)
+        .order_by(months.c.month)
+    )
+    return [row._asdict() for row in db.execute(stmt)]
+
+
+def get_hires_by_month(db: Session, filters: EmployeeAnalyticsFilter) -> list:
+    """
+    Função que conta as contratações de cada mês
+    """
+    month = _month(EmployeeModel.hire_date)
+    stmt = (
+        select(month.label("month"), func.count(EmployeeModel.employee_id).label("hires"))
+        .where(EmployeeModel.hire_date.is_not(None), *employee_analytics_clauses(filters))
+        .group_by(month)
+        .order_by(month)
+    )
+    return [row._asdict() for row in db.execute(stmt)]
+
+
+def get_salary_by_title(db: Session, filters: EmployeeAnalyticsFilter) -> list:
+    """
+    Função que calcula a média salarial e a quantidade de funcionários de cada cargo
+    """
+    stmt = (
+        select(
+            EmployeeModel.job_title,
+            func.avg(EmployeeModel.salary).label("avg_salary"),
+            func.count(EmployeeModel.employee_id).label("employees"),
+        )
+        .where(EmployeeModel.salary > 0, *employee_analytics_clauses(filters))
+        .group_by(EmployeeModel.job_title)
+        .order_by(EmployeeModel.job_title)
+    )
+    return [row._asdict() for row in db.execute(stmt)]
+
+
+def get_gender_share(db: Session, filters: EmployeeAnalyticsFilter) -> list:
+    """
+    Função que calcula a quantidade e o percentual de funcionários de cada gênero
+    """
+    employees = func.count(EmployeeModel.employee_id)
+    stmt = (
+        select(
+            EmployeeModel.gender,
+            employees.label("employees"),
+            (employees * 100.0 / func.sum(employees).over()).label("percent"),
+        )
+        .where(*employee_analytics_clauses(filters))
+        .group_by(EmployeeModel.gender)
+        .order_by(employees.desc())
+    )
+    return [row._asdict() for row in db.execute(stmt)]
+
+
+def get_birthdays(db: Session, month: int, filters: EmployeeAnalyticsFilter) -> list:
+    """
+    Função que retorna os funcionários que fazem aniversário no mês, ordenados pelo dia
+    """
+    stmt = (
+        select(EmployeeModel.first_name, EmployeeModel.last_name, EmployeeModel.email, EmployeeModel.birth_date)
+        .where(extract("month", EmployeeModel.birth_date) == month, *employee_analytics_clauses(filters))
+        .order_by(extract("day", EmployeeModel.birth_date), EmployeeModel.employee_id)
+    )
+    return [row._asdict() for row in db.execute(stmt)]
@@ -0,0 +1,52 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from crud.base import DEFAULT_PAGE_SIZE, load_fields, paginate_async, update_returning_async
+from models.employee.employee_schema import EmployeeUpdate, EmployeeCreate
+from models.employee.employee import EmployeeModel
+
+
+async def get_employee(db: AsyncSession, employee_id: int, fields: tuple = None):
+    """
+    Função assíncrona que recebe um id e retorna somente o funcionário correspondente
+    """
+    return await db.get(EmployeeModel, employee_id, options=load_fields(EmployeeModel, fields))
+
+
+async def get_employees(db: AsyncSession, limit: int = DEFAULT_PAGE_SIZE, after: str = None, fields: tuple = None):
+    """
+    Função assíncrona que retorna uma página de funcionários, ordenada pelo id
+
+    Retorna uma tupla (itens, próximo cursor), o cursor é None na última página.
+    """
+    return await paginate_async(db, EmployeeModel, EmployeeModel.employee_id, limit=limit, after=after, fields=fields)
+
+
+async def create_employee(db: AsyncSession, employee: EmployeeCreate):
+    """
+    Função assíncrona que cria um novo funcionário
+    """
+    db_employee = EmployeeModel(**employee.model_dump())
+    db.add(db_employee)
+    await db.commit()
+    await db.refresh(db_employee)
+    return db_employee
+
+
+async def delete_employee(db: AsyncSession, employee_id: int):
+    """
+    Função assíncrona que deleta um funcionário; retorna None se ele não existir
+    """
+    db_employee = await db.get(EmployeeModel, employee_id)
+    if db_employee is None:
+        return None
+    await db.delete(db_employee)
+    await db.commit()
+    return db_employee
+
+
+async def update_employee(db: AsyncSession, employee_id: int, employee: EmployeeUpdate):
+    """
+    Função assíncrona que atualiza um funcionário com um único UPDATE ... RETURNING; retorna None se ele não existir
+    """
+    return await update_returning_async(
+        db, EmployeeModel, EmployeeModel.employee_id, employee_id, employee.model_dump(exclude_unset=True)
+    )
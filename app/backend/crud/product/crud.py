@@ -1,20 +1,42 @@
+from typing import List
 from sqlalchemy.orm import Session
-from models.product.product_schema import ProductUpdate, ProductCreate
+from crud.base import (
+    DEFAULT_PAGE_SIZE,
+    bulk_delete,
+    bulk_insert,
+    bulk_update,
+    count_matching,
+    iter_partitions,
+    list_statement,
+    load_fields,
+    paginate,
+    update_returning,
+)
+from models.product.product_schema import ProductUpdate, ProductCreate, ProductFilter
 from models.product.product import ProductModel
 
 
-def get_product(db: Session, product_id: int):
+def get_product(db: Session, product_id: int, fields: tuple = None):
     """
     funcao que recebe um id e retorna somente ele
     """
-    return db.query(ProductModel).filter(ProductModel.id == product_id).first()
+    return db.query(ProductModel).options(*load_fields(ProductModel, fields)).filter(ProductModel.id == product_id).first()
 
 
-def get_products(db: Session):
+def get_products(db: Session, limit: int = DEFAULT_PAGE_SIZE, after: str = None, fields: tuple = None):
     """
-    funcao que retorna todos os elementos
+    funcao que retorna uma pagina de elementos, ordenada pelo id
+
+    Retorna uma tupla (itens, próximo cursor), o cursor é None na última página.
     """
-    return db.query(ProductModel).all()
+    return paginate(db, ProductModel, ProductModel.id, limit=limit, after=after, fields=fields)
+
+
+def stream_products(db: Session, after: str = None, fields: tuple = None):
+    """
+    funcao que gera todos os elementos em blocos, ordenados pelo id, para as respostas em streaming
+    """
+    return iter_partitions(db, list_statement(ProductModel, ProductModel.id, after, fields=fields))
 
 
 def create_product(db: Session, product: ProductCreate):
@@ -25,6 +47,13 @@ def create_product(db: Session, product: ProductCreate):
     return db_product
 
 
+def create_products_bulk(db: Session, products: List[ProductCreate]):
+    """
+    funcao que cria varios produtos em uma unica transacao e retorna os ids criados
+    """
+    return bulk_insert(db, ProductModel, ProductModel.id, products)
+
+
 def delete_product(db: Session, product_id: int):
     db_product = db.query(ProductModel).filter(ProductModel.id == product_id).first()
     db.delete(db_product)
@@ -33,21 +62,47 @@ def delete_product(db: Session, product_id: int):
 
 
 def update_product(db: Session, product_id: int, product: ProductUpdate):
-    db_product = db.query(ProductModel).filter(ProductModel.id == product_id).first()
+    """
+    funcao que atualiza um produto com um unico UPDATE ... RETURNING; retorna None se ele nao existir
+    """
+    return update_returning(db, ProductModel, ProductModel.id, product_id, product.model_dump(exclude_unset=True))
+
 
-    if db_product is None:
-        return None
+def products_filter_clauses(filters: ProductFilter) -> list:
+    """
+    funcao que traduz os filtros em condicoes do WHERE
+    """
+    clauses = []
+    if filters.ids:
+        clauses.append(ProductModel.id.in_(filters.ids))
+    if filters.categoria is not None:
+        clauses.append(ProductModel.categoria == filters.categoria.value)
+    if filters.email_fornecedor is not None:
+        clauses.append(ProductModel.email_fornecedor == filters.email_fornecedor)
+    if filters.supplier_id is not None:
+        clauses.append(ProductModel.supplier_id == filters.supplier_id)
+    return clauses
 
-    if product.name is not None:
-        db_product.name = product.name
-    if product.description is not None:
-        db_product.description = product.description
-    if product.price is not None:
-        db_product.price = product.price
-    if product.categoria is not None:
-        db_product.categoria = product.categoria
-    if product.email_fornecedor is not None:
-        db_product.email_fornecedor = product.email_fornecedor
 
-    db.commit()
-    return db_product
\ No newline at end of file
+def count_products(db: Session, filters: ProductFilter) -> int:
+    """
+    funcao que conta os elementos que atendem aos filtros
+    """
+    return count_matching(db, ProductModel, products_filter_clauses(filters))
+
+
+def update_products_bulk(db: Session, filters: ProductFilter, values: ProductUpdate, chunk_size: int = None):
+    """
+    funcao que atualiza todos os elementos filtrados com um unico UPDATE e retorna os ids alterados
+    """
+    return bulk_update(
+        db, ProductModel, ProductModel.id, products_filter_clauses(filters),
+        values.model_dump(exclude_unset=True), chunk_size=chunk_size,
+    )
+
+
+def delete_products_bulk(db: Session, filters: ProductFilter, chunk_size: int = None):
+    """
+    funcao que remove todos os elementos filtrados com um unico DELETE e retorna os ids removidos
+    """
+    return bulk_delete(db, ProductModel, ProductModel.id, products_filter_clauses(filters), chunk_size=chunk_size)
@@ -0,0 +1,46 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from crud.base import DEFAULT_PAGE_SIZE, load_fields, paginate_async, update_returning_async
+from models.product.product_schema import ProductUpdate, ProductCreate
+from models.product.product import ProductModel
+
+
+async def get_product(db: AsyncSession, product_id: int, fields: tuple = None):
+    """
+    funcao assincrona que recebe um id e retorna somente ele
+    """
+    return await db.get(ProductModel, product_id, options=load_fields(ProductModel, fields))
+
+
+async def get_products(db: AsyncSession, limit: int = DEFAULT_PAGE_SIZE, after: str = None, fields: tuple = None):
+    """
+    funcao assincrona que retorna uma pagina de elementos, ordenada pelo id
+
+    Retorna uma tupla (itens, próximo cursor), o cursor é None na última página.
+    """
+    return await paginate_async(db, ProductModel, ProductModel.id, limit=limit, after=after, fields=fields)
+
+
+async def create_product(db: AsyncSession, product: ProductCreate):
+    db_product = ProductModel(**product.model_dump())
+    db.add(db_product)
+    await db.commit()
+    await db.refresh(db_product)
+    return db_product
+
+
+async def delete_product(db: AsyncSession, product_id: int):
+    db_product = await db.get(ProductModel, product_id)
+    if db_product is None:
+        return None
+    await db.delete(db_product)
+    await db.commit()
+    return db_product
+
+
+async def update_product(db: AsyncSession, product_id: int, product: ProductUpdate):
+    """
+    funcao assincrona que atualiza um produto com um unico UPDATE ... RETURNING; retorna None se ele nao existir
+    """
+    return await update_returning_async(
+        db, ProductModel, ProductModel.id, product_id, product.model_dump(exclude_unset=True)
+    )
@@ -1,20 +1,122 @@
+from typing import List
+from sqlalchemy import func, literal_column, select
 from sqlalchemy.orm import Session
-from models.sales.sales_schema import SalesUpdate, SalesCreate
+from crud.base import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    bulk_delete,
+    bulk_insert,
+    bulk_update,
+    count_matching,
+    iter_partitions,
+    list_statement,
+    load_fields,
+    page_statement,
+    paginate,
+    split_page,
+    update_returning,
+)
+from models.sales.sales_schema import (
+    SalesUpdate,
+    SalesCreate,
+    SalesFilter,
+    SalesGroupBy,
+    SalesListFilter,
+    SalesMetric,
+    SalesRangeFilter,
+)
 from models.sales.sales import SalesModel
+from models.employee.employee import EmployeeModel
+from models.product.product import ProductModel
+from database.archive import query_archive
 
 
-def get_sales_by_id(db: Session, sales_id: int):
+def get_sales_by_id(db: Session, sales_id: int, fields: tuple = None):
     """
     funcao que recebe um id e retorna somente ele
     """
-    return db.query(SalesModel).filter(SalesModel.id == sales_id).first()
+    return db.query(SalesModel).options(*load_fields(SalesModel, fields)).filter(SalesModel.id == sales_id).first()
 
 
-def get_sales(db: Session):
+def sales_list_clauses(filters: SalesRangeFilter) -> list:
     """
-    funcao que retorna todos os elementos
+    funcao que traduz os filtros da listagem em condicoes do WHERE sobre colunas indexadas
     """
-    return db.query(SalesModel).all()
+    clauses = []
+    if filters.date_from is not None:
+        clauses.append(SalesModel.date >= filters.date_from)
+    if filters.date_to is not None:
+        clauses.append(SalesModel.date <= filters.date_to)
+    if filters.email_employee is not None:
+        clauses.append(SalesModel.email_employee == filters.email_employee)
+    if filters.email_customer is not None:
+        clauses.append(SalesModel.email_customer == filters.email_customer)
+    if filters.name_product is not None:
+        clauses.append(SalesModel.name_product == filters.name_product)
+    if filters.employee_id is not None:
+        clauses.append(SalesModel.employee_id == filters.employee_id)
+    if filters.product_id is not None:
+        clauses.append(SalesModel.product_id == filters.product_id)
+    if filters.min_price is not None:
+        clauses.append(SalesModel.price >= filters.min_price)
+    if filters.max_price is not None:
+        clauses.append(SalesModel.price <= filters.max_price)
+    return clauses
+
+
+def sales_list_options(filters: SalesListFilter = None) -> dict:
+    """
+    funcao que monta os argumentos de filtro e ordenacao usados por list_statement
+    """
+    if filters is None:
+        return {}
+    return {
+        "clauses": sales_list_clauses(filters),
+        "sort_column": getattr(SalesModel, filters.order_by.column),
+        "descending": filters.order_by.descending,
+    }
+
+
+def get_sales(db: Session, limit: int = DEFAULT_PAGE_SIZE, after: str = None, filters: SalesListFilter = None, fields: tuple = None):
+    """
+    funcao que retorna uma pagina de elementos filtrados, ordenada pelo id ou pela coluna de filters.order_by
+
+    Retorna uma tupla (itens, próximo cursor), o cursor é None na última página.
+    """
+    return paginate(db, SalesModel, SalesModel.id, limit=limit, after=after, fields=fields, **sales_list_options(filters))
+
+
+def get_sales_history(db: Session, limit: int = DEFAULT_PAGE_SIZE, after: str = None, filters: SalesListFilter = None, fields: tuple = None):
+    """
+    funcao que retorna uma pagina de vendas do Postgres e das vendas arquivadas em Parquet juntas
+
+    O mesmo SELECT da listagem roda nas duas camadas (no DuckDB para os arquivos); as duas páginas
+    vêm na mesma ordem e são intercaladas, então o cursor é o mesmo de get_sales. Durante o
+    arquivamento uma venda pode estar nas duas camadas; a cópia do Parquet é descartada.
+    """
+    limit = min(limit, MAX_PAGE_SIZE)
+    options = sales_list_options(filters)
+    stmt = page_statement(SalesModel, SalesModel.id, limit, after, fields=fields, **options)
+    rows = db.scalars(stmt).all()
+    ids = {row.id for row in rows}
+    rows += [row for row in query_archive(stmt) if row.id not in ids]
+
+    sort_attr = options["sort_column"].key if options else "id"
+
+    def sort_key(row):
+        # Nulos por último na ordem crescente e primeiro na decrescente, como no Postgres
+        value = getattr(row, sort_attr)
+        return value is None, value, row.id
+
+    rows.sort(key=sort_key, reverse=options.get("descending", False))
+    return split_page(rows[:limit + 1], "id", limit, sort_attr)
+
+
+def stream_sales(db: Session, after: str = None, filters: SalesListFilter = None, fields: tuple = None):
+    """
+    funcao que gera todos os elementos filtrados em blocos, na mesma ordem da listagem, para as respostas em streaming
+    """
+    return iter_partitions(db, list_statement(SalesModel, SalesModel.id, after, fields=fields, **sales_list_options(filters)))
 
 
 def create_sales(db: Session, sales: SalesCreate):
@@ -25,6 +127,33 @@ def create_sales(db: Session, sales: SalesCreate):
     return db_sales
 
 
+def fill_sales_references(db: Session, values: List[dict]):
+    """
+    funcao que preenche employee_id e product_id de um lote de vendas com um SELECT por tabela,
+    pela mesma regra do trigger sales_fill_references (nome de produto repetido fica com o menor id)
+
+    Vendas que chegam com os dois ids nao passam pelo trigger (ver database/migrations/versions/0008_sales_references_insert.py)
+    """
+    emails = {row["email_employee"] for row in values}
+    names = {row["name_product"] for row in values}
+    employees = dict(db.execute(
+        select(EmployeeModel.email, EmployeeModel.employee_id).where(EmployeeModel.email.in_(emails))
+    ).all())
+    products = dict(db.execute(
+        select(ProductModel.name, func.min(ProductModel.id)).where(ProductModel.name.in_(names)).group_by(ProductModel.name)
+    ).all())
+    for row in values:
+        row["employee_id"] = employees.get(row["email_employee"])
+        row["product_id"] = products.get(row["name_product"])
+
+
+def create_sales_bulk(db: Session, sales: List[SalesCreate]):
+    """
+    funcao que cria varias vendas em uma unica transacao e retorna os ids criados
+    """
+    return bulk_insert(db, SalesModel, SalesModel.id, sales, fill=fill_sales_references)
+
+
 def delete_sales(db: Session, sales_id: int):
     db_sales = db.query(SalesModel).filter(SalesModel.id == sales_id).first()
     db.delete(db_sales)
@@ -33,29 +162,99 @@ def delete_sales(db: Session, sales_id: int):
 
 
 def update_sales(db: Session, sales_id: int, sales: SalesUpdate):
-    db_sales = db.query(SalesModel).filter(SalesModel.id == sales_id).first()
+    """
+    funcao que atualiza uma venda com um unico UPDATE ... RETURNING; retorna None se ela nao existir
+    """
+    return update_returning(db, SalesModel, SalesModel.id, sales_id, sales.model_dump(exclude_unset=True))
 
-    if db_sales is None:
-        return None
-
-    if sales.email_employee is not None:
-        db_sales.email_employee = sales.email_employee
-    if sales.email_customer is not None:
-        db_sales.email_customer = sales.email_customer
-    if sales.first_name is not None:
-        db_sales.first_name = sales.first_name
-    if sales.last_name is not None:
-        db_sales.last_name = sales.last_name
-    if sales.phone_number is not None:
-        db_sales.phone_number = sales.phone_number
-    if sales.price is not None:
-        db_sales.price = sales.price
-    if sales.quantity is not None:
-        db_sales.quantity = sales.quantity
-    if sales.name_product is not None:
-        db_sales.name_product = sales.name_product
-    if sales.date is not None:
-        db_sales.date = sales.date    
 
-    db.commit()
-    return db_sales
\ No newline at end of file
+def sales_filter_clauses(filters: SalesFilter) -> list:
+    """
+    funcao que traduz os filtros em condicoes do WHERE
+    """
+    clauses = []
+    if filters.ids:
+        clauses.append(SalesModel.id.in_(filters.ids))
+    if filters.email_employee is not None:
+        clauses.append(SalesModel.email_employee == filters.email_employee)
+    if filters.name_product is not None:
+        clauses.append(SalesModel.name_product == filters.name_product)
+    if filters.employee_id is not None:
+        clauses.append(SalesModel.employee_id == filters.employee_id)
+    if filters.product_id is not None:
+        clauses.append(SalesModel.product_id == filters.product_id)
+    if filters.date_gte is not None:
+        clauses.append(SalesModel.date >= filters.date_gte)
+    if filters.date_lt is not None:
+        clauses.append(SalesModel.date < filters.date_lt)
+    return clauses
+
+
+def count_sales(db: Session, filters: SalesFilter) -> int:
+    """
+    funcao que conta os elementos que atendem aos filtros
+    """
+    return count_matching(db, SalesModel, sales_filter_clauses(filters))
+
+
+def update_sales_bulk(db: Session, filters: SalesFilter, values: SalesUpdate, chunk_size: int = None):
+    """
+    funcao que atualiza todos os elementos filtrados com um unico UPDATE e retorna os ids alterados
+    """
+    return bulk_update(
+        db, SalesModel, SalesModel.id, sales_filter_clauses(filters),
+        values.model_dump(exclude_unset=True), chunk_size=chunk_size,
+    )
+
+
+def delete_sales_bulk(db: Session, filters: SalesFilter, chunk_size: int = None):
+    """
+    funcao que remove todos os elementos filtrados com um unico DELETE e retorna os ids removidos
+    """
+    return bulk_delete(db, SalesModel, SalesModel.id, sales_filter_clauses(filters), chunk_size=chunk_size)
+
+
+# Expressão SQL de cada métrica de GET /sales/aggregates
+SALES_METRICS = {
+    SalesMetric.sum_price: lambda: func.sum(SalesModel.price),
+    SalesMetric.sum_quantity: lambda: func.sum(SalesModel.quantity),
+    SalesMetric.count: lambda: func.count(SalesModel.id),
+    SalesMetric.count_distinct_product: lambda: func.count(SalesModel.name_product.distinct()),
+    SalesMetric.count_distinct_customer: lambda: func.count(SalesModel.email_customer.distinct()),
+    SalesMetric.count_distinct_employee: lambda: func.count(SalesModel.email_employee.distinct()),
+}
+
+
+def aggregate_sales(
+    db: Session,
+    metrics: List[SalesMetric],
+    group_by: SalesGroupBy = None,
+    top: int = None,
+    filters: SalesRangeFilter = None,
+) -> list:
+    """
+    funcao que calcula as metricas no banco com um unico SELECT ... GROUP BY
+
+    As faixas de data usam date_trunc sobre a coluna date. Com top, retorna somente os
+    grupos com o maior valor da primeira metrica (os grupos em que ela e nula, como sum_price
+    sem nenhum preco, ficam por ultimo); sem top, os grupos vem ordenados pela chave.
+
+    Retorna uma lista de dicionarios com a chave do grupo (key) e uma entrada por metrica.
+    """
+    columns = [SALES_METRICS[metric]().label(metric.value) for metric in metrics]
+    clauses = sales_list_clauses(filters) if filters is not None else []
+    if group_by is None:
+        return [db.execute(select(*columns).where(*clauses)).one()._asdict()]
+
+    if group_by.is_date_bucket:
+        # A unidade vai como literal (vem do enum) para que o SELECT e o GROUP BY tenham a mesma
+        # expressão mesmo em drivers que numeram os parâmetros ($1, $2)
+        key = func.date_trunc(literal_column(f"'{group_by.value}'"), SalesModel.date)
+    else:
+        key = getattr(SalesModel, group_by.value)
+    stmt = select(key.label("key"), *columns).where(*clauses).group_by(key)
+    if top is not None:
+        stmt = stmt.order_by(columns[0].desc().nulls_last(), key).limit(top)
+    else:
+        stmt = stmt.order_by(key)
+    return [row._asdict() for row in db.execute(stmt)]
@@ -0,0 +1,47 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from crud.base import DEFAULT_PAGE_SIZE, load_fields, paginate_async, update_returning_async
+from crud.sales.crud import sales_list_options
+from models.sales.sales_schema import SalesUpdate, SalesCreate, SalesListFilter
+from models.sales.sales import SalesModel
+
+
+async def get_sales_by_id(db: AsyncSession, sales_id: int, fields: tuple = None):
+    """
+    funcao assincrona que recebe um id e retorna somente ele
+    """
+    return await db.get(SalesModel, sales_id, options=load_fields(SalesModel, fields))
+
+
+async def get_sales(db: AsyncSession, limit: int = DEFAULT_PAGE_SIZE, after: str = None, filters: SalesListFilter = None, fields: tuple = None):
+    """
+    funcao assincrona que retorna uma pagina de elementos filtrados, ordenada pelo id ou pela coluna de filters.order_by
+
+    Retorna uma tupla (itens, próximo cursor), o cursor é None na última página.
+    """
+    return await paginate_async(
+        db, SalesModel, SalesModel.id, limit=limit, after=after, fields=fields, **sales_list_options(filters)
+    )
+
+
+async def create_sales(db: AsyncSession, sales: SalesCreate):
+    db_sales = SalesModel(**sales.model_dump())
+    db.add(db_sales)
+    await db.commit()
+    await db.refresh(db_sales)
+    return db_sales
+
+
+async def delete_sales(db: AsyncSession, sales_id: int):
+    db_sales = await db.get(SalesModel, sales_id)
+    if db_sales is None:
+        return None
+    await db.delete(db_sales)
+    await db.commit()
+    return db_sales
+
+
+async def update_sales(db: AsyncSession, sales_id: int, sales: SalesUpdate):
+    """
+    funcao assincrona que atualiza uma venda com um unico UPDATE ... RETURNING; retorna None se ela nao existir
+    """
+    return await update_returning_async(db, SalesModel, SalesModel.id, sales_id, sales.model_dump(exclude_unset=True))
@@ -1,20 +1,42 @@
+from typing import List
 from sqlalchemy.orm import Session
-from models.supplier.supplier_schema import SupplierUpdate, SupplierCreate
+from crud.base import (
+    DEFAULT_PAGE_SIZE,
+    bulk_delete,
+    bulk_insert,
+    bulk_update,
+    count_matching,
+    iter_partitions,
+    list_statement,
+    load_fields,
+    paginate,
+    update_returning,
+)
+from models.supplier.supplier_schema import SupplierUpdate, SupplierCreate, SupplierFilter
 from models.supplier.supplier import SupplierModel
 
 
-def get_supplier(db: Session, supplier_id: int):
+def get_supplier(db: Session, supplier_id: int, fields: tuple = None):
     """
     Função que recebe um id e retorna somente o fornecedor correspondente
     """
-    return db.query(SupplierModel).filter(SupplierModel.supplier_id == supplier_id).first()
+    return db.query(SupplierModel).options(*load_fields(SupplierModel, fields)).filter(SupplierModel.supplier_id == supplier_id).first()
 
 
-def get_suppliers(db: Session):
+def get_suppliers(db: Session, limit: int = DEFAULT_PAGE_SIZE, after: str = None, fields: tuple = None):
     """
-    Função que retorna todos os fornecedores
+    Função que retorna uma página de fornecedores, ordenada pelo id
+
+    Retorna uma tupla (itens, próximo cursor), o cursor é None na última página.
     """
-    return db.query(SupplierModel).all()
+    return paginate(db, SupplierModel, SupplierModel.supplier_id, limit=limit, after=after, fields=fields)
+
+
+def stream_suppliers(db: Session, after: str = None, fields: tuple = None):
+    """
+    Função que gera todos os fornecedores em blocos, ordenados pelo id, para as respostas em streaming
+    """
+    return iter_partitions(db, list_statement(SupplierModel, SupplierModel.supplier_id, after, fields=fields))
 
 
 def create_supplier(db: Session, supplier: SupplierCreate):
@@ -28,6 +50,13 @@ def create_supplier(db: Session, supplier: SupplierCreate):
     return db_supplier
 
 
+def create_suppliers_bulk(db: Session, suppliers: List[SupplierCreate]):
+    """
+    Função que cria vários fornecedores em uma única transação e retorna os ids criados
+    """
+    return bulk_insert(db, SupplierModel, SupplierModel.supplier_id, suppliers)
+
+
 def delete_supplier(db: Session, supplier_id: int):
     """
     Função que deleta um fornecedor
@@ -40,18 +69,42 @@ def delete_supplier(db: Session, supplier_id: int):
 
 def update_supplier(db: Session, supplier_id: int, supplier: SupplierUpdate):
     """
-    Função que atualiza um fornecedor
+    Função que atualiza um fornecedor com um único UPDATE ... RETURNING; retorna None se ele não existir
     """
-    db_supplier = db.query(SupplierModel).filter(SupplierModel.supplier_id == supplier_id).first()
+    return update_returning(db, SupplierModel, SupplierModel.supplier_id, supplier_id, supplier.model_dump(exclude_unset=True))
 
-    if db_supplier is None:
-        return None
 
-    update_data = supplier.model_dump(exclude_unset=True)
-    for key, value in update_data.items():
-        setattr(db_supplier, key, value)
+def suppliers_filter_clauses(filters: SupplierFilter) -> list:
+    """
+    Função que traduz os filtros em condições do WHERE
+    """
+    clauses = []
+    if filters.ids:
+        clauses.append(SupplierModel.supplier_id.in_(filters.ids))
+    if filters.product_categories is not None:
+        clauses.append(SupplierModel.product_categories == filters.product_categories.value)
+    return clauses
+
+
+def count_suppliers(db: Session, filters: SupplierFilter) -> int:
+    """
+    Função que conta os fornecedores que atendem aos filtros
+    """
+    return count_matching(db, SupplierModel, suppliers_filter_clauses(filters))
 
-    db.commit()
-    db.refresh(db_supplier)
-    return db_supplier
 
+def update_suppliers_bulk(db: Session, filters: SupplierFilter, values: SupplierUpdate, chunk_size: int = None):
+    """
+    Função que atualiza todos os fornecedores filtrados com um único UPDATE e retorna os ids alterados
+    """
+    return bulk_update(
+        db, SupplierModel, SupplierModel.supplier_id, suppliers_filter_clauses(filters),
+        values.model_dump(exclude_unset=True), chunk_size=chunk_size,
+    )
+
+
+def delete_suppliers_bulk(db: Session, filters: SupplierFilter, chunk_size: int = None):
+    """
+    Função que remove todos os fornecedores filtrados com um único DELETE e retorna os ids removidos
+    """
+    return bulk_delete(db, SupplierModel, SupplierModel.supplier_id, suppliers_filter_clauses(filters), chunk_size=chunk_size)
@@ -0,0 +1,52 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from crud.base import DEFAULT_PAGE_SIZE, load_fields, paginate_async, update_returning_async
+from models.supplier.supplier_schema import SupplierUpdate, SupplierCreate
+from models.supplier.supplier import SupplierModel
+
+
+async def get_supplier(db: AsyncSession, supplier_id: int, fields: tuple = None):
+    """
+    Função assíncrona que recebe um id e retorna somente o fornecedor correspondente
+    """
+    return await db.get(SupplierModel, supplier_id, options=load_fields(SupplierModel, fields))
+
+
+async def get_suppliers(db: AsyncSession, limit: int = DEFAULT_PAGE_SIZE, after: str = None, fields: tuple = None):
+    """
+    Função assíncrona que retorna uma página de fornecedores, ordenada pelo id
+
+    Retorna uma tupla (itens, próximo cursor), o cursor é None na última página.
+    """
+    return await paginate_async(db, SupplierModel, SupplierModel.supplier_id, limit=limit, after=after, fields=fields)
+
+
+async def create_supplier(db: AsyncSession, supplier: SupplierCreate):
+    """
+    Função assíncrona que cria um novo fornecedor
+    """
+    db_supplier = SupplierModel(**supplier.model_dump())
+    db.add(db_supplier)
+    await db.commit()
+    await db.refresh(db_supplier)
+    return db_supplier
+
+
+async def delete_supplier(db: AsyncSession, supplier_id: int):
+    """
+    Função assíncrona que deleta um fornecedor; retorna None se ele não existir
+    """
+    db_supplier = await db.get(SupplierModel, supplier_id)
+    if db_supplier is None:
+        return None
+    await db.delete(db_supplier)
+    await db.commit()
+    return db_supplier
+
+
+async def update_supplier(db: AsyncSession, supplier_id: int, supplier: SupplierUpdate):
+    """
+    Função assíncrona que atualiza um fornecedor com um único UPDATE ... RETURNING; retorna None se ele não existir
+    """
+    return await update_returning_async(
+        db, SupplierModel, SupplierModel.supplier_id, supplier_id, supplier.model_dump(exclude_unset=True)
+    )
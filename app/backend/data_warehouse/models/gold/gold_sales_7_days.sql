@@ -1,9 +1,12 @@
 {{ config(materialized='view') }}
 
+-- Agrupa pelo id do produto (inteiro) e busca o nome atual em products; vendas sem product_id
+-- ficam em um único grupo com o nome registrado na venda
 WITH sales_seven_days AS (
     SELECT 
         data, 
-        produto, 
+        product_id, 
+        MIN(produto) AS produto_venda, 
         SUM(valor) AS total_valor, 
         SUM(quantidade) AS total_quantidade, 
         COUNT(*) AS total_vendas
@@ -12,16 +15,17 @@ WITH sales_seven_days AS (
     WHERE 
         data >= CURRENT_DATE - INTERVAL '6 days'
     GROUP BY 
-        data, produto
+        data, product_id
 )
 
 SELECT 
-    data, 
-    produto, 
-    total_valor, 
-    total_quantidade, 
-    total_vendas
+    s.data, 
+    COALESCE(p.name, s.produto_venda) AS produto, 
+    s.total_valor, 
+    s.total_quantidade, 
+    s.total_vendas
 FROM 
-    sales_seven_days
+    sales_seven_days AS s
+    LEFT JOIN {{ source('raw_sales', 'products') }} AS p ON p.id = s.product_id
 ORDER BY 
-    data ASC
\ No newline at end of file
+    s.data ASC
\ No newline at end of file
@@ -1,8 +1,11 @@
 {{ config(materialized='view') }}
 
+-- Agrupa pelo id do vendedor (inteiro) e busca o email atual em employees; vendas sem employee_id
+-- ficam em um único grupo com o email registrado na venda
 WITH sales_seven_days_seller AS (
     SELECT 
-        email AS vendedor, 
+        employee_id, 
+        MIN(email) AS email_venda, 
         DATE(data) AS data, 
         SUM(valor) AS total_valor, 
         SUM(quantidade) AS total_quantidade, 
@@ -12,16 +15,17 @@ WITH sales_seven_days_seller AS (
     WHERE 
         data >= CURRENT_DATE - INTERVAL '6 days'
     GROUP BY 
-        email, DATE(data)
+        employee_id, DATE(data)
 )
 
 SELECT 
-    vendedor, 
-    data, 
-    total_valor, 
-    total_quantidade, 
-    total_vendas
+    COALESCE(e.email, s.email_venda) AS vendedor, 
+    s.data, 
+    s.total_valor, 
+    s.total_quantidade, 
+    s.total_vendas
 FROM 
-    sales_seven_days_seller
+    sales_seven_days_seller AS s
+    LEFT JOIN {{ source('raw_sales', 'employees') }} AS e ON e.employee_id = s.employee_id
 ORDER BY 
-    data ASC, vendedor ASC
\ No newline at end of file
+    s.data ASC, vendedor ASC
\ No newline at end of file
@@ -2,17 +2,19 @@
 
 WITH silver_sales AS (
     SELECT 
-        email, 
-        DATE(data) AS data,
-        round(cast(valor as decimal(10, 2)), 2) as valor, 
-        quantidade, 
-        produto
+        employee_id,
+        email_employee AS email, 
+        DATE(date) AS data,
+        round(cast(price as decimal(10, 2)), 2) as valor, 
+        quantity AS quantidade, 
+        product_id,
+        name_product AS produto
     FROM 
         {{ ref('bronze_sales') }}
     WHERE 
-        valor > 0 
-        AND valor < 8000
-        AND data <= CURRENT_DATE
+        price > 0 
+        AND price < 8000
+        AND date <= CURRENT_DATE
 )
 
 SELECT * FROM silver_sales
\ No newline at end of file
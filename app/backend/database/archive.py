@@ -0,0 +1,225 @@
+"""
+Arquivamento das vendas antigas em Parquet (camada fria) e leitura unificada com as vendas do Postgres.
+
+As vendas com date anterior ao horizonte (início do mês corrente menos SALES_ARCHIVE_AFTER_MONTHS
+meses) saem de sales e vão para SALES_ARCHIVE_DIR, um arquivo por partição e mês em
+year=AAAA/month=MM/, ordenado por date e com estatísticas (mín./máx.) por row group. GET /sales/history
+lê as duas camadas: o Postgres com o SELECT de sempre e os arquivos com o mesmo SELECT executado no DuckDB.
+
+A partir de app/backend, com o mesmo .env do backend:
+
+    python -m database.archive --months 12 [--dry-run]
+"""
+import argparse
+import glob
+import logging
+import os
+from datetime import datetime, timezone
+import duckdb
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy.dialects import postgresql
+from database.partitions import DETACH_LOCK_TIMEOUT, SALES_CHANGED_SQL, list_sales_partitions
+from models.sales.sales import SalesModel
+from routes.formats import arrow_schema
+
+logger = logging.getLogger(__name__)
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SALES_ARCHIVE_DIR = os.getenv("SALES_ARCHIVE_DIR", os.path.join(BACKEND_DIR, "datasets", "archive", "sales"))
+SALES_ARCHIVE_AFTER_MONTHS = int(os.getenv("SALES_ARCHIVE_AFTER_MONTHS", "12"))
+
+# Linhas por row group: cada um guarda o mín./máx. de date, que o DuckDB usa para pular os que não interessam
+SALES_ARCHIVE_ROW_GROUP_SIZE = int(os.getenv("SALES_ARCHIVE_ROW_GROUP_SIZE", "100000"))
+
+COLUMNS = [column.key for column in SalesModel.__table__.columns]
+DATE_INDEX = COLUMNS.index("date")
+
+
+def archive_cutoff(months: int = SALES_ARCHIVE_AFTER_MONTHS, now: datetime = None) -> datetime:
+    """
+    Início (UTC) do mês corrente menos months meses: vendas com date anterior são arquivadas.
+    """
+    now = (now or datetime.now(timezone.utc)).astimezone(timezone.utc)
+    total = now.year * 12 + now.month - 1 - months
+    return datetime(total // 12, total % 12 + 1, 1, tzinfo=timezone.utc)
+
+
+class _MonthWriter:
+    """
+    Grava as linhas recebidas em ordem de date em um Parquet temporário por mês, em blocos de
+    SALES_ARCHIVE_ROW_GROUP_SIZE linhas. Os arquivos recebem o nome final em publish(), antes de
+    as vendas saírem do Postgres; discard() apaga os arquivos, temporários ou já publicados.
+    """
+
+    def __init__(self, directory: str, name: str):
+        self.directory = directory
+        self.name = name
+        self.schema = arrow_schema(SalesModel)
+        self.paths = []
+        self.rows = 0
+        self._month = None
+        self._writer = None
+        self._buffer = []
+
+    def write(self, row: tuple):
+        date = row[DATE_INDEX].astimezone(timezone.utc)
+        if (date.year, date.month) != self._month:
+            self._close_month()
+            self._month = (date.year, date.month)
+            folder = os.path.join(self.directory, f"year={date.year:04d}", f"month={date.month:02d}")
+            os.makedirs(folder, exist_ok=True)
+            path = os.path.join(folder, f"{self.name}.parquet.tmp")
+            self._writer = pq.ParquetWriter(path, self.schema, compression="zstd", write_statistics=True)
+            self.paths.append(path)
+        self._buffer.append(row)
+        self.rows += 1
+        if len(self._buffer) >= SALES_ARCHIVE_ROW_GROUP_SIZE:
+            self._flush()
+
+    def _flush(self):
+        if self._buffer:
+            columns = list(zip(*self._buffer))
+            self._writer.write_table(
+                pa.Table.from_arrays([pa.array(values, field.type) for values, field in zip(columns, self.schema)], schema=self.schema),
+                row_group_size=SALES_ARCHIVE_ROW_GROUP_SIZE,
+            )
+            self._buffer = []
+
+    def _close_month(self):
+        if self._writer is not None:
+            self._flush()
+            self._writer.close()
+            self._writer = None
+
+    def close(self):
+        self._close_month()
+
+    def publish(self):
+        for index, path in enumerate(self.paths):
+            final = path.removesuffix(".tmp")
+            os.replace(path, final)
+            self.paths[index] = final
+
+    def discard(self):
+        self._close_month()
+        for path in self.paths:
+            if os.path.exists(path):
+                os.remove(path)
+
+
+def _archive_partition(engine, partition: dict, cutoff: datetime, directory: str, stamp: str) -> int:
+    """
+    Arquiva as vendas da partição com date anterior a cutoff, em uma única transação:
+    bloqueia escritas na partição (leituras continuam), grava e publica os Parquet, e só então
+    desanexa e remove a partição, se ela inteira é anterior a cutoff, ou apaga só as vendas arquivadas.
+
+    Uma falha antes do commit desfaz a transação e apaga os arquivos. Se o próprio commit falhar, os
+    arquivos ficam: as vendas podem estar nas duas camadas (get_sales_history descarta as repetidas),
+    mas nunca em nenhuma.
+    """
+    name = partition["name"]
+    upper = partition["upper_bound"]
+    whole = upper is not None and upper <= cutoff
+    writer = _MonthWriter(directory, f"{name}-{stamp}")
+    connection = engine.raw_connection()
+    try:
+        cursor = connection.cursor()
+        cursor.execute(f"SET LOCAL lock_timeout = '{DETACH_LOCK_TIMEOUT}'")
+        cursor.execute(f'LOCK TABLE "{name}" IN SHARE MODE')
+        # Cursor do lado do servidor: só um bloco de linhas em memória por vez
+        rows = connection.cursor(name=f"archive_{name}")
+        rows.itersize = SALES_ARCHIVE_ROW_GROUP_SIZE
+        rows.execute(f'SELECT {", ".join(COLUMNS)} FROM "{name}" WHERE date < %s ORDER BY date, id', (cutoff,))
+        for row in rows:
+            writer.write(row)
+        rows.close()
+        writer.close()
+        if writer.rows:
+            writer.publish()
+            if whole:
+                cursor.execute(f'ALTER TABLE sales DETACH PARTITION "{name}"')
+                cursor.execute(f'DROP TABLE "{name}"')
+            else:
+                cursor.execute(f'DELETE FROM "{name}" WHERE date < %s', (cutoff,))
+            cursor.execute(SALES_CHANGED_SQL)
+    except Exception:
+        connection.rollback()
+        connection.close()
+        writer.discard()
+        raise
+    try:
+        connection.commit()
+    except Exception:
+        logger.error("Commit do arquivamento de %s falhou; os arquivos foram mantidos: %s", name, writer.paths)
+        raise
+    finally:
+        connection.close()
+    return writer.rows
+
+
+def archive_sales(engine, cutoff: datetime, directory: str = SALES_ARCHIVE_DIR, dry_run: bool = False) -> dict:
+    """
+    Move para Parquet as vendas com date anterior a cutoff, partição por partição.
+
+    Returns:
+        dict: partição -> linhas arquivadas (no dry_run, partições que seriam processadas -> 0).
+    """
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+    archived = {}
+    for partition in list_sales_partitions(engine, starting_before=cutoff):
+        archived[partition["name"]] = 0 if dry_run else _archive_partition(engine, partition, cutoff, directory, stamp)
+    return archived
+
+
+def query_archive(stmt, directory: str = SALES_ARCHIVE_DIR) -> list:
+    """
+    Executa no DuckDB, sobre os Parquet arquivados, um SELECT do SQLAlchemy feito para a tabela sales
+    (o mesmo de list_statement, com filtros, ordenação e cursor). Os filtros em date usam as
+    estatísticas dos row groups para ler só os trechos do período.
+
+    Returns:
+        list: objetos SalesModel (fora da sessão) com as colunas selecionadas.
+    """
+    pattern = os.path.join(directory, "**", "*.parquet")
+    if not glob.glob(pattern, recursive=True):
+        return []
+    compiled = stmt.compile(dialect=postgresql.dialect(paramstyle="qmark"))
+    params = [compiled.params[name] for name in compiled.positiontup]
+    connection = duckdb.connect()
+    try:
+        connection.execute("SET TimeZone = 'UTC'")
+        # Mesma posição dos nulos que o Postgres, para a ordem das duas camadas ser a mesma
+        connection.execute("SET default_null_order = 'nulls_last_on_asc_first_on_desc'")
+        # Uma tabela vazia com todas as colunas do modelo: arquivos gravados antes de uma coluna
+        # existir (ex.: employee_id e product_id) a leem como NULL
+        connection.register("sales_columns", arrow_schema(SalesModel).empty_table())
+        connection.execute(
+            f"CREATE VIEW sales AS SELECT * FROM sales_columns UNION ALL BY NAME "
+            f"SELECT * EXCLUDE (year, month) "
+            f"FROM read_parquet('{pattern}', hive_partitioning = true, union_by_name = true)"
+        )
+        rows = connection.execute(str(compiled), params).fetch_arrow_table().to_pylist()
+    finally:
+        connection.close()
+    return [SalesModel(**row) for row in rows]
+
+
+def main():
+    from database.database import engine
+
+    parser = argparse.ArgumentParser(description="Arquiva em Parquet as vendas anteriores ao horizonte.")
+    parser.add_argument("--months", type=int, default=SALES_ARCHIVE_AFTER_MONTHS, help="meses mantidos no Postgres além do corrente")
+    parser.add_argument("--dry-run", action="store_true", help="só lista as partições que seriam processadas")
+    args = parser.parse_args()
+
+    cutoff = archive_cutoff(args.months)
+    archived = archive_sales(engine, cutoff, dry_run=args.dry_run)
+    print(f"Vendas anteriores a {cutoff:%Y-%m-%d} em {SALES_ARCHIVE_DIR}")
+    for name, rows in archived.items():
+        print(f"{name:20} {'-' if args.dry_run else rows:>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+import logging
+import select
+import threading
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+# Canal do LISTEN/NOTIFY em que os triggers da migração 0003 avisam quais tabelas foram alteradas
+CHANGE_CHANNEL = "table_changes"
+
+# Espera entre tentativas de reconexão do listener e intervalo máximo de cada select()
+RECONNECT_DELAY = 5.0
+POLL_TIMEOUT = 5.0
+
+
+class ChangeListener(threading.Thread):
+    """
+    Thread que escuta o canal CHANGE_CHANNEL em uma conexão dedicada (fora do pool)
+    e chama on_change(tabela) para cada aviso recebido.
+
+    Sempre que (re)conecta chama on_reconnect(), porque os avisos enviados enquanto a
+    conexão estava fora foram perdidos.
+    """
+
+    def __init__(self, engine, on_change, on_reconnect):
+        super().__init__(name="change-listener", daemon=True)
+        self.engine = engine
+        self.on_change = on_change
+        self.on_reconnect = on_reconnect
+        self._stopped = threading.Event()
+
+    def _connect(self):
+        cargs, cparams = self.engine.dialect.create_connect_args(self.engine.url)
+        connection = self.engine.dialect.loaded_dbapi.connect(*cargs, **cparams)
+        connection.autocommit = True
+        with connection.cursor() as cursor:
+            cursor.execute(f"LISTEN {CHANGE_CHANNEL}")
+        return connection
+
+    def run(self):
+        while not self._stopped.is_set():
+            try:
+                connection = self._connect()
+            except Exception as e:
+                logger.warning("Não foi possível conectar o listener de alterações: %s", e)
+                self._stopped.wait(RECONNECT_DELAY)
+                continue
+            self.on_reconnect()
+            try:
+                while not self._stopped.is_set():
+                    if select.select([connection], [], [], POLL_TIMEOUT) == ([], [], []):
+                        continue
+                    connection.poll()
+                    while connection.notifies:
+                        self.on_change(connection.notifies.pop(0).payload)
+            except Exception as e:
+                logger.warning("Listener de alterações desconectado: %s", e)
+            finally:
+                connection.close()
+
+    def stop(self):
+        self._stopped.set()
+
+
+def start_change_listener(engine, on_change, on_reconnect):
+    """
+    Inicia o ChangeListener deste worker. Retorna None em bancos que não são Postgres.
+    """
+    if engine.dialect.name != "postgresql":
+        return None
+    listener = ChangeListener(engine, on_change, on_reconnect)
+    listener.start()
+    return listener
+
+
+def read_table_version(engine, table: str) -> int:
+    """
+    Retorna a versão atual da tabela (0 se ela ainda não foi alterada desde a migração que criou os triggers).
+    """
+    with engine.connect() as connection:
+        version = connection.execute(
+            text("SELECT version FROM table_versions WHERE table_name = :table"), {"table": table}
+        ).scalar()
+    return version or 0
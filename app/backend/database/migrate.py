@@ -0,0 +1,105 @@
+"""
+Aplica as migrações do banco (database/migrations) até a última revisão.
+
+Executado uma vez por deploy, antes dos workers do backend (serviço migrate do docker-compose).
+A partir de app/backend:
+
+    python -m database.migrate          # aplica as migrações pendentes
+    python -m database.migrate --sql    # só imprime o SQL, sem conectar no banco
+"""
+import argparse
+import os
+from alembic import command
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.exc import ProgrammingError
+from sqlalchemy.pool import NullPool
+from database.database import SQLALCHEMY_DATABASE_URL
+
+ALEMBIC_INI = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "alembic.ini")
+
+# Revisão equivalente ao antigo create_all; bancos criados antes das migrações são marcados nela.
+# Os índices que ela cria além do esquema do create_all são criados pelas revisões 0002 e 0007
+BASELINE_REVISION = "0001"
+BASELINE_TABLES = {"products", "sales", "employees", "suppliers"}
+
+
+def head_revision() -> str:
+    return ScriptDirectory.from_config(Config(ALEMBIC_INI)).get_current_head()
+
+
+def current_revision(connection) -> str:
+    """
+    Retorna a revisão gravada em alembic_version, ou None se o banco nunca foi migrado.
+    """
+    try:
+        return connection.execute(text("SELECT version_num FROM alembic_version")).scalar()
+    except ProgrammingError:
+        connection.rollback()
+        return None
+    finally:
+        connection.commit()
+
+
+def check_schema_version(engine):
+    """
+    Confere, na subida do backend, se o banco está na última revisão das migrações.
+    É uma única consulta em alembic_version, sem inspecionar o catálogo.
+
+    Em bancos que não são Postgres (testes) não faz nada.
+
+    Raises:
+        RuntimeError: se o banco não estiver migrado até a última revisão.
+    """
+    if engine.dialect.name != "postgresql":
+        return
+    head = head_revision()
+    with engine.connect() as connection:
+        current = current_revision(connection)
+    if current != head:
+        raise RuntimeError(
+            f"Banco na revisão {current or 'nenhuma'}, o backend espera {head}. "
+            f"Execute python -m database.migrate antes de subir os workers."
+        )
+
+
+def upgrade():
+    """
+    Aplica as migrações pendentes. Um banco que já tem as tabelas (criadas pelo create_all das
+    versões anteriores) mas não tem alembic_version é marcado na revisão inicial antes.
+    """
+    config = Config(ALEMBIC_INI)
+    engine = create_engine(SQLALCHEMY_DATABASE_URL, poolclass=NullPool)
+    try:
+        with engine.connect() as connection:
+            # Evita que dois deploys simultâneos apliquem as mesmas migrações
+            connection.execute(text("SELECT pg_advisory_lock(hashtext('database.migrate'))"))
+            connection.commit()
+            config.attributes["connection"] = connection
+            try:
+                if current_revision(connection) is None:
+                    tables = set(inspect(connection).get_table_names())
+                    connection.commit()
+                    if BASELINE_TABLES <= tables:
+                        command.stamp(config, BASELINE_REVISION)
+                command.upgrade(config, "head")
+            finally:
+                connection.execute(text("SELECT pg_advisory_unlock(hashtext('database.migrate'))"))
+                connection.commit()
+    finally:
+        engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Aplica as migrações do banco até a última revisão.")
+    parser.add_argument("--sql", action="store_true", help="imprime o SQL das migrações sem conectar no banco")
+    args = parser.parse_args()
+    if args.sql:
+        command.upgrade(Config(ALEMBIC_INI), "head", sql=True)
+    else:
+        upgrade()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+from alembic import context
+from sqlalchemy import create_engine
+from sqlalchemy.pool import NullPool
+from database.database import SQLALCHEMY_DATABASE_URL, Base
+
+import models.product.product
+import models.sales.sales
+import models.employee.employee
+import models.supplier.supplier
+
+# Metadata dos modelos, usada pelo alembic revision --autogenerate para sugerir novas migrações
+target_metadata = Base.metadata
+
+# No modo offline a URL só escolhe o dialeto; não precisa das credenciais do .env
+OFFLINE_URL = "postgresql+psycopg2://"
+
+
+def run_migrations_offline():
+    """
+    Gera o SQL das migrações sem conectar no banco (alembic upgrade head --sql).
+    """
+    context.configure(
+        url=OFFLINE_URL,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        transaction_per_migration=True,
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online():
+    """
+    Aplica as migrações em uma conexão própria, fora do pool da aplicação.
+    """
+    connectable = context.config.attributes.get("connection")
+    if connectable is not None:
+        _run(connectable)
+        return
+    engine = create_engine(SQLALCHEMY_DATABASE_URL, poolclass=NullPool)
+    try:
+        with engine.connect() as connection:
+            _run(connection)
+    finally:
+        engine.dispose()
+
+
+def _run(connection):
+    # Uma transação por revisão: a 0002 usa CONCURRENTLY, que precisa rodar fora de transação
+    context.configure(connection=connection, target_metadata=target_metadata, transaction_per_migration=True)
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,99 @@
+"""Esquema inicial: tabelas products, sales, employees e suppliers
+
+Revision ID: 0001
+Revises:
+Create Date: 2024-12-20
+
+Equivale ao que Base.metadata.create_all criava. Bancos criados antes das migrações
+já têm estas tabelas: python -m database.migrate marca esta revisão sem executá-la.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "products",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("name", sa.String()),
+        sa.Column("description", sa.String()),
+        sa.Column("price", sa.Float()),
+        sa.Column("categoria", sa.String()),
+        sa.Column("email_fornecedor", sa.String()),
+        sa.Column("created_at", sa.DateTime(timezone=True)),
+    )
+    op.create_index("ix_products_name", "products", ["name"])
+    op.create_index("ix_products_categoria", "products", ["categoria"])
+    op.create_index("ix_products_email_fornecedor", "products", ["email_fornecedor"])
+
+    op.create_table(
+        "sales",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("email_employee", sa.String()),
+        sa.Column("email_customer", sa.String()),
+        sa.Column("first_name", sa.String()),
+        sa.Column("last_name", sa.String()),
+        sa.Column("phone_number", sa.String()),
+        sa.Column("price", sa.Float()),
+        sa.Column("quantity", sa.Integer()),
+        sa.Column("name_product", sa.String()),
+        sa.Column("date", sa.DateTime(timezone=True)),
+        sa.Column("created_at", sa.DateTime(timezone=True)),
+    )
+    op.create_index("ix_sales_email_customer", "sales", ["email_customer"])
+    op.create_index("ix_sales_date_name_product", "sales", ["date", "name_product"])
+    op.create_index("ix_sales_email_employee_date", "sales", ["email_employee", "date"])
+    op.create_index("ix_sales_created_at_brin", "sales", ["created_at"], postgresql_using="brin")
+
+    op.create_table(
+        "employees",
+        sa.Column("employee_id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("manager_id", sa.Integer()),
+        sa.Column("first_name", sa.String()),
+        sa.Column("last_name", sa.String()),
+        sa.Column("email", sa.String()),
+        sa.Column("phone_number", sa.String()),
+        sa.Column("hire_date", sa.Date()),
+        sa.Column("department_id", sa.Integer()),
+        sa.Column("job_title", sa.String()),
+        sa.Column("location", sa.String()),
+        sa.Column("birth_date", sa.Date()),
+        sa.Column("gender", sa.String()),
+        sa.Column("nationality", sa.String()),
+        sa.Column("start_date", sa.Date()),
+        sa.Column("salary", sa.Float()),
+        sa.Column("termination_date", sa.Date(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True)),
+    )
+    op.create_index("ix_employees_email", "employees", ["email"], unique=True)
+    op.create_index("ix_employees_hire_date", "employees", ["hire_date"])
+    op.create_index("ix_employees_department_id", "employees", ["department_id"])
+    op.create_index("ix_employees_birth_month", "employees", [sa.text("EXTRACT(month FROM birth_date)")])
+
+    op.create_table(
+        "suppliers",
+        sa.Column("supplier_id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("company_name", sa.String(), nullable=False),
+        sa.Column("contact_name", sa.String(), nullable=False),
+        sa.Column("email", sa.String(), nullable=False),
+        sa.Column("phone_number", sa.String(), nullable=False),
+        sa.Column("website", sa.String()),
+        sa.Column("address", sa.String()),
+        sa.Column("product_categories", sa.String()),
+        sa.Column("primary_product", sa.String(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True)),
+    )
+    op.create_index("ix_suppliers_email", "suppliers", ["email"], unique=True)
+    op.create_index("ix_suppliers_product_categories", "suppliers", ["product_categories"])
+
+
+def downgrade():
+    op.drop_table("suppliers")
+    op.drop_table("employees")
+    op.drop_table("sales")
+    op.drop_table("products")
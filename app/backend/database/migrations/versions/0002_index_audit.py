@@ -0,0 +1,75 @@
+"""Revisão dos índices
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2024-12-20
+
+Os modelos criavam um B-tree por coluna (index=True em quase todas), inclusive em colunas que
+nenhuma consulta filtra ou ordena (first_name, phone_number, price, description, ...) e um índice
+duplicado da chave primária (ix_<tabela>_<pk>). Cada INSERT em sales atualizava 11 B-trees.
+
+O novo conjunto segue as consultas que existem hoje:
+  * sales: filtros/agregações por período com ou sem produto (API, dashboard, gold_sales_7_days),
+    vendas de um vendedor no período (gold_sales_by_seller), filtro por cliente e BRIN em created_at.
+  * products/suppliers/employees: só as colunas usadas nos filtros das rotas em lote e das análises.
+  * suppliers.email passa a ser UNIQUE (os emails já são gerados sem repetição).
+
+Num banco criado pela revisão 0001 não há nada a fazer (IF EXISTS/IF NOT EXISTS); a revisão serve
+aos bancos criados antes das migrações pelo create_all. Os índices de sales são criados e removidos
+com CONCURRENTLY, fora da transação da migração, para não bloquear as escritas.
+"""
+from alembic import op
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+NEW_SALES_INDEXES = [
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_sales_date_name_product ON sales (date, name_product)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_sales_email_employee_date ON sales (email_employee, date)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_sales_created_at_brin ON sales USING brin (created_at)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_sales_email_customer ON sales (email_customer)",
+]
+
+OLD_INDEXES = [
+    "ix_sales_id", "ix_sales_email_employee", "ix_sales_first_name", "ix_sales_last_name",
+    "ix_sales_phone_number", "ix_sales_price", "ix_sales_quantity", "ix_sales_name_product",
+    "ix_sales_date", "ix_sales_created_at",
+    "ix_products_id", "ix_products_description", "ix_products_price", "ix_products_created_at",
+    "ix_employees_employee_id", "ix_employees_manager_id", "ix_employees_first_name",
+    "ix_employees_last_name", "ix_employees_created_at",
+    "ix_suppliers_supplier_id", "ix_suppliers_company_name", "ix_suppliers_created_at", "ix_suppliers_email_unique",
+]
+
+# suppliers é pequena: o índice único é trocado dentro da transação. Se houver emails repetidos
+# a criação falha e a migração é desfeita, com o índice antigo intacto
+UNIQUE_SUPPLIER_EMAIL = """
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid
+        WHERE c.relname = 'ix_suppliers_email' AND i.indisunique
+    ) THEN
+        DROP INDEX IF EXISTS ix_suppliers_email;
+        CREATE UNIQUE INDEX ix_suppliers_email ON suppliers (email);
+    END IF;
+END $$
+"""
+
+
+def upgrade():
+    # Os novos índices são criados antes de remover os antigos
+    with op.get_context().autocommit_block():
+        for statement in NEW_SALES_INDEXES:
+            op.execute(statement)
+        for name in OLD_INDEXES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+    op.execute(UNIQUE_SUPPLIER_EMAIL)
+    for table in ("sales", "products", "employees", "suppliers"):
+        op.execute(f"ANALYZE {table}")
+
+
+def downgrade():
+    # O conjunto antigo não é recriado: ele só existia em bancos anteriores às migrações
+    pass
@@ -0,0 +1,53 @@
+"""Versões das tabelas e triggers de NOTIFY
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2024-12-20
+
+Cria table_versions e os triggers por comando que, a cada INSERT, UPDATE, DELETE ou TRUNCATE
+(feitos pela API, pelo DuckDB, pelo n8n ou pelo dbt), incrementam a versão da tabela e enviam
+um NOTIFY no canal table_changes. A versão é a base dos ETags e o NOTIFY invalida o cache de
+respostas de cada worker (ver database/invalidation.py).
+"""
+from alembic import op
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+TABLES = ["products", "sales", "employees", "suppliers"]
+
+
+def upgrade():
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS table_versions (
+            table_name TEXT PRIMARY KEY,
+            version BIGINT NOT NULL DEFAULT 0,
+            changed_at TIMESTAMPTZ NOT NULL DEFAULT now()
+        )
+    """)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION notify_table_change() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO table_versions (table_name, version, changed_at) VALUES (TG_TABLE_NAME, 1, now())
+            ON CONFLICT (table_name) DO UPDATE
+            SET version = table_versions.version + 1, changed_at = now();
+            PERFORM pg_notify('table_changes', TG_TABLE_NAME);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    for table in TABLES:
+        op.execute(
+            f"CREATE OR REPLACE TRIGGER {table}_notify_change "
+            f"AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table} "
+            f"FOR EACH STATEMENT EXECUTE FUNCTION notify_table_change()"
+        )
+
+
+def downgrade():
+    for table in TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_notify_change ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS notify_table_change()")
+    op.execute("DROP TABLE IF EXISTS table_versions")
@@ -0,0 +1,250 @@
+"""Particionamento mensal de sales por date
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2024-12-20
+
+sales passa a ser uma tabela particionada por intervalo de date, com uma partição por mês
+(sales_pAAAA_MM), uma partição padrão (sales_default) para datas fora dos meses criados e os
+índices declarados na tabela mãe, que o Postgres replica em cada partição. Consultas filtradas
+por date (dashboard, modelos gold, n8n) só leem as partições do período.
+
+A migração não copia as vendas existentes. A tabela atual vira a partição sales_legacy, com as
+datas até o fim do mês corrente (ou da venda mais recente, se for posterior):
+  1. fora de transação, cria o índice único (id, date) com CONCURRENTLY e valida um CHECK com o
+     intervalo da partição, sem bloquear as escritas;
+  2. numa transação curta, renomeia a tabela, cria a tabela particionada e anexa sales_legacy.
+     O CHECK validado e os índices de mesma definição dispensam a leitura da tabela no ATTACH.
+Num banco sem vendas, a tabela antiga é descartada e só as partições mensais são usadas.
+
+As partições dos próximos meses são criadas pela função ensure_sales_partitions, chamada aqui,
+pelo backend (database/partitions.py) e pela carga de dados. Partições antigas saem com
+python -m database.partitions detach.
+"""
+from alembic import op
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+# Índices de sales (ver models/sales/sales.py). A tabela antiga tem os mesmos, com os mesmos nomes:
+# eles são renomeados para liberar os nomes e depois anexados aos índices da tabela particionada
+INDEXES = {
+    "ix_sales_email_customer": "(email_customer)",
+    "ix_sales_date_name_product": "(date, name_product)",
+    "ix_sales_email_employee_date": "(email_employee, date)",
+    "ix_sales_created_at_brin": "USING brin (created_at)",
+}
+
+# Limite superior de sales_legacy: início do mês seguinte ao corrente ou ao da venda mais recente.
+# Fica guardado no comentário do CHECK, para a transação do passo 2 usar o mesmo valor
+ADD_BOUND_CHECK = """
+DO $$
+DECLARE
+    boundary_utc timestamp;
+    boundary timestamptz;
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'sales_partition_bound') THEN
+        RETURN;
+    END IF;
+    UPDATE sales SET date = coalesce(created_at, now()) WHERE date IS NULL;
+    SELECT greatest(
+        date_trunc('month', now() AT TIME ZONE 'UTC'),
+        date_trunc('month', max(date) AT TIME ZONE 'UTC')
+    ) + interval '1 month'
+    INTO boundary_utc
+    FROM sales;
+    boundary := boundary_utc AT TIME ZONE 'UTC';
+    EXECUTE format(
+        'ALTER TABLE sales ADD CONSTRAINT sales_partition_bound CHECK (date IS NOT NULL AND date < %L) NOT VALID',
+        boundary
+    );
+    EXECUTE format('COMMENT ON CONSTRAINT sales_partition_bound ON sales IS %L', boundary);
+END $$
+"""
+
+# Um CREATE INDEX CONCURRENTLY interrompido deixa um índice inválido com o nome, que o
+# IF NOT EXISTS aceitaria
+DROP_INVALID_KEY = """
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid
+        WHERE c.relname = 'sales_id_date_key' AND NOT i.indisvalid
+    ) THEN
+        DROP INDEX sales_id_date_key;
+    END IF;
+END $$
+"""
+
+ENSURE_PARTITIONS_FUNCTION = """
+CREATE OR REPLACE FUNCTION ensure_sales_partitions(from_date timestamptz, to_date timestamptz)
+RETURNS integer AS $$
+DECLARE
+    month_start timestamp := date_trunc('month', from_date AT TIME ZONE 'UTC');
+    lower_bound timestamptz;
+    upper_bound timestamptz;
+    partition_name text;
+    created integer := 0;
+BEGIN
+    PERFORM pg_advisory_xact_lock(hashtext('ensure_sales_partitions'));
+    WHILE month_start <= to_date AT TIME ZONE 'UTC' LOOP
+        partition_name := format('sales_p%s', to_char(month_start, 'YYYY_MM'));
+        lower_bound := month_start AT TIME ZONE 'UTC';
+        upper_bound := (month_start + interval '1 month') AT TIME ZONE 'UTC';
+        IF to_regclass(partition_name) IS NULL THEN
+            BEGIN
+                -- As vendas do mês que caíram em sales_default vão para a nova partição antes do ATTACH
+                EXECUTE format('CREATE TABLE %I (LIKE sales INCLUDING DEFAULTS)', partition_name);
+                EXECUTE format(
+                    'WITH moved AS (DELETE FROM sales_default WHERE date >= %L AND date < %L RETURNING *) '
+                    'INSERT INTO %I SELECT * FROM moved',
+                    lower_bound, upper_bound, partition_name
+                );
+                EXECUTE format(
+                    'ALTER TABLE sales ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+                    partition_name, lower_bound, upper_bound
+                );
+                created := created + 1;
+            EXCEPTION WHEN invalid_object_definition THEN
+                -- O mês já é coberto por outra partição (sales_legacy)
+                NULL;
+            END;
+        END IF;
+        month_start := month_start + interval '1 month';
+    END LOOP;
+    RETURN created;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+CREATE_PARTITIONED_TABLE = """
+CREATE TABLE sales (
+    id INTEGER NOT NULL DEFAULT nextval('sales_id_seq'),
+    email_employee VARCHAR,
+    email_customer VARCHAR,
+    first_name VARCHAR,
+    last_name VARCHAR,
+    phone_number VARCHAR,
+    price FLOAT,
+    quantity INTEGER,
+    name_product VARCHAR,
+    date TIMESTAMP WITH TIME ZONE NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE,
+    CONSTRAINT sales_pkey PRIMARY KEY (id, date)
+) PARTITION BY RANGE (date)
+"""
+
+# sales como era na revisão 0003, usada pelo downgrade
+PLAIN_COLUMNS = (
+    "id, email_employee, email_customer, first_name, last_name, phone_number, "
+    "price, quantity, name_product, date, created_at"
+)
+
+CREATE_PLAIN_TABLE = """
+CREATE TABLE sales (
+    id INTEGER NOT NULL DEFAULT nextval('sales_id_seq'),
+    email_employee VARCHAR,
+    email_customer VARCHAR,
+    first_name VARCHAR,
+    last_name VARCHAR,
+    phone_number VARCHAR,
+    price FLOAT,
+    quantity INTEGER,
+    name_product VARCHAR,
+    date TIMESTAMP WITH TIME ZONE,
+    created_at TIMESTAMP WITH TIME ZONE,
+    CONSTRAINT sales_pkey PRIMARY KEY (id)
+)
+"""
+
+ATTACH_LEGACY = """
+DO $$
+DECLARE
+    boundary timestamptz;
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM sales_legacy) THEN
+        DROP TABLE sales_legacy;
+        RETURN;
+    END IF;
+    SELECT d.description::timestamptz INTO boundary
+    FROM pg_constraint c JOIN pg_description d ON d.objoid = c.oid
+    WHERE c.conname = 'sales_partition_bound';
+    EXECUTE format('ALTER TABLE sales ATTACH PARTITION sales_legacy FOR VALUES FROM (MINVALUE) TO (%L)', boundary);
+    ALTER TABLE sales_legacy DROP CONSTRAINT sales_partition_bound;
+END $$
+"""
+
+
+def upgrade():
+    context = op.get_context()
+    if not context.as_sql:
+        relkind = op.get_bind().exec_driver_sql("SELECT relkind FROM pg_class WHERE oid = 'sales'::regclass").scalar()
+        if relkind == "p":
+            return
+
+    # Passo 1: nada aqui bloqueia as escritas por mais que um instante
+    with context.autocommit_block():
+        op.execute("SET lock_timeout = '10s'")
+        op.execute(ADD_BOUND_CHECK)
+        op.execute("ALTER TABLE sales VALIDATE CONSTRAINT sales_partition_bound")
+        op.execute(DROP_INVALID_KEY)
+        op.execute("CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS sales_id_date_key ON sales (id, date)")
+
+    # Passo 2: só operações de catálogo, com a tabela bloqueada
+    op.execute("LOCK TABLE sales IN ACCESS EXCLUSIVE MODE")
+    # Usa o CHECK validado em vez de ler a tabela
+    op.execute("ALTER TABLE sales ALTER COLUMN date SET NOT NULL")
+    op.execute("ALTER TABLE sales DROP CONSTRAINT sales_pkey")
+    op.execute("ALTER TABLE sales ADD CONSTRAINT sales_legacy_pkey PRIMARY KEY USING INDEX sales_id_date_key")
+    op.execute("ALTER TABLE sales RENAME TO sales_legacy")
+    for name in INDEXES:
+        op.execute(f"ALTER INDEX {name} RENAME TO {name.replace('ix_sales_', 'ix_sales_legacy_')}")
+    op.execute("DROP TRIGGER IF EXISTS sales_notify_change ON sales_legacy")
+
+    op.execute(CREATE_PARTITIONED_TABLE)
+    op.execute("ALTER SEQUENCE sales_id_seq OWNED BY sales.id")
+    for name, definition in INDEXES.items():
+        op.execute(f"CREATE INDEX {name} ON sales {definition}")
+    op.execute(
+        "CREATE TRIGGER sales_notify_change AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON sales "
+        "FOR EACH STATEMENT EXECUTE FUNCTION notify_table_change()"
+    )
+    op.execute("CREATE TABLE sales_default PARTITION OF sales DEFAULT")
+    op.execute(ATTACH_LEGACY)
+
+    op.execute(ENSURE_PARTITIONS_FUNCTION)
+    op.execute("SELECT ensure_sales_partitions(now(), now() + interval '3 months')")
+    op.execute("RESET lock_timeout")
+
+
+def downgrade():
+    """
+    Volta sales a uma tabela comum com chave primária em id: cria a tabela, copia as vendas de
+    todas as partições (inclusive sales_legacy e sales_default) e remove a tabela particionada.
+
+    Ao contrário do upgrade, copia todas as vendas com sales bloqueada, então as escritas esperam
+    até o fim da cópia.
+    """
+    op.execute("LOCK TABLE sales IN ACCESS EXCLUSIVE MODE")
+    op.execute("ALTER TABLE sales RENAME TO sales_partitioned")
+    # Libera o nome da chave primária (e do seu índice) para a nova tabela
+    op.execute("ALTER TABLE sales_partitioned RENAME CONSTRAINT sales_pkey TO sales_partitioned_pkey")
+    for name in INDEXES:
+        op.execute(f"ALTER INDEX {name} RENAME TO {name.replace('ix_sales_', 'ix_sales_partitioned_')}")
+
+    op.execute(CREATE_PLAIN_TABLE)
+    op.execute(f"INSERT INTO sales ({PLAIN_COLUMNS}) SELECT {PLAIN_COLUMNS} FROM sales_partitioned")
+    # A sequência pertence à coluna da tabela particionada e seria removida junto com ela
+    op.execute("ALTER SEQUENCE sales_id_seq OWNED BY sales.id")
+    op.execute("DROP TABLE sales_partitioned")
+    op.execute("DROP FUNCTION IF EXISTS ensure_sales_partitions(timestamptz, timestamptz)")
+
+    for name, definition in INDEXES.items():
+        op.execute(f"CREATE INDEX {name} ON sales {definition}")
+    op.execute(
+        "CREATE TRIGGER sales_notify_change AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON sales "
+        "FOR EACH STATEMENT EXECUTE FUNCTION notify_table_change()"
+    )
+    op.execute("ANALYZE sales")
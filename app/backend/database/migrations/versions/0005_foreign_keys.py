@@ -0,0 +1,260 @@
+"""Chaves estrangeiras inteiras em sales e products
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2024-12-27
+
+sales ganha employee_id (employees.employee_id) e product_id (products.id), e products ganha
+supplier_id (suppliers.supplier_id). Os joins do n8n e os agrupamentos dos modelos gold passam a
+usar esses inteiros em vez de comparar emails e nomes de produto.
+
+email_employee, name_product e email_fornecedor continuam nas tabelas como cópia do valor
+informado na venda ou no cadastro: a API, o dashboard e os filtros os usam, e as vendas arquivadas
+em Parquet não têm como ser corrigidas. Um trigger BEFORE INSERT OR UPDATE preenche o id a partir
+do texto (ou o texto a partir do id, quando só o id é informado), então a API, a carga pelo DuckDB
+e o n8n não precisam mudar.
+
+Sem bloquear as escritas por mais que um instante:
+  1. adiciona as colunas (só catálogo) e os triggers, e preenche as linhas existentes em lotes
+     de BACKFILL_BATCH ids, com um COMMIT por lote;
+  2. cria os índices com CONCURRENTLY, partição por partição, e os anexa ao índice de sales;
+  3. cria as chaves estrangeiras NOT VALID e as valida, o que não bloqueia as escritas. Tabelas
+     particionadas não aceitam NOT VALID: cada partição recebe a sua, e a de sales só as adota.
+No modo offline (upgrade --sql) os índices de sales são criados direto na tabela mãe.
+"""
+from alembic import op
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+BACKFILL_BATCH = 10000
+
+# tabela -> [(coluna, tabela referenciada, chave referenciada)]
+FOREIGN_KEYS = {
+    "sales": [
+        ("employee_id", "employees", "employee_id"),
+        ("product_id", "products", "id"),
+    ],
+    "products": [
+        ("supplier_id", "suppliers", "supplier_id"),
+    ],
+}
+
+# Índices de sales no formato de ix_sales_email_employee_date: vendas de um vendedor ou de um
+# produto em um período, e o lado de sales dos joins
+SALES_INDEXES = {
+    "ix_sales_employee_id_date": "(employee_id, date)",
+    "ix_sales_product_id_date": "(product_id, date)",
+}
+
+# O texto manda quando muda; o id, quando só ele muda ou só ele é informado. Nomes de produto
+# repetidos ficam com o menor id
+SALES_REFERENCES_FUNCTION = """
+CREATE OR REPLACE FUNCTION sales_fill_references() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' OR NEW.email_employee IS DISTINCT FROM OLD.email_employee
+            OR NEW.employee_id IS DISTINCT FROM OLD.employee_id THEN
+        IF NEW.employee_id IS NULL
+                OR (TG_OP = 'UPDATE' AND NEW.employee_id IS NOT DISTINCT FROM OLD.employee_id) THEN
+            NEW.employee_id := (SELECT employee_id FROM employees WHERE email = NEW.email_employee);
+        ELSE
+            NEW.email_employee := (SELECT email FROM employees WHERE employee_id = NEW.employee_id);
+        END IF;
+    END IF;
+    IF TG_OP = 'INSERT' OR NEW.name_product IS DISTINCT FROM OLD.name_product
+            OR NEW.product_id IS DISTINCT FROM OLD.product_id THEN
+        IF NEW.product_id IS NULL
+                OR (TG_OP = 'UPDATE' AND NEW.product_id IS NOT DISTINCT FROM OLD.product_id) THEN
+            NEW.product_id := (SELECT min(id) FROM products WHERE name = NEW.name_product);
+        ELSE
+            NEW.name_product := (SELECT name FROM products WHERE id = NEW.product_id);
+        END IF;
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+PRODUCTS_REFERENCES_FUNCTION = """
+CREATE OR REPLACE FUNCTION products_fill_references() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' OR NEW.email_fornecedor IS DISTINCT FROM OLD.email_fornecedor
+            OR NEW.supplier_id IS DISTINCT FROM OLD.supplier_id THEN
+        IF NEW.supplier_id IS NULL
+                OR (TG_OP = 'UPDATE' AND NEW.supplier_id IS NOT DISTINCT FROM OLD.supplier_id) THEN
+            NEW.supplier_id := (SELECT supplier_id FROM suppliers WHERE email = NEW.email_fornecedor);
+        ELSE
+            NEW.email_fornecedor := (SELECT email FROM suppliers WHERE supplier_id = NEW.supplier_id);
+        END IF;
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+# Lotes por intervalo de id (a chave primária começa por id em todas as partições), cada um na
+# sua transação. Linhas sem correspondência continuam com NULL e o UPDATE não as altera
+BACKFILL = """
+DO $$
+DECLARE
+    batch_start bigint;
+    last_id bigint;
+BEGIN
+    SELECT min({key}), max({key}) INTO batch_start, last_id FROM {table};
+    WHILE batch_start <= last_id LOOP
+        UPDATE {table} SET {assignments}
+        WHERE {key} >= batch_start AND {key} < batch_start + {batch} AND ({pending});
+        COMMIT;
+        batch_start := batch_start + {batch};
+    END LOOP;
+END $$
+"""
+
+BACKFILLS = {
+    "sales": {
+        "key": "id",
+        "assignments": (
+            "employee_id = (SELECT employee_id FROM employees WHERE email = email_employee), "
+            "product_id = (SELECT min(id) FROM products WHERE name = name_product)"
+        ),
+        "pending": (
+            "employee_id IS NULL AND email_employee IS NOT NULL "
+            "OR product_id IS NULL AND name_product IS NOT NULL"
+        ),
+    },
+    "products": {
+        "key": "id",
+        "assignments": "supplier_id = (SELECT supplier_id FROM suppliers WHERE email = email_fornecedor)",
+        "pending": "supplier_id IS NULL AND email_fornecedor IS NOT NULL",
+    },
+}
+
+SALES_PARTITIONS_SQL = """
+SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid
+WHERE i.inhparent = 'sales'::regclass ORDER BY c.relname
+"""
+
+# Um CREATE INDEX CONCURRENTLY interrompido deixa um índice inválido com o nome, que o
+# IF NOT EXISTS aceitaria
+DROP_INVALID_INDEX = """
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid
+        WHERE c.relname = '{name}' AND NOT i.indisvalid AND c.relkind = 'i'
+    ) THEN
+        DROP INDEX {name};
+    END IF;
+END $$
+"""
+
+# Uma chave NOT VALID por partição, validada e confirmada antes da próxima
+ADD_PARTITION_FOREIGN_KEYS = """
+DO $$
+DECLARE
+    partition_name text;
+BEGIN
+    FOR partition_name IN
+        SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = 'sales'::regclass ORDER BY c.relname
+    LOOP
+        IF NOT EXISTS (
+            SELECT 1 FROM pg_constraint
+            WHERE conrelid = partition_name::regclass AND conname = partition_name || '_{column}_fkey'
+        ) THEN
+            EXECUTE format(
+                'ALTER TABLE %I ADD CONSTRAINT %I FOREIGN KEY ({column}) REFERENCES {referenced} ({key}) '
+                'ON DELETE SET NULL NOT VALID',
+                partition_name, partition_name || '_{column}_fkey'
+            );
+            COMMIT;
+        END IF;
+        EXECUTE format('ALTER TABLE %I VALIDATE CONSTRAINT %I', partition_name, partition_name || '_{column}_fkey');
+        COMMIT;
+    END LOOP;
+END $$
+"""
+
+
+def _constraint_exists(name: str) -> bool:
+    if op.get_context().as_sql:
+        return False
+    return op.get_bind().exec_driver_sql(f"SELECT 1 FROM pg_constraint WHERE conname = '{name}'").scalar() is not None
+
+
+def _create_sales_indexes():
+    if op.get_context().as_sql:
+        for name, definition in SALES_INDEXES.items():
+            op.execute(f"CREATE INDEX IF NOT EXISTS {name} ON sales {definition}")
+        return
+    # Índice da tabela mãe sem construir nada (ON ONLY); fica válido quando todas as partições
+    # tiverem o seu anexado. Partições criadas depois recebem o índice no ATTACH
+    for name, definition in SALES_INDEXES.items():
+        op.execute(f"CREATE INDEX IF NOT EXISTS {name} ON ONLY sales {definition}")
+    partitions = op.get_bind().exec_driver_sql(SALES_PARTITIONS_SQL).scalars().all()
+    for partition in partitions:
+        for name, definition in SALES_INDEXES.items():
+            index = f"{partition}_{name.removeprefix('ix_sales_')}_idx"
+            op.execute(DROP_INVALID_INDEX.format(name=index))
+            op.execute(f'CREATE INDEX CONCURRENTLY IF NOT EXISTS "{index}" ON "{partition}" {definition}')
+            op.execute(f'ALTER INDEX {name} ATTACH PARTITION "{index}"')
+
+
+def upgrade():
+    context = op.get_context()
+
+    with context.autocommit_block():
+        # Passo 1: colunas, triggers e preenchimento
+        op.execute("SET lock_timeout = '10s'")
+        for table, references in FOREIGN_KEYS.items():
+            columns = ", ".join(f"ADD COLUMN IF NOT EXISTS {column} INTEGER" for column, _, _ in references)
+            op.execute(f"ALTER TABLE {table} {columns}")
+        op.execute(SALES_REFERENCES_FUNCTION)
+        op.execute(PRODUCTS_REFERENCES_FUNCTION)
+        for table in FOREIGN_KEYS:
+            op.execute(
+                f"CREATE OR REPLACE TRIGGER {table}_fill_references BEFORE INSERT OR UPDATE ON {table} "
+                f"FOR EACH ROW EXECUTE FUNCTION {table}_fill_references()"
+            )
+        for table in FOREIGN_KEYS:
+            op.execute(BACKFILL.format(table=table, batch=BACKFILL_BATCH, **BACKFILLS[table]))
+
+        # Passo 2: índices
+        _create_sales_indexes()
+        op.execute(DROP_INVALID_INDEX.format(name="ix_products_supplier_id"))
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_products_supplier_id ON products (supplier_id)")
+
+        # Passo 3: chaves estrangeiras
+        for column, referenced, key in FOREIGN_KEYS["products"]:
+            name = f"products_{column}_fkey"
+            if not _constraint_exists(name):
+                op.execute(
+                    f"ALTER TABLE products ADD CONSTRAINT {name} FOREIGN KEY ({column}) "
+                    f"REFERENCES {referenced} ({key}) ON DELETE SET NULL NOT VALID"
+                )
+            op.execute(f"ALTER TABLE products VALIDATE CONSTRAINT {name}")
+        for column, referenced, key in FOREIGN_KEYS["sales"]:
+            name = f"sales_{column}_fkey"
+            if _constraint_exists(name):
+                continue
+            op.execute(ADD_PARTITION_FOREIGN_KEYS.format(column=column, referenced=referenced, key=key))
+            # Mesma definição das chaves das partições: o Postgres as adota sem ler as vendas
+            op.execute(
+                f"ALTER TABLE sales ADD CONSTRAINT {name} FOREIGN KEY ({column}) "
+                f"REFERENCES {referenced} ({key}) ON DELETE SET NULL"
+            )
+        op.execute("RESET lock_timeout")
+
+    op.execute("ANALYZE sales")
+    op.execute("ANALYZE products")
+
+
+def downgrade():
+    for table, references in FOREIGN_KEYS.items():
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_fill_references ON {table}")
+        op.execute(f"DROP FUNCTION IF EXISTS {table}_fill_references()")
+        # Remover a coluna leva junto as chaves estrangeiras e os índices dela
+        columns = ", ".join(f"DROP COLUMN IF EXISTS {column}" for column, _, _ in references)
+        op.execute(f"ALTER TABLE {table} {columns}")
@@ -0,0 +1,64 @@
+"""Colunas categóricas como ENUM
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2025-01-03
+
+products.categoria, suppliers.product_categories e employees.gender têm poucos valores
+possíveis (CategoriaBase, ProductCategoriesEnum e GenderEnum nos schemas) e guardavam o texto
+inteiro em cada linha e em cada entrada dos índices. Passam a ser ENUMs do Postgres: 4 bytes
+por valor, comparações e agrupamentos pelo número do rótulo em vez do texto com collation, e as
+consultas continuam usando os rótulos (categoria = 'Roupas').
+
+O ALTER COLUMN TYPE reescreve a tabela e os índices da coluna com a tabela bloqueada; são
+tabelas de cadastro, pequenas perto de sales. Um valor fora da lista interrompe a migração
+com o valor no erro. Novos rótulos entram com ALTER TYPE ... ADD VALUE, junto com o enum do schema.
+"""
+from alembic import op
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+# (tabela, coluna) -> (tipo, rótulos). Cópia dos enums dos schemas nesta revisão
+ENUM_COLUMNS = {
+    ("products", "categoria"): (
+        "product_categoria", ["Eletrônico", "Eletrodoméstico", "Móveis", "Roupas", "Calçados"],
+    ),
+    ("suppliers", "product_categories"): (
+        "supplier_category", ["Categoria 1", "Categoria 2", "Categoria 3"],
+    ),
+    ("employees", "gender"): (
+        "employee_gender", ["Masculino", "Feminino", "Prefiro não dizer"],
+    ),
+}
+
+CREATE_TYPE = """
+DO $$
+BEGIN
+    CREATE TYPE {name} AS ENUM ({labels});
+EXCEPTION WHEN duplicate_object THEN
+    NULL;
+END $$
+"""
+
+
+def upgrade():
+    op.execute("SET lock_timeout = '10s'")
+    for (table, column), (name, labels) in ENUM_COLUMNS.items():
+        quoted = ", ".join("'" + label.replace("'", "''") + "'" for label in labels)
+        op.execute(CREATE_TYPE.format(name=name, labels=quoted))
+        # Texto vazio vira NULL, como um valor não informado
+        op.execute(
+            f"ALTER TABLE {table} ALTER COLUMN {column} TYPE {name} USING NULLIF({column}, '')::{name}"
+        )
+    op.execute("RESET lock_timeout")
+    for table in dict.fromkeys(table for table, _ in ENUM_COLUMNS):
+        op.execute(f"ANALYZE {table}")
+
+
+def downgrade():
+    for (table, column), (name, _) in ENUM_COLUMNS.items():
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} TYPE VARCHAR USING {column}::text")
+        op.execute(f"DROP TYPE IF EXISTS {name}")
@@ -0,0 +1,36 @@
+"""Índices da revisão 0001 que faltam nos bancos anteriores às migrações
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2025-01-06
+
+Bancos criados pelo create_all antes das migrações são marcados na revisão 0001 sem executá-la
+(python -m database.migrate), então só têm os índices do esquema original. Os que a 0001 cria
+além deles já são tratados pela 0002 (os de sales e o índice único de suppliers.email), exceto
+ix_employees_birth_month, usado pelos aniversariantes do mês (GET /employees/analytics/birthdays).
+
+Num banco criado pela revisão 0001 não há nada a fazer (IF NOT EXISTS). employees é uma tabela
+de cadastro, pequena: o índice é criado dentro da transação da migração.
+"""
+from alembic import op
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+# Índices criados pela revisão 0001 que não existem no esquema do create_all nem são criados pela 0002
+BASELINE_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS ix_employees_birth_month ON employees ((EXTRACT(month FROM birth_date)))",
+]
+
+
+def upgrade():
+    for statement in BASELINE_INDEXES:
+        op.execute(statement)
+    op.execute("ANALYZE employees")
+
+
+def downgrade():
+    # Os índices fazem parte da revisão 0001 e continuam nos bancos criados por ela
+    pass
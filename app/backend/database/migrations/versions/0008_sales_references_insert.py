@@ -0,0 +1,43 @@
+"""Trigger de sales só nas inserções que chegam sem os ids
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2025-01-08
+
+O trigger sales_fill_references da revisão 0005 roda a cada venda inserida e procura o vendedor
+e o produto com dois SELECTs por linha, o que pesa nas inserções em lote. A API agora preenche
+employee_id e product_id do lote inteiro antes do INSERT (crud.sales.crud.fill_sales_references),
+com um SELECT por tabela.
+
+Nas inserções, o trigger passa a ter a condição WHEN (NEW.employee_id IS NULL OR NEW.product_id
+IS NULL), avaliada pelo Postgres sem chamar a função: as vendas da API com os dois ids não passam
+por ela, e as da carga pelo DuckDB e do n8n, só com o texto, continuam preenchidas como antes.
+Uma venda inserida com os dois ids mantém o texto informado, em vez de tê-lo trocado pelo do id.
+Nas atualizações nada muda.
+"""
+from alembic import op
+
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("DROP TRIGGER IF EXISTS sales_fill_references ON sales")
+    op.execute(
+        "CREATE TRIGGER sales_fill_references_insert BEFORE INSERT ON sales FOR EACH ROW "
+        "WHEN (NEW.employee_id IS NULL OR NEW.product_id IS NULL) EXECUTE FUNCTION sales_fill_references()"
+    )
+    op.execute(
+        "CREATE TRIGGER sales_fill_references BEFORE UPDATE ON sales "
+        "FOR EACH ROW EXECUTE FUNCTION sales_fill_references()"
+    )
+
+
+def downgrade():
+    op.execute("DROP TRIGGER IF EXISTS sales_fill_references_insert ON sales")
+    op.execute(
+        "CREATE OR REPLACE TRIGGER sales_fill_references BEFORE INSERT OR UPDATE ON sales "
+        "FOR EACH ROW EXECUTE FUNCTION sales_fill_references()"
+    )
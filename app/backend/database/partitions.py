@@ -0,0 +1,183 @@
+"""
+Manutenção das partições mensais de sales (ver database/migrations/versions/0004_partition_sales.py).
+
+A partir de app/backend, com o mesmo .env do backend:
+
+    python -m database.partitions list
+    python -m database.partitions ensure --months-ahead 3
+    python -m database.partitions detach --before 2023-01-01 [--drop]
+"""
+import argparse
+import logging
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+# Quantos meses à frente ficam com partição criada e de quanto em quanto tempo o backend confere
+SALES_PARTITION_MONTHS_AHEAD = int(os.getenv("SALES_PARTITION_MONTHS_AHEAD", "3"))
+SALES_PARTITION_CHECK_HOURS = float(os.getenv("SALES_PARTITION_CHECK_HOURS", "24"))
+
+# Detach pega um lock exclusivo em sales por um instante; se houver consultas longas, desiste
+DETACH_LOCK_TIMEOUT = "5s"
+
+# Partições de sales com os limites do intervalo convertidos para timestamptz no próprio banco
+# (NULL em sales_default e em MINVALUE), para serem comparados no SQL em vez de lidos do texto
+# de pg_get_expr, cujo formato depende do TimeZone da sessão
+PARTITIONS_SQL = """
+SELECT *
+FROM (
+    SELECT c.relname AS name,
+           pg_get_expr(c.relpartbound, c.oid) AS bound,
+           (regexp_match(pg_get_expr(c.relpartbound, c.oid), 'FROM \\(''([^'']+)''\\)'))[1]::timestamptz AS lower_bound,
+           (regexp_match(pg_get_expr(c.relpartbound, c.oid), 'TO \\(''([^'']+)''\\)'))[1]::timestamptz AS upper_bound,
+           c.reltuples::bigint AS rows,
+           pg_total_relation_size(c.oid) AS bytes
+    FROM pg_inherits i
+    JOIN pg_class c ON c.oid = i.inhrelid
+    WHERE i.inhparent = 'sales'::regclass
+) partitions
+WHERE {condition}
+ORDER BY name
+"""
+
+# Vendas que saem de sales sem um DELETE (detach, arquivamento): avisa os caches e muda os ETags
+# como o trigger de sales faria
+SALES_CHANGED_SQL = """
+UPDATE table_versions SET version = version + 1, changed_at = now() WHERE table_name = 'sales';
+SELECT pg_notify('table_changes', 'sales');
+"""
+
+
+def ensure_sales_partitions(engine, start: datetime = None, end: datetime = None,
+                            months_ahead: int = SALES_PARTITION_MONTHS_AHEAD) -> int:
+    """
+    Cria as partições mensais que faltam entre start e end (por padrão, do mês corrente até
+    months_ahead meses à frente). Vendas desses meses que estavam em sales_default são movidas
+    para a nova partição. Em bancos que não são Postgres não faz nada.
+
+    Returns:
+        int: número de partições criadas.
+    """
+    if engine.dialect.name != "postgresql":
+        return 0
+    start = start or datetime.now(timezone.utc)
+    end = end or start + timedelta(days=31 * months_ahead)
+    with engine.begin() as connection:
+        return connection.execute(
+            text("SELECT ensure_sales_partitions(:start, :end)"), {"start": start, "end": end}
+        ).scalar()
+
+
+def list_sales_partitions(engine, ending_by: datetime = None, starting_before: datetime = None) -> list:
+    """
+    Retorna as partições de sales com o intervalo (bound, como no DDL, e lower_bound/upper_bound,
+    com upper_bound exclusivo), as linhas estimadas e o tamanho em disco.
+
+    Args:
+        ending_by (datetime): Só as partições cujo intervalo termina até esta data; sales_default
+            nunca entra.
+        starting_before (datetime): Só as partições com alguma data anterior a esta; sales_default
+            e a que começa em MINVALUE sempre entram.
+    """
+    conditions, params = ["true"], {}
+    if ending_by is not None:
+        conditions.append("upper_bound <= :ending_by")
+        params["ending_by"] = ending_by
+    if starting_before is not None:
+        conditions.append("(lower_bound IS NULL OR lower_bound < :starting_before)")
+        params["starting_before"] = starting_before
+    sql = PARTITIONS_SQL.format(condition=" AND ".join(conditions))
+    with engine.connect() as connection:
+        return [dict(row) for row in connection.execute(text(sql), params).mappings()]
+
+
+def detach_sales_partitions(engine, before: datetime, drop: bool = False) -> list:
+    """
+    Desanexa de sales as partições cujo intervalo termina até before. Cada uma vira uma tabela
+    comum com o mesmo nome (arquivo das vendas antigas, que pode ser exportado ou removido);
+    com drop=True é removida. sales_default nunca é desanexada.
+
+    O detach só altera o catálogo: não lê nem copia as vendas da partição.
+
+    Returns:
+        list: nomes das partições desanexadas.
+    """
+    detached = []
+    for partition in list_sales_partitions(engine, ending_by=before):
+        with engine.begin() as connection:
+            connection.execute(text(f"SET LOCAL lock_timeout = '{DETACH_LOCK_TIMEOUT}'"))
+            connection.execute(text(f'ALTER TABLE sales DETACH PARTITION "{partition["name"]}"'))
+            if drop:
+                connection.execute(text(f'DROP TABLE "{partition["name"]}"'))
+            connection.execute(text(SALES_CHANGED_SQL))
+        detached.append(partition["name"])
+    return detached
+
+
+class PartitionMaintainer(threading.Thread):
+    """
+    Thread que chama ensure_sales_partitions a cada SALES_PARTITION_CHECK_HOURS, para que os
+    próximos meses sempre tenham partição. Vários workers podem rodá-la ao mesmo tempo: a função
+    no banco serializa as chamadas com um advisory lock e só cria o que falta.
+    """
+
+    def __init__(self, engine, interval: float = SALES_PARTITION_CHECK_HOURS * 3600):
+        super().__init__(name="partition-maintainer", daemon=True)
+        self.engine = engine
+        self.interval = interval
+        self._stopped = threading.Event()
+
+    def run(self):
+        while not self._stopped.is_set():
+            try:
+                created = ensure_sales_partitions(self.engine)
+                if created:
+                    logger.info("%s partições de sales criadas", created)
+            except Exception as e:
+                logger.warning("Não foi possível criar as partições de sales: %s", e)
+            self._stopped.wait(self.interval)
+
+    def stop(self):
+        self._stopped.set()
+
+
+def start_partition_maintenance(engine):
+    """
+    Inicia o PartitionMaintainer deste worker. Retorna None em bancos que não são Postgres.
+    """
+    if engine.dialect.name != "postgresql":
+        return None
+    maintainer = PartitionMaintainer(engine)
+    maintainer.start()
+    return maintainer
+
+
+def main():
+    from database.database import engine
+
+    parser = argparse.ArgumentParser(description="Manutenção das partições mensais de sales.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list", help="lista as partições")
+    ensure = commands.add_parser("ensure", help="cria as partições dos próximos meses")
+    ensure.add_argument("--months-ahead", type=int, default=SALES_PARTITION_MONTHS_AHEAD)
+    detach = commands.add_parser("detach", help="desanexa as partições que terminam até uma data")
+    detach.add_argument("--before", type=datetime.fromisoformat, required=True, help="AAAA-MM-DD")
+    detach.add_argument("--drop", action="store_true", help="remove as partições em vez de mantê-las como tabelas")
+    args = parser.parse_args()
+
+    if args.command == "list":
+        for partition in list_sales_partitions(engine):
+            print(f"{partition['name']:20} {partition['rows']:>12} linhas {partition['bytes'] / 1024 / 1024:>10.1f} MB  {partition['bound']}")
+    elif args.command == "ensure":
+        print(f"{ensure_sales_partitions(engine, months_ahead=args.months_ahead)} partições criadas")
+    else:
+        before = args.before if args.before.tzinfo else args.before.replace(tzinfo=timezone.utc)
+        detached = detach_sales_partitions(engine, before, drop=args.drop)
+        print(f"{len(detached)} partições desanexadas: {', '.join(detached) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
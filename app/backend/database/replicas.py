@@ -0,0 +1,165 @@
+"""
+Réplicas de leitura do Postgres.
+
+Com DB_REPLICA_URLS (URLs separadas por vírgula, no formato postgresql+psycopg2://...), os GET das
+rotas leem de uma réplica saudável, em rodízio; as escritas e as demais leituras continuam no
+primário. O ReplicaRoutingMiddleware (middleware/replica.py) escolhe a réplica de cada requisição
+e get_db/get_async_db abrem a sessão nela.
+
+Uma réplica só recebe leituras enquanto a verificação periódica conseguir conectar e o atraso
+de replicação for no máximo DB_REPLICA_MAX_LAG_SECONDS. Por isso, durante
+READ_YOUR_WRITES_SECONDS depois de uma escrita, o cliente que escreveu lê do primário (cookie
+READ_YOUR_WRITES_COOKIE) e as respostas lidas de réplicas não entram no cache.
+"""
+import itertools
+import logging
+import os
+import threading
+import time
+from contextvars import ContextVar
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+
+logger = logging.getLogger(__name__)
+
+DB_REPLICA_URLS = [url.strip() for url in os.getenv("DB_REPLICA_URLS", "").split(",") if url.strip()]
+DB_REPLICA_CHECK_SECONDS = float(os.getenv("DB_REPLICA_CHECK_SECONDS", "5"))
+DB_REPLICA_MAX_LAG_SECONDS = float(os.getenv("DB_REPLICA_MAX_LAG_SECONDS", "10"))
+
+# Tempo em que uma escrita pode ainda não ter chegado a uma réplica considerada saudável
+READ_YOUR_WRITES_SECONDS = DB_REPLICA_MAX_LAG_SECONDS + DB_REPLICA_CHECK_SECONDS
+READ_YOUR_WRITES_COOKIE = "db_read_primary"
+
+# Atraso da réplica em segundos; 0 quando ela já aplicou tudo o que recebeu (primário parado)
+# ou quando a URL aponta para um servidor que não é réplica
+LAG_SQL = """
+SELECT CASE
+    WHEN NOT pg_is_in_recovery() THEN 0
+    WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+    ELSE coalesce(extract(epoch FROM now() - pg_last_xact_replay_timestamp()), 0)
+END
+"""
+
+# Réplica escolhida para a requisição atual; None lê do primário
+current_replica: ContextVar = ContextVar("current_replica", default=None)
+
+
+def async_url(url: str) -> str:
+    """
+    URL asyncpg equivalente a uma URL psycopg2, para os motores assíncronos das réplicas.
+    """
+    return make_url(url).set(drivername="postgresql+asyncpg").render_as_string(hide_password=False)
+
+
+class Replica:
+    """
+    Uma réplica de leitura: os motores síncrono e assíncrono e o resultado da última verificação.
+    """
+
+    def __init__(self, name: str, engine, async_engine=None):
+        self.name = name
+        self.engine = engine
+        self.async_engine = async_engine
+        self.healthy = False
+        self.lag = None
+        self.checked_at = None
+        self.error = None
+
+    def check(self):
+        try:
+            with self.engine.connect() as connection:
+                lag = float(connection.execute(text(LAG_SQL)).scalar())
+        except Exception as e:
+            self.healthy, self.lag, self.error = False, None, str(e)
+        else:
+            self.healthy, self.lag, self.error = lag <= DB_REPLICA_MAX_LAG_SECONDS, lag, None
+        self.checked_at = time.time()
+        return self.healthy
+
+    def status(self) -> dict:
+        return {
+            "healthy": self.healthy,
+            "lag_seconds": None if self.lag is None else round(self.lag, 3),
+            "checked_at": self.checked_at,
+            "error": self.error,
+        }
+
+
+class ReplicaSet:
+    """
+    Réplicas deste worker, escolhidas em rodízio entre as saudáveis, e o horário da última
+    alteração de cada tabela (escritas da API e avisos de NOTIFY).
+    """
+
+    def __init__(self, replicas: list):
+        self.replicas = replicas
+        self._counter = itertools.count()
+        self._changed_at = {}
+        self._lock = threading.Lock()
+
+    def __bool__(self):
+        return bool(self.replicas)
+
+    def choose(self):
+        """
+        Retorna a próxima réplica saudável, ou None se não houver nenhuma.
+        """
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            return None
+        return healthy[next(self._counter) % len(healthy)]
+
+    def mark_changed(self, table: str = None):
+        """
+        Registra uma alteração na tabela, ou em todas quando table é None (reconexão do listener).
+        """
+        with self._lock:
+            self._changed_at[table] = time.monotonic()
+
+    def recently_changed(self, table: str) -> bool:
+        """
+        Indica se a tabela mudou há menos de READ_YOUR_WRITES_SECONDS, ou seja, se uma réplica
+        saudável pode ainda não ter a alteração.
+        """
+        with self._lock:
+            changed_at = max(self._changed_at.get(table, 0.0), self._changed_at.get(None, 0.0))
+        return changed_at > 0 and time.monotonic() - changed_at < READ_YOUR_WRITES_SECONDS
+
+    def check(self):
+        for replica in self.replicas:
+            was_healthy = replica.healthy
+            if replica.check() and not was_healthy:
+                logger.info("Réplica %s no rodízio (atraso %ss)", replica.name, replica.lag)
+            elif was_healthy and not replica.healthy:
+                logger.warning("Réplica %s fora do rodízio: atraso %s, erro %s", replica.name, replica.lag, replica.error)
+
+
+class ReplicaHealthChecker(threading.Thread):
+    """
+    Thread que verifica as réplicas a cada DB_REPLICA_CHECK_SECONDS: conexão e atraso de replicação.
+    """
+
+    def __init__(self, replicas: ReplicaSet, interval: float = DB_REPLICA_CHECK_SECONDS):
+        super().__init__(name="replica-health", daemon=True)
+        self.replicas = replicas
+        self.interval = interval
+        self._stopped = threading.Event()
+
+    def run(self):
+        while not self._stopped.is_set():
+            self.replicas.check()
+            self._stopped.wait(self.interval)
+
+    def stop(self):
+        self._stopped.set()
+
+
+def start_replica_checks(replicas: ReplicaSet):
+    """
+    Inicia o ReplicaHealthChecker deste worker. Retorna None quando não há réplicas configuradas.
+    """
+    if not replicas:
+        return None
+    checker = ReplicaHealthChecker(replicas)
+    checker.start()
+    return checker
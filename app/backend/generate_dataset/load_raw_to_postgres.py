@@ -43,6 +43,20 @@ def ajustar_sequencia(postgres_table, sequence_name, id_column):
         max_id = connection.execute(text(f"SELECT MAX({id_column}) FROM {postgres_table}")).scalar()
         if max_id is not None:
             connection.execute(text(f"SELECT setval('{sequence_name}', :new_val)"), {"new_val": max_id + 1})
+        # Avisa os workers da API para invalidarem o cache da tabela (cobre tabelas criadas
+        # aqui pelo DuckDB, que ainda não têm o trigger de NOTIFY instalado pela API)
+        connection.execute(text("SELECT pg_notify('table_changes', :table)"), {"table": postgres_table})
+        connection.commit()
+    engine.dispose()
+
+# Função para criar as partições mensais de sales que cobrem as datas de uma view do DuckDB
+def criar_particoes_sales(schema):
+    inicio, fim = con.execute(f"SELECT min(date), max(date) FROM {schema}").fetchone()
+    if inicio is None:
+        return
+    engine = create_engine(postgres_conn)
+    with engine.begin() as connection:
+        connection.execute(text("SELECT ensure_sales_partitions(:inicio, :fim)"), {"inicio": inicio, "fim": fim})
     engine.dispose()
 
 # Função para criar a tabela se ela não existir
@@ -72,10 +86,15 @@ def load_parquet_to_postgres(parquet_dir, postgres_table, sequence_name, id_colu
         
         # Criar a tabela no PostgreSQL, se não existir
         create_table_if_not_exists(postgres_table, 'temp_view')
+
+        # sales é particionada por mês: cria antes as partições do período do arquivo
+        if postgres_table == "sales":
+            criar_particoes_sales('temp_view')
         
-        # Inserir os dados diretamente no PostgreSQL
+        # Inserir os dados diretamente no PostgreSQL, casando as colunas pelo nome: as que não
+        # estão no arquivo (employee_id, product_id, supplier_id) são preenchidas pelos triggers
         con.execute(f"""
-            INSERT INTO postgres_db.public.{postgres_table}
+            INSERT INTO postgres_db.public.{postgres_table} BY NAME
             SELECT * FROM temp_view;
         """)
     
@@ -85,11 +104,12 @@ def load_parquet_to_postgres(parquet_dir, postgres_table, sequence_name, id_colu
     ajustar_sequencia(postgres_table, sequence_name, id_column)
 
 # Caminhos para as pastas de arquivos Parquet e configurações de sequência
+# (na ordem das chaves estrangeiras: fornecedores e vendedores antes dos produtos e das vendas)
 parquet_config = [
+    {"dir": './app/backend/datasets/raw_data/supplier/', "table": "suppliers", "sequence": "suppliers_supplier_id_seq", "id_column": "supplier_id"},
     {"dir": './app/backend/datasets/raw_data/employee/', "table": "employees", "sequence": "employees_employee_id_seq", "id_column": "employee_id"},
     {"dir": './app/backend/datasets/raw_data/product/', "table": "products", "sequence": "products_id_seq", "id_column": "id"},
     {"dir": './app/backend/datasets/raw_data/sales/', "table": "sales", "sequence": "sales_id_seq", "id_column": "id"},
-    {"dir": './app/backend/datasets/raw_data/supplier/', "table": "suppliers", "sequence": "suppliers_supplier_id_seq", "id_column": "supplier_id"},
 ]
 
 # Carregar os arquivos Parquet para PostgreSQL de acordo com os modelos de dados
@@ -3,8 +3,8 @@ import logging
 from dotenv import load_dotenv
 import requests
 import pandas as pd
-from sqlalchemy import create_engine
 from sqlalchemy.exc import SQLAlchemyError
+from database.database import create_db_engine
 
 # Configura o logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -58,8 +58,9 @@ def save_to_csv(df, filename='typeform_responses.csv'):
 
 def save_to_database(df, db_url):
     try:
-        engine = create_engine(db_url)
+        engine = create_db_engine(db_url)
         df.to_sql('typeform_responses', con=engine, if_exists='replace', index=False)
+        engine.dispose()
         logging.info("As respostas foram inseridas no banco de dados PostgreSQL.")
     except SQLAlchemyError as e:
         logging.error(f"Erro ao inserir no banco de dados: {e}")
@@ -76,5 +77,6 @@ def main():
     except EnvironmentError as e:
         logging.error(e)
 
+# Executar a partir de app/backend: python -m integration.typeform_to_postgresql
 if __name__ == "__main__":
     main()
@@ -1,5 +1,18 @@
-from fastapi import FastAPI
-from database.database import engine
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from database.database import DB_ASYNC, async_engine, engine, replica_set
+from database.invalidation import start_change_listener
+from database.migrate import check_schema_version
+from database.partitions import start_partition_maintenance
+from database.replicas import start_replica_checks
+from crud.base import InvalidCursorError
+from middleware.cache import CACHE_TTL, ResponseCacheMiddleware, response_cache
+from middleware.etag import ETagMiddleware, version_cache
+from middleware.metrics import MetricsMiddleware, track_db_time
+from middleware.tracing import setup_tracing
+from middleware.replica import ReplicaRoutingMiddleware
+from middleware.singleflight import SingleFlightMiddleware, single_flight
 
 import models.product.product
 import models.sales.sales
@@ -10,14 +23,96 @@ from routes.product.routes_product import router as product_router
 from routes.sales.routes_sales import router as sales_router
 from routes.employee.routes_employee import router as employee_router
 from routes.supplier.routes_supplier import router as supplier_router
+from routes.internal.routes_internal import router as internal_router
 
-models.product.product.Base.metadata.create_all(bind=engine)
-models.sales.sales.Base.metadata.create_all(bind=engine)
-models.employee.employee.Base.metadata.create_all(bind=engine)
-models.supplier.supplier.Base.metadata.create_all(bind=engine)
+# As tabelas, os índices e os triggers de NOTIFY são criados pelas migrações (python -m database.migrate),
+# executadas uma vez por deploy; aqui só conferimos se o banco está na última revisão
+check_schema_version(engine)
+
+# Todos os motores: primário e réplicas, síncronos e assíncronos
+db_engines = [engine, async_engine]
+for replica in replica_set.replicas:
+    db_engines += [replica.engine, replica.async_engine]
+db_engines = [db_engine for db_engine in db_engines if db_engine is not None]
+
+# Tempo de banco por requisição
+for db_engine in db_engines:
+    track_db_time(db_engine)
+
+
+def invalidate_caches(table: str = None):
+    response_cache.invalidate(table)
+    version_cache.invalidate(table)
+    single_flight.invalidate(table)
+    replica_set.mark_changed(table)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Cada worker escuta os avisos e invalida os seus caches; ao reconectar, descarta tudo
+    listener = start_change_listener(engine, invalidate_caches, invalidate_caches)
+    # Mantém criadas as partições de sales dos próximos meses
+    maintainer = start_partition_maintenance(engine)
+    # Verifica conexão e atraso das réplicas de leitura, quando configuradas
+    replica_checker = start_replica_checks(replica_set)
+    yield
+    if listener is not None:
+        listener.stop()
+    if maintainer is not None:
+        maintainer.stop()
+    if replica_checker is not None:
+        replica_checker.stop()
+    # Envia os spans que ainda estão no buffer
+    if tracer_provider is not None:
+        tracer_provider.shutdown()
+
+
+app = FastAPI(lifespan=lifespan)
+
+if CACHE_TTL > 0:
+    app.add_middleware(ResponseCacheMiddleware)
+
+# Por fora do cache: vários misses simultâneos da mesma URL viram uma única consulta
+app.add_middleware(SingleFlightMiddleware)
+
+# Adicionado por último para ficar por fora do cache: um 304 não passa nem pelo cache.
+# Depende da tabela table_versions, mantida pelos triggers que só existem no Postgres
+if engine.dialect.name == "postgresql":
+    app.add_middleware(ETagMiddleware, engine=engine)
+
+# Por fora de todos: escolhe a réplica de cada GET antes do ETag, do single-flight e do cache
+if replica_set:
+    app.add_middleware(ReplicaRoutingMiddleware, replicas=replica_set)
+
+# Por fora de todos, para medir também os hits do cache e os 304 do ETag
+app.add_middleware(MetricsMiddleware)
+
+# Traces do OpenTelemetry (requisição e comandos SQL), quando OTEL_TRACES_EXPORTER está configurado
+tracer_provider = setup_tracing(app, db_engines)
+
+if DB_ASYNC:
+    # As rotas assíncronas são registradas primeiro e atendem os mesmos caminhos das síncronas;
+    # ficam fora do OpenAPI porque a documentação das síncronas já descreve os mesmos parâmetros
+    from routes.product.routes_product_async import router as product_async_router
+    from routes.sales.routes_sales_async import router as sales_async_router
+    from routes.employee.routes_employee_async import router as employee_async_router
+    from routes.supplier.routes_supplier_async import router as supplier_async_router
+
+    app.include_router(product_async_router, include_in_schema=False)
+    app.include_router(sales_async_router, include_in_schema=False)
+    app.include_router(employee_async_router, include_in_schema=False)
+    app.include_router(supplier_async_router, include_in_schema=False)
 
-app = FastAPI()
 app.include_router(product_router)
 app.include_router(sales_router)
 app.include_router(employee_router)
 app.include_router(supplier_router)
+app.include_router(internal_router)
+
+
+@app.exception_handler(InvalidCursorError)
+def invalid_cursor_handler(request: Request, exc: InvalidCursorError):
+    """
+    Responde 400 quando o cursor de paginação (parâmetro after) é inválido.
+    """
+    return JSONResponse(status_code=400, content={"detail": str(exc)})
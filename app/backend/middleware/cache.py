@@ -0,0 +1,214 @@
+import os
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from datetime import date
+from urllib.parse import parse_qsl, urlencode
+from starlette.requests import Request
+from database.database import replica_set
+from database.replicas import ReplicaSet, current_replica
+from routes.formats import STREAMING_MEDIA_TYPES, negotiate
+
+# Tempo de vida (segundos) e quantidade máxima de respostas guardadas por worker; CACHE_TTL=0 desliga o cache
+CACHE_TTL = float(os.getenv("CACHE_TTL", "30"))
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "512"))
+
+# Respostas maiores que isso não são guardadas
+CACHE_MAX_BODY_BYTES = int(os.getenv("CACHE_MAX_BODY_BYTES", str(4 * 1024 * 1024)))
+
+# Prefixo das rotas -> tabela cujas alterações invalidam as respostas dessas rotas
+CACHED_PREFIXES = {
+    "/sales/": "sales",
+    "/products/": "products",
+    "/employees/": "employees",
+    "/suppliers/": "suppliers",
+}
+
+WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+# Rotas cujo resultado depende da data atual (folha até o mês atual, aniversariantes do mês atual):
+# a data entra na chave, e com ela no ETag, para a resposta mudar na virada do dia sem uma escrita
+DATED_PATHS = {"/employees/analytics/payroll", "/employees/analytics/birthdays"}
+
+
+def table_for_path(path: str):
+    """
+    Retorna a tabela associada ao caminho, ou None se a rota não passa pelo cache.
+    """
+    for prefix, table in CACHED_PREFIXES.items():
+        if path.startswith(prefix):
+            return table
+    return None
+
+
+class ResponseCache:
+    """
+    Cache LRU com TTL de respostas já serializadas (status, headers e corpo em bytes).
+
+    Cada tabela tem uma geração, incrementada a cada invalidação. Uma resposta só é guardada
+    se a geração da sua tabela não mudou desde o início da requisição, para que uma escrita
+    concorrente não deixe no cache um resultado lido antes dela.
+    """
+
+    def __init__(self, ttl: float = CACHE_TTL, max_entries: int = CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._generations = defaultdict(int)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def generation(self, table: str) -> int:
+        with self._lock:
+            return self._generations[table]
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[2]
+
+    def set(self, key, table: str, generation: int, response: tuple):
+        with self._lock:
+            if self._generations[table] != generation:
+                return
+            self._entries[key] = (time.monotonic() + self.ttl, table, response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, table: str = None):
+        """
+        Remove as respostas de uma tabela, ou de todas quando table é None.
+        """
+        with self._lock:
+            tables = list(self._generations) if table is None else [table]
+            for name in tables:
+                self._generations[name] += 1
+            self._entries = OrderedDict(
+                (key, entry) for key, entry in self._entries.items()
+                if table is not None and entry[1] != table
+            )
+            self.invalidations += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+# Cache deste worker, invalidado pela própria API e pelo listener de NOTIFY
+response_cache = ResponseCache()
+
+
+def _cache_key(scope, media_type: str) -> tuple:
+    # Ordena só pelo nome do parâmetro: a ordem de parâmetros repetidos (ex.: metrics) é mantida
+    query = sorted(parse_qsl(scope["query_string"].decode("latin-1"), keep_blank_values=True), key=lambda item: item[0])
+    if scope["path"] in DATED_PATHS:
+        return scope["path"], urlencode(query), media_type, date.today().isoformat()
+    return scope["path"], urlencode(query), media_type
+
+
+class ResponseCacheMiddleware:
+    """
+    Middleware ASGI que guarda as respostas 200 dos GET das rotas em CACHED_PREFIXES.
+
+    Os formatos em streaming (NDJSON, Arrow, Parquet) não passam pelo cache. Escritas bem
+    sucedidas invalidam a tabela neste worker na hora; os demais workers são avisados
+    pelo trigger de NOTIFY da tabela. Respostas lidas de uma réplica logo depois de uma
+    alteração da tabela não são guardadas, porque a réplica pode ainda não tê-la.
+    """
+
+    def __init__(self, app, cache: ResponseCache = response_cache, replicas: ReplicaSet = replica_set):
+        self.app = app
+        self.cache = cache
+        self.replicas = replicas
+
+    async def __call__(self, scope, receive, send):
+        table = table_for_path(scope["path"]) if scope["type"] == "http" else None
+        if table is None:
+            await self.app(scope, receive, send)
+            return
+        if scope["method"] in WRITE_METHODS:
+            await self._write(table, scope, receive, send)
+            return
+        media_type = negotiate(Request(scope))
+        if scope["method"] != "GET" or media_type in STREAMING_MEDIA_TYPES:
+            await self.app(scope, receive, send)
+            return
+
+        key = _cache_key(scope, media_type)
+        cached = self.cache.get(key)
+        if cached is not None:
+            status, headers, body = cached
+            await send({"type": "http.response.start", "status": status, "headers": headers + [(b"x-cache", b"HIT")]})
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        if current_replica.get() is not None and self.replicas.recently_changed(table):
+            await self.app(scope, receive, send)
+            return
+
+        generation = self.cache.generation(table)
+        response = {"status": None, "headers": None, "body": [], "size": 0}
+
+        async def send_and_store(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+                response["headers"] = list(message.get("headers", []))
+                message = {**message, "headers": response["headers"] + [(b"x-cache", b"MISS")]}
+            elif message["type"] == "http.response.body" and response["body"] is not None:
+                response["size"] += len(message.get("body", b""))
+                if response["size"] > CACHE_MAX_BODY_BYTES:
+                    response["body"] = None
+                else:
+                    response["body"].append(message.get("body", b""))
+                    if not message.get("more_body", False) and self._cacheable(response):
+                        self.cache.set(key, table, generation, (
+                            response["status"], response["headers"], b"".join(response["body"])
+                        ))
+            await send(message)
+
+        await self.app(scope, receive, send_and_store)
+
+    @staticmethod
+    def _cacheable(response: dict) -> bool:
+        if response["status"] != 200:
+            return False
+        return not any(name.lower() == b"set-cookie" for name, _ in response["headers"])
+
+    async def _write(self, table: str, scope, receive, send):
+        await invalidate_on_write(self.app, self.cache, table, scope, receive, send)
+
+
+async def invalidate_on_write(app, cache, table: str, scope, receive, send):
+    """
+    Executa uma escrita e, se ela for bem sucedida, chama cache.invalidate(table) neste worker,
+    sem esperar o NOTIFY do trigger.
+    """
+    async def send_and_invalidate(message):
+        # A rota já fez o commit quando começa a enviar a resposta
+        if message["type"] == "http.response.start" and message["status"] < 400:
+            cache.invalidate(table)
+        await send(message)
+
+    await app(scope, receive, send_and_invalidate)
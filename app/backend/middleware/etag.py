@@ -0,0 +1,105 @@
+import hashlib
+import os
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
+from database.database import replica_set
+from database.invalidation import read_table_version
+from database.replicas import ReplicaSet, current_replica
+from middleware.cache import (
+    CACHED_PREFIXES,
+    WRITE_METHODS,
+    ResponseCache,
+    _cache_key,
+    invalidate_on_write,
+    table_for_path,
+)
+from routes.formats import negotiate
+
+# Segundos que cada worker guarda a versão lida de uma tabela. As escritas e o NOTIFY já a
+# invalidam; o TTL só limita o atraso se um NOTIFY se perder. É separado de CACHE_TTL, então
+# desligar o cache de respostas (CACHE_TTL=0) não faz cada requisição ler table_versions
+ETAG_VERSION_TTL = float(os.getenv("ETAG_VERSION_TTL", "30"))
+
+# Versões lidas de table_versions, guardadas por worker e invalidadas pelas escritas e pelo NOTIFY.
+# Uma por tabela no primário e em cada réplica
+version_cache = ResponseCache(
+    ttl=ETAG_VERSION_TTL, max_entries=len(CACHED_PREFIXES) * (1 + len(replica_set.replicas)),
+)
+
+
+def make_etag(version: int, key: tuple) -> str:
+    """
+    Monta o ETag fraco de uma resposta: a versão da tabela mais um hash do caminho, da query
+    e do formato (e da data, nas rotas em DATED_PATHS), para que URLs diferentes da mesma tabela
+    tenham ETags diferentes.
+    """
+    digest = hashlib.sha1(repr(key).encode()).hexdigest()[:16]
+    return f'W/"{version}-{digest}"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """
+    Compara o header If-None-Match com o ETag (comparação fraca, aceita lista e *).
+    """
+    if if_none_match.strip() == "*":
+        return True
+    weak = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == weak for tag in if_none_match.split(","))
+
+
+class ETagMiddleware:
+    """
+    Middleware ASGI que adiciona um ETag às respostas 200 dos GET das rotas em CACHED_PREFIXES
+    e responde 304 Not Modified, sem executar a rota, quando o If-None-Match do cliente confere.
+
+    O ETag depende da versão da tabela (table_versions, incrementada pelos triggers), lida
+    antes da rota: se uma escrita acontecer durante a requisição, o ETag enviado é o antigo e o
+    cliente apenas baixa os dados de novo na próxima vez. Vale também para os formatos em streaming.
+
+    Nos GET lidos de uma réplica, a versão vem da própria réplica, que a recebe na mesma
+    transação que os dados: o ETag nunca é mais novo que a resposta. Enquanto a tabela mudou há
+    pouco (a réplica pode não ter a alteração), essa versão não é guardada.
+    """
+
+    def __init__(self, app, engine, versions: ResponseCache = version_cache, replicas: ReplicaSet = replica_set):
+        self.app = app
+        self.engine = engine
+        self.versions = versions
+        self.replicas = replicas
+
+    async def _version(self, table: str) -> int:
+        replica = current_replica.get()
+        key = table if replica is None else (table, replica.name)
+        version = self.versions.get(key)
+        if version is None:
+            generation = self.versions.generation(table)
+            version = await run_in_threadpool(read_table_version, self.engine if replica is None else replica.engine, table)
+            if replica is None or not self.replicas.recently_changed(table):
+                self.versions.set(key, table, generation, version)
+        return version
+
+    async def __call__(self, scope, receive, send):
+        table = table_for_path(scope["path"]) if scope["type"] == "http" else None
+        if table is None:
+            await self.app(scope, receive, send)
+            return
+        if scope["method"] in WRITE_METHODS:
+            await invalidate_on_write(self.app, self.versions, table, scope, receive, send)
+            return
+        if scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
+        etag = make_etag(await self._version(table), _cache_key(scope, negotiate(request)))
+        if etag_matches(request.headers.get("if-none-match", ""), etag):
+            await send({"type": "http.response.start", "status": 304, "headers": [(b"etag", etag.encode())]})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        async def send_with_etag(message):
+            if message["type"] == "http.response.start" and message["status"] == 200:
+                message = {**message, "headers": list(message.get("headers", [])) + [(b"etag", etag.encode())]}
+            await send(message)
+
+        await self.app(scope, receive, send_with_etag)
@@ -0,0 +1,256 @@
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from sqlalchemy import event
+from starlette.routing import Match
+
+# Content-Type do formato texto de exposição do Prometheus
+METRICS_MEDIA_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+# Rótulo das requisições que não correspondem a nenhuma rota, para não criar uma série por URL
+UNMATCHED_ROUTE = "unmatched"
+
+# [segundos, consultas] no banco da requisição atual
+request_db_time: ContextVar = ContextVar("request_db_time", default=None)
+
+
+class _Shards:
+    """
+    Uma cópia dos valores por thread. Cada thread só escreve na sua, sem lock; a leitura soma
+    todas. O lock só é usado quando uma thread escreve pela primeira vez.
+
+    As cópias de threads que terminaram continuam na soma, para os contadores nunca diminuírem.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._all = []
+        self._lock = threading.Lock()
+
+    def mine(self) -> dict:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = {}
+            with self._lock:
+                self._all.append(shard)
+        return shard
+
+    def merged(self) -> dict:
+        with self._lock:
+            shards = list(self._all)
+        merged = {}
+        for shard in shards:
+            for labels, values in list(shard.items()):
+                total = merged.get(labels)
+                if total is None:
+                    merged[labels] = list(values)
+                else:
+                    for i, value in enumerate(values):
+                        total[i] += value
+        return merged
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: tuple, values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """
+    Contador com rótulos, no formato de exposição do Prometheus.
+    """
+
+    kind = "counter"
+
+    def __init__(self, name: str, description: str, labelnames: tuple = ()):
+        self.name = name
+        self.description = description
+        self.labelnames = labelnames
+        self._shards = _Shards()
+
+    def inc(self, labels: tuple = (), amount: float = 1):
+        shard = self._shards.mine()
+        values = shard.get(labels)
+        if values is None:
+            values = shard[labels] = [0]
+        values[0] += amount
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} {self.kind}"]
+        for labels, values in sorted(self._shards.merged().items()):
+            lines.append(f"{self.name}{_labels(self.labelnames, labels)} {_number(values[0])}")
+        return lines
+
+
+class Gauge(Counter):
+    """
+    Valor que sobe e desce. Cada thread soma os seus incrementos e decrementos.
+    """
+
+    kind = "gauge"
+
+    def dec(self, labels: tuple = (), amount: float = 1):
+        self.inc(labels, -amount)
+
+
+class Histogram:
+    """
+    Histograma com rótulos: contagem por faixa (buckets), soma e total de observações.
+    """
+
+    def __init__(self, name: str, description: str, labelnames: tuple, buckets: tuple):
+        self.name = name
+        self.description = description
+        self.labelnames = labelnames
+        self.buckets = buckets
+        self._shards = _Shards()
+
+    def observe(self, labels: tuple, value: float):
+        shard = self._shards.mine()
+        values = shard.get(labels)
+        if values is None:
+            # Uma posição por bucket, uma para +Inf e a soma no final
+            values = shard[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        values[bisect_left(self.buckets, value)] += 1
+        values[-1] += value
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} histogram"]
+        for labels, values in sorted(self._shards.merged().items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), values):
+                cumulative += count
+                le = f'le="{bound}"'
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {_number(values[-1])}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+requests_in_flight = Gauge("http_requests_in_flight", "Requisições HTTP em andamento neste worker.")
+request_duration = Histogram(
+    "http_request_duration_seconds", "Tempo de resposta, até o último pedaço do corpo.",
+    ("method", "route", "status"), LATENCY_BUCKETS,
+)
+response_size = Histogram(
+    "http_response_size_bytes", "Tamanho do corpo da resposta.", ("method", "route"), SIZE_BUCKETS,
+)
+request_db_duration = Histogram(
+    "http_request_db_seconds", "Tempo da requisição gasto executando consultas no banco.",
+    ("method", "route"), LATENCY_BUCKETS,
+)
+db_queries = Counter("http_db_queries_total", "Consultas executadas no banco pelas requisições.", ("method", "route"))
+
+METRICS = [requests_in_flight, request_duration, response_size, request_db_duration, db_queries]
+
+
+def render_metrics() -> str:
+    """
+    Métricas deste worker no formato texto de exposição do Prometheus.
+    """
+    lines = []
+    for metric in METRICS:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._metrics_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_metrics_started", None)
+    timer = request_db_time.get()
+    if started is not None and timer is not None:
+        timer[0] += time.perf_counter() - started
+        timer[1] += 1
+
+
+def track_db_time(engine):
+    """
+    Soma o tempo de cada consulta do motor (síncrono ou assíncrono) ao da requisição atual.
+
+    A requisição é encontrada pela ContextVar request_db_time, que também chega às rotas
+    síncronas executadas no threadpool.
+    """
+    target = getattr(engine, "sync_engine", engine)
+    event.listen(target, "before_cursor_execute", _before_cursor_execute)
+    event.listen(target, "after_cursor_execute", _after_cursor_execute)
+
+
+def route_template(scope) -> str:
+    """
+    Caminho da rota com os parâmetros (/sales/{sales_id}), e não a URL, para manter poucas séries.
+
+    O roteador do FastAPI o deixa em scope["route"]; as respostas dadas antes dele (cache, 304 do
+    ETag) procuram a rota aqui.
+    """
+    route = scope.get("route")
+    if route is None and "app" in scope:
+        for candidate in scope["app"].router.routes:
+            match, _ = candidate.matches(scope)
+            if match == Match.FULL:
+                route = candidate
+                break
+    return getattr(route, "path", UNMATCHED_ROUTE)
+
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI que mede cada requisição HTTP: tempo até o último pedaço do corpo, bytes
+    enviados, requisições em andamento, e tempo e quantidade de consultas no banco (eventos
+    before/after_cursor_execute dos motores registrados com track_db_time).
+
+    O tempo fora do banco (hidratação do ORM, validação do Pydantic e serialização) é a diferença
+    entre http_request_duration_seconds e http_request_db_seconds da mesma rota.
+
+    Fica por fora de todos os middlewares, para medir também as respostas do cache e os 304.
+    Os valores são deste worker, como os de /internal/pool e /internal/cache.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        timer = [0.0, 0]
+        token = request_db_time.set(timer)
+        response = {"status": 500, "size": 0}
+
+        async def send_measured(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+            elif message["type"] == "http.response.body":
+                response["size"] += len(message.get("body", b""))
+            await send(message)
+
+        requests_in_flight.inc()
+        try:
+            await self.app(scope, receive, send_measured)
+        finally:
+            requests_in_flight.dec()
+            request_db_time.reset(token)
+            method, route = scope["method"], route_template(scope)
+            request_duration.observe((method, route, str(response["status"])), time.perf_counter() - started)
+            response_size.observe((method, route), response["size"])
+            request_db_duration.observe((method, route), timer[0])
+            db_queries.inc((method, route), timer[1])
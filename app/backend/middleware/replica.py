@@ -0,0 +1,60 @@
+from starlette.requests import Request
+from database.replicas import READ_YOUR_WRITES_COOKIE, READ_YOUR_WRITES_SECONDS, ReplicaSet, current_replica
+from middleware.cache import WRITE_METHODS, table_for_path
+
+READ_METHODS = {"GET", "HEAD"}
+
+
+def read_your_writes_cookie() -> bytes:
+    """
+    Set-Cookie enviado nas escritas: o cliente lê do primário até a escrita chegar às réplicas.
+    """
+    return (
+        f"{READ_YOUR_WRITES_COOKIE}=1; Max-Age={int(READ_YOUR_WRITES_SECONDS) + 1}; Path=/; HttpOnly; SameSite=Lax"
+    ).encode()
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Middleware ASGI que escolhe, para cada GET, uma réplica saudável em rodízio e a deixa em
+    current_replica, onde get_db, get_async_db e as respostas em streaming a encontram.
+
+    Lê do primário quando não há réplica saudável ou quando o cliente escreveu há pouco (cookie
+    READ_YOUR_WRITES_COOKIE, enviado nas escritas bem sucedidas). As escritas também marcam a
+    tabela como alterada neste worker; os demais sabem pelo NOTIFY.
+
+    Fica por fora do cache, do single-flight e do ETag, que usam a escolha para não misturar
+    respostas e versões do primário e das réplicas.
+    """
+
+    def __init__(self, app, replicas: ReplicaSet):
+        self.app = app
+        self.replicas = replicas
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        if scope["method"] in WRITE_METHODS:
+            await self._write(scope, receive, send)
+            return
+        replica = None
+        if scope["method"] in READ_METHODS and READ_YOUR_WRITES_COOKIE not in Request(scope).cookies:
+            replica = self.replicas.choose()
+        token = current_replica.set(replica)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            current_replica.reset(token)
+
+    async def _write(self, scope, receive, send):
+        table = table_for_path(scope["path"])
+
+        async def send_with_cookie(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                if table is not None:
+                    self.replicas.mark_changed(table)
+                message = {**message, "headers": list(message.get("headers", [])) + [(b"set-cookie", read_your_writes_cookie())]}
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
@@ -0,0 +1,142 @@
+import asyncio
+import threading
+from collections import defaultdict
+from starlette.requests import Request
+from database.replicas import current_replica
+from middleware.cache import CACHE_MAX_BODY_BYTES, WRITE_METHODS, _cache_key, invalidate_on_write, table_for_path
+from routes.formats import negotiate
+
+
+class SingleFlight:
+    """
+    Requisições GET idênticas em andamento neste worker, indexadas por (caminho, query, formato,
+    geração da tabela). A primeira executa a rota; as que chegam enquanto ela roda esperam e
+    recebem a mesma resposta já serializada.
+
+    A geração da tabela muda a cada escrita, então uma requisição que chega depois de uma
+    escrita não aproveita uma consulta iniciada antes dela.
+    """
+
+    def __init__(self):
+        self._flights = {}
+        self._generations = defaultdict(int)
+        self._lock = threading.Lock()
+        self.leaders = 0
+        self.coalesced = 0
+        self.fallbacks = 0
+
+    def generation(self, table: str) -> int:
+        with self._lock:
+            return self._generations[table]
+
+    def invalidate(self, table: str = None):
+        """
+        Faz com que as próximas requisições da tabela (ou de todas, quando table é None)
+        não se juntem às consultas já em andamento.
+        """
+        with self._lock:
+            for name in list(self._generations) if table is None else [table]:
+                self._generations[name] += 1
+
+    def join(self, key):
+        """
+        Retorna (future, líder). O líder deve resolver a future com a resposta, ou com None se
+        ela não puder ser compartilhada.
+        """
+        flight = self._flights.get(key)
+        if flight is not None:
+            return flight, False
+        flight = asyncio.get_running_loop().create_future()
+        self._flights[key] = flight
+        return flight, True
+
+    def finish(self, key, flight, response):
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        if not flight.done():
+            flight.set_result(response)
+
+    def stats(self) -> dict:
+        requests = self.leaders + self.coalesced
+        return {
+            "in_flight": len(self._flights),
+            "executed": self.leaders,
+            "coalesced": self.coalesced,
+            "coalesced_ratio": round(self.coalesced / requests, 4) if requests else 0.0,
+            "fallbacks": self.fallbacks,
+        }
+
+
+# Consultas em andamento deste worker
+single_flight = SingleFlight()
+
+
+class SingleFlightMiddleware:
+    """
+    Middleware ASGI que junta GETs idênticos e simultâneos das rotas em CACHED_PREFIXES em uma
+    única execução da rota, tanto no caminho síncrono quanto no assíncrono.
+
+    Vale também para os formatos em streaming: o líder envia os pedaços ao seu cliente à medida
+    que são gerados e os demais recebem o corpo inteiro quando ele termina. Respostas maiores que
+    CACHE_MAX_BODY_BYTES ou com Set-Cookie não são compartilhadas; nesse caso, e se o líder
+    falhar, cada requisição que esperava executa a rota por conta própria.
+    """
+
+    def __init__(self, app, flights: SingleFlight = single_flight):
+        self.app = app
+        self.flights = flights
+
+    async def __call__(self, scope, receive, send):
+        table = table_for_path(scope["path"]) if scope["type"] == "http" else None
+        if table is None:
+            await self.app(scope, receive, send)
+            return
+        if scope["method"] in WRITE_METHODS:
+            await invalidate_on_write(self.app, self.flights, table, scope, receive, send)
+            return
+        if scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+
+        # Quem lê do primário (escreveu há pouco) não recebe uma resposta lida de uma réplica
+        key = (_cache_key(scope, negotiate(Request(scope))), self.flights.generation(table), current_replica.get() is None)
+        flight, leader = self.flights.join(key)
+        if not leader:
+            shared = await asyncio.shield(flight)
+            if shared is None:
+                self.flights.fallbacks += 1
+                await self.app(scope, receive, send)
+                return
+            self.flights.coalesced += 1
+            status, headers, body = shared
+            await send({"type": "http.response.start", "status": status, "headers": headers})
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        self.flights.leaders += 1
+        response = {"status": None, "headers": None, "body": [], "size": 0}
+
+        async def send_and_record(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+                response["headers"] = list(message.get("headers", []))
+            elif message["type"] == "http.response.body" and response["body"] is not None:
+                response["size"] += len(message.get("body", b""))
+                if response["size"] > CACHE_MAX_BODY_BYTES:
+                    response["body"] = None
+                else:
+                    response["body"].append(message.get("body", b""))
+                    if not message.get("more_body", False):
+                        self.flights.finish(key, flight, self._shareable(response))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_and_record)
+        finally:
+            self.flights.finish(key, flight, None)
+
+    @staticmethod
+    def _shareable(response: dict):
+        if any(name.lower() == b"set-cookie" for name, _ in response["headers"]):
+            return None
+        return response["status"], response["headers"], b"".join(response["body"])
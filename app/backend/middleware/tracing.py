@@ -0,0 +1,73 @@
+"""
+Rastreamento com OpenTelemetry, desligado por padrão.
+
+OTEL_TRACES_EXPORTER escolhe para onde vão os spans:
+  - none (padrão): não instrumenta nada nem importa o OpenTelemetry;
+  - console: imprime os spans na saída do processo;
+  - file: grava um span por linha, em JSON, em OTEL_TRACES_FILE;
+  - otlp: envia a um coletor (OTEL_EXPORTER_OTLP_ENDPOINT, padrão localhost:4317).
+
+A amostragem segue as variáveis do SDK, OTEL_TRACES_SAMPLER e OTEL_TRACES_SAMPLER_ARG. O padrão
+(parentbased_always_on) segue a decisão de quem chamou: com o frontend amostrando, o backend
+registra exatamente os traces que começaram nas páginas amostradas.
+
+Cada requisição vira um span do FastAPI, filho do span do frontend quando o header traceparent
+vem na requisição, e cada comando SQL vira um span filho dele.
+"""
+import os
+
+OTEL_TRACES_EXPORTER = os.getenv("OTEL_TRACES_EXPORTER", "none").strip().lower()
+OTEL_TRACES_FILE = os.getenv("OTEL_TRACES_FILE", "traces.jsonl")
+OTEL_SERVICE_NAME = os.getenv("OTEL_SERVICE_NAME", "liftoff-backend")
+
+# Rotas de observação, consultadas com frequência e sem interesse para os traces
+EXCLUDED_URLS = "/metrics$,/internal/"
+
+
+def _span_exporter():
+    if OTEL_TRACES_EXPORTER == "console":
+        from opentelemetry.sdk.trace.export import ConsoleSpanExporter
+        return ConsoleSpanExporter()
+    if OTEL_TRACES_EXPORTER == "file":
+        from opentelemetry.sdk.trace.export import ConsoleSpanExporter
+        return ConsoleSpanExporter(
+            out=open(OTEL_TRACES_FILE, "a", encoding="utf-8"),
+            formatter=lambda span: span.to_json(indent=None) + os.linesep,
+        )
+    if OTEL_TRACES_EXPORTER == "otlp":
+        from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
+        return OTLPSpanExporter()
+    raise ValueError(f"OTEL_TRACES_EXPORTER inválido: {OTEL_TRACES_EXPORTER} (use none, console, file ou otlp)")
+
+
+def setup_tracing(app, engines: list):
+    """
+    Instrumenta o app FastAPI e os motores do SQLAlchemy (síncronos ou assíncronos).
+
+    Args:
+        app: Aplicação FastAPI; o middleware do OpenTelemetry fica por fora de todos os outros.
+        engines: Motores cujos comandos SQL viram spans.
+
+    Returns:
+        TracerProvider | None: Provider a ser encerrado (shutdown) no fim do processo, para
+        enviar os spans pendentes, ou None quando o rastreamento está desligado.
+    """
+    if OTEL_TRACES_EXPORTER == "none":
+        return None
+    from opentelemetry import trace
+    from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
+    from opentelemetry.instrumentation.sqlalchemy import SQLAlchemyInstrumentor
+    from opentelemetry.sdk.resources import SERVICE_NAME, Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor
+
+    provider = TracerProvider(resource=Resource.create({SERVICE_NAME: OTEL_SERVICE_NAME}))
+    provider.add_span_processor(BatchSpanProcessor(_span_exporter()))
+    trace.set_tracer_provider(provider)
+
+    FastAPIInstrumentor.instrument_app(app, tracer_provider=provider, excluded_urls=EXCLUDED_URLS)
+    SQLAlchemyInstrumentor().instrument(
+        engines=[getattr(engine, "sync_engine", engine) for engine in engines],
+        tracer_provider=provider,
+    )
+    return provider
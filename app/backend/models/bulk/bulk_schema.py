@@ -0,0 +1,84 @@
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel, Field
+from models.employee.employee_schema import EmployeeFilter
+from models.product.product_schema import ProductFilter
+from models.sales.sales_schema import SalesFilter
+from models.supplier.supplier_schema import SupplierFilter
+
+# Tamanho máximo de bloco aceito no modo chunk_size das rotas de atualização/remoção em lote
+MAX_CHUNK_SIZE = 100_000
+
+
+class BulkRowError(BaseModel):
+    """
+    Erros de validação de uma linha recebida em uma inserção em lote.
+
+    Atributos:
+        index (int): Posição da linha no corpo da requisição (começando em 0).
+        errors (List[Dict[str, Any]]): Erros retornados pela validação do Pydantic.
+    """
+    index: int
+    errors: List[Dict[str, Any]]
+
+
+class BulkInsertResponse(BaseModel):
+    """
+    Resultado de uma inserção em lote.
+
+    Atributos:
+        inserted (int): Quantidade de linhas inseridas.
+        ids (List[int]): Identificadores das linhas inseridas, na mesma ordem do corpo.
+        errors (List[BulkRowError]): Linhas rejeitadas na validação, que não foram inseridas.
+    """
+    inserted: int
+    ids: List[int]
+    errors: List[BulkRowError]
+
+
+class BulkMutationParams(BaseModel):
+    """
+    Parâmetros comuns das rotas de atualização e remoção em lote.
+
+    Atributos:
+        dry_run (bool): Se verdadeiro, apenas conta as linhas afetadas, sem alterar nada.
+        chunk_size (Optional[int]): Processa as linhas em blocos deste tamanho, com um commit
+            por bloco, para não segurar locks por muito tempo.
+    """
+    dry_run: bool = False
+    chunk_size: Optional[int] = Field(None, ge=1, le=MAX_CHUNK_SIZE)
+
+    def has_filters(self) -> bool:
+        """
+        Indica se algum filtro foi informado; as rotas recusam operações sobre a tabela inteira.
+        """
+        return bool(self.model_dump(exclude_none=True, exclude=set(BulkMutationParams.model_fields)))
+
+
+class SalesBulkParams(SalesFilter, BulkMutationParams):
+    pass
+
+
+class ProductBulkParams(ProductFilter, BulkMutationParams):
+    pass
+
+
+class EmployeeBulkParams(EmployeeFilter, BulkMutationParams):
+    pass
+
+
+class SupplierBulkParams(SupplierFilter, BulkMutationParams):
+    pass
+
+
+class BulkMutationResponse(BaseModel):
+    """
+    Resultado de uma atualização ou remoção em lote.
+
+    Atributos:
+        matched (int): Quantidade de linhas atingidas (ou que seriam atingidas, no dry_run).
+        ids (List[int]): Identificadores das linhas alteradas; vazio no dry_run.
+        dry_run (bool): Indica se a operação foi apenas uma contagem.
+    """
+    matched: int
+    ids: List[int]
+    dry_run: bool
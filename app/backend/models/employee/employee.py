@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, Date, Enum as SQLAlchemyEnum, DateTime
+from sqlalchemy import Column, Integer, String, Float, Date, Enum as SQLAlchemyEnum, DateTime, Index, extract
 from sqlalchemy.sql import func
 from database.database import Base
 from .employee_schema import GenderEnum
@@ -29,10 +29,10 @@ class EmployeeModel(Base):
 
     __tablename__ = "employees"
 
-    employee_id = Column(Integer, primary_key=True, autoincrement=True, index=True)
-    manager_id = Column(Integer, index=True)
-    first_name = Column(String, index=True)
-    last_name = Column(String, index=True)
+    employee_id = Column(Integer, primary_key=True, autoincrement=True)
+    manager_id = Column(Integer)
+    first_name = Column(String)
+    last_name = Column(String)
     email = Column(String, unique=True, index=True)
     phone_number = Column(String)
     hire_date = Column(Date, index=True)
@@ -40,9 +40,15 @@ class EmployeeModel(Base):
     job_title = Column(String)
     location = Column(String)
     birth_date = Column(Date)
-    gender = Column(String)
+    # ENUM do Postgres com os rótulos de GenderEnum: 4 bytes por linha em vez do texto repetido
+    gender = Column(SQLAlchemyEnum(*[item.value for item in GenderEnum], name="employee_gender"))
     nationality = Column(String)
     start_date = Column(Date)
     salary = Column(Float)
     termination_date = Column(Date, nullable=True)
-    created_at = Column(DateTime(timezone=True), default=func.now(), index=True)
\ No newline at end of file
+    created_at = Column(DateTime(timezone=True), default=func.now())
+
+    __table_args__ = (
+        # Índice de expressão usado pela consulta de aniversariantes do mês
+        Index("ix_employees_birth_month", extract("month", birth_date)),
+    )
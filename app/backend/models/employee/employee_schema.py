@@ -1,7 +1,7 @@
 from pydantic import BaseModel, EmailStr, PositiveFloat, field_validator, computed_field, validator, ConfigDict
 from enum import Enum
 from datetime import date, datetime, timedelta
-from typing import Optional
+from typing import List, Optional
 
 
 class GenderEnum(Enum):
@@ -49,6 +49,25 @@ class EmployeeBase(BaseModel):
     salary: PositiveFloat
     termination_date: Optional[date] = None
 
+    @field_validator("gender")
+    @classmethod
+    def check_gender(cls, v):
+        """
+        Valida o gênero do funcionário.
+
+        Args:
+            v (str): O valor do gênero a ser validado.
+
+        Returns:
+            str: O valor do gênero validado.
+
+        Raises:
+            ValueError: Se o gênero não for um dos valores de GenderEnum.
+        """
+        if v in [item.value for item in GenderEnum]:
+            return v
+        raise ValueError("Gênero inválido")
+
 
 class EmployeeCreate(EmployeeBase):
     """
@@ -111,3 +130,85 @@ class EmployeeUpdate(BaseModel):
     salary: Optional[PositiveFloat] = None
     termination_date: Optional[date] = None
     birth_date: Optional[date] = None
+
+    @field_validator("gender", mode='before')
+    def check_gender(cls, v):
+        """
+        Valida o gênero do funcionário durante a atualização.
+        """
+        if v is None:
+            return v
+        if v in [item.value for item in GenderEnum]:
+            return v
+        raise ValueError("Gênero inválido")
+
+
+class EmployeeFilter(BaseModel):
+    """
+    Filtros das rotas que operam sobre vários funcionários ao mesmo tempo.
+
+    Atributos:
+        ids (Optional[List[int]]): Identificadores dos funcionários.
+        department_id (Optional[int]): Identificador do departamento.
+        job_title (Optional[str]): Cargo dos funcionários.
+    """
+    ids: Optional[List[int]] = None
+    department_id: Optional[int] = None
+    job_title: Optional[str] = None
+
+
+class EmployeeAnalyticsFilter(BaseModel):
+    """
+    Filtro de data de contratação aplicado às rotas de /employees/analytics.
+
+    Atributos:
+        hire_date_from (Optional[date]): Funcionários contratados a partir desta data (inclusive).
+        hire_date_to (Optional[date]): Funcionários contratados até esta data (inclusive).
+    """
+    hire_date_from: Optional[date] = None
+    hire_date_to: Optional[date] = None
+
+
+class PayrollMonth(BaseModel):
+    """
+    Folha salarial de um mês: soma dos salários dos funcionários ativos no mês.
+    """
+    month: date
+    salary: float
+    headcount: int
+
+
+class HiresMonth(BaseModel):
+    """
+    Quantidade de contratações em um mês.
+    """
+    month: date
+    hires: int
+
+
+class SalaryByTitle(BaseModel):
+    """
+    Média salarial e quantidade de funcionários de um cargo.
+    """
+    job_title: Optional[str] = None
+    avg_salary: float
+    employees: int
+
+
+class GenderShare(BaseModel):
+    """
+    Quantidade e percentual de funcionários de um gênero.
+    """
+    gender: Optional[str] = None
+    employees: int
+    percent: float
+
+
+class Birthday(BaseModel):
+    """
+    Funcionário que faz aniversário no mês consultado.
+    """
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    email: Optional[str] = None
+    birth_date: date
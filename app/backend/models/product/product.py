@@ -1,6 +1,7 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Enum as SQLAlchemyEnum
 from sqlalchemy.sql import func
 from database.database import Base
+from .product_schema import CategoriaBase
 
 
 class ProductModel(Base):
@@ -12,17 +13,20 @@ class ProductModel(Base):
         name (String): Nome do produto.
         description (String): Descrição do produto.
         price (Float): Preço do produto.
-        categoria (String): Categoria do produto.
+        categoria (Enum): Categoria do produto.
         email_fornecedor (String): Email do fornecedor do produto.
         created_at (DateTime): Data e hora de criação do registro do produto.
+        supplier_id (Integer): Fornecedor (suppliers.supplier_id), preenchido pelo banco a partir de email_fornecedor.
     """
 
     __tablename__ = "products"
 
-    id = Column(Integer, primary_key=True, autoincrement=True, index=True)
+    id = Column(Integer, primary_key=True, autoincrement=True)
     name = Column(String, index=True)
-    description = Column(String, index=True)
-    price = Column(Float, index=True)
-    categoria = Column(String, index=True)
+    description = Column(String)
+    price = Column(Float)
+    # ENUM do Postgres com os rótulos de CategoriaBase (ver database/migrations/versions/0006_enum_columns.py)
+    categoria = Column(SQLAlchemyEnum(*[item.value for item in CategoriaBase], name="product_categoria"), index=True)
     email_fornecedor = Column(String, index=True)
-    created_at = Column(DateTime(timezone=True), default=func.now(), index=True)
\ No newline at end of file
+    created_at = Column(DateTime(timezone=True), default=func.now())
+    supplier_id = Column(Integer, ForeignKey("suppliers.supplier_id", ondelete="SET NULL"), index=True)
\ No newline at end of file
@@ -1,7 +1,7 @@
 from pydantic import BaseModel, PositiveFloat, EmailStr, field_validator, Field, ConfigDict
 from enum import Enum
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 
 class CategoriaBase(Enum):
@@ -66,9 +66,11 @@ class ProductResponse(ProductBase):
     Atributos:
         id (int): O identificador único do produto.
         created_at (datetime): O timestamp de quando o produto foi criado.
+        supplier_id (Optional[int]): O identificador do fornecedor, preenchido a partir de email_fornecedor.
     """
     id: int
     created_at: datetime
+    supplier_id: Optional[int] = None
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -108,4 +110,20 @@ class ProductUpdate(BaseModel):
             return v
         if v in [item.value for item in CategoriaBase]:
             return v
-        raise ValueError("Categoria inválida")
\ No newline at end of file
+        raise ValueError("Categoria inválida")
+
+
+class ProductFilter(BaseModel):
+    """
+    Filtros das rotas que operam sobre vários produtos ao mesmo tempo.
+
+    Atributos:
+        ids (Optional[List[int]]): Identificadores dos produtos.
+        categoria (Optional[CategoriaBase]): Categoria dos produtos.
+        email_fornecedor (Optional[str]): Email do fornecedor dos produtos.
+        supplier_id (Optional[int]): Identificador do fornecedor dos produtos.
+    """
+    ids: Optional[List[int]] = None
+    categoria: Optional[CategoriaBase] = None
+    email_fornecedor: Optional[str] = None
+    supplier_id: Optional[int] = None
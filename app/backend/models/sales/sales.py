@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Index
 from sqlalchemy.sql import func
 from database.database import Base
 
@@ -19,18 +19,42 @@ class SalesModel(Base):
         name_product (String): Nome ou identificador do produto vendido.
         date (datetime): Data e hora da venda.
         created_at (DateTime): Data e hora de criação do registro da venda.
+        employee_id (Integer): Vendedor (employees.employee_id), preenchido pelo banco a partir de email_employee.
+        product_id (Integer): Produto (products.id), preenchido pelo banco a partir de name_product.
     """
 
     __tablename__ = "sales"
 
-    id = Column(Integer, primary_key=True, autoincrement=True, index=True)
-    email_employee = Column(String, index=True)
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    email_employee = Column(String)
     email_customer = Column(String, index=True)
-    first_name = Column(String, index=True)
-    last_name = Column(String, index=True)
-    phone_number = Column(String, index=True)
-    price = Column(Float, index=True)
-    quantity = Column(Integer, index=True)
-    name_product = Column(String, index=True)
-    date = Column(DateTime(timezone=True), index=True)
-    created_at = Column(DateTime(timezone=True), default=func.now(), index=True)    
\ No newline at end of file
+    first_name = Column(String)
+    last_name = Column(String)
+    phone_number = Column(String)
+    price = Column(Float)
+    quantity = Column(Integer)
+    name_product = Column(String)
+    date = Column(DateTime(timezone=True), nullable=False)
+    created_at = Column(DateTime(timezone=True), default=func.now())
+    # email_employee e name_product ficam como o valor informado na venda; um trigger mantém os ids
+    # (ver database/migrations/versions/0005_foreign_keys.py). A inserção em lote já os preenche
+    # (crud.sales.crud.fill_sales_references) e não passa pelo trigger (0008_sales_references_insert.py)
+    employee_id = Column(Integer, ForeignKey("employees.employee_id", ondelete="SET NULL"))
+    product_id = Column(Integer, ForeignKey("products.id", ondelete="SET NULL"))
+
+    # Índices escolhidos pelas consultas da API, do dashboard e do dbt (ver database/migrations/versions/0002_index_audit.py)
+    __table_args__ = (
+        # Filtros e agregações por período, agrupadas ou filtradas por produto; ordenação por data
+        Index("ix_sales_date_name_product", date, name_product),
+        # Vendas de um vendedor em um período (filtro email_employee, gold_sales_by_seller)
+        Index("ix_sales_email_employee_date", email_employee, date),
+        # Os mesmos pelas chaves inteiras: joins com employees e products e agrupamentos dos modelos gold
+        Index("ix_sales_employee_id_date", employee_id, date),
+        Index("ix_sales_product_id_date", product_id, date),
+        # created_at cresce junto com a tabela: um BRIN ocupa poucas páginas e quase não pesa na inserção
+        Index("ix_sales_created_at_brin", created_at, postgresql_using="brin"),
+        # Uma partição por mês de date (ver database/migrations/versions/0004_partition_sales.py).
+        # No banco a chave primária é (id, date), como o particionamento exige; o ORM continua
+        # identificando a venda só pelo id, que vem de uma sequência única para todas as partições
+        {"postgresql_partition_by": "RANGE (date)"},
+    )
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Tuple
+from typing import List, Tuple, Union
 from pydantic import BaseModel, EmailStr, PositiveFloat, PositiveInt, field_validator, ConfigDict
 from enum import Enum
 from typing import Optional
@@ -51,6 +51,8 @@ class SalesCreate(SalesBase):
 class SalesResponse(SalesBase):
     id: int
     created_at: datetime
+    employee_id: Optional[int] = None
+    product_id: Optional[int] = None
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -73,4 +75,136 @@ class SalesUpdate(BaseModel):
         if v in [item.value for item in ProdutoEnum]:
             return v
         raise ValueError("Produto inválido")
-   '''
\ No newline at end of file
+   '''
+
+
+class SalesFilter(BaseModel):
+    """
+    Filtros das rotas que operam sobre várias vendas ao mesmo tempo.
+
+    Atributos:
+        ids (Optional[List[int]]): Identificadores das vendas.
+        email_employee (Optional[str]): Email do vendedor.
+        name_product (Optional[str]): Nome do produto vendido.
+        employee_id (Optional[int]): Identificador do vendedor.
+        product_id (Optional[int]): Identificador do produto vendido.
+        date_gte (Optional[datetime]): Vendas a partir desta data (inclusive).
+        date_lt (Optional[datetime]): Vendas anteriores a esta data.
+    """
+    ids: Optional[List[int]] = None
+    email_employee: Optional[str] = None
+    name_product: Optional[str] = None
+    employee_id: Optional[int] = None
+    product_id: Optional[int] = None
+    date_gte: Optional[datetime] = None
+    date_lt: Optional[datetime] = None
+
+
+class SalesOrderBy(str, Enum):
+    """
+    Ordenações aceitas pela listagem de vendas. O prefixo "-" indica ordem decrescente.
+    """
+    id = "id"
+    id_desc = "-id"
+    date = "date"
+    date_desc = "-date"
+    price = "price"
+    price_desc = "-price"
+    quantity = "quantity"
+    quantity_desc = "-quantity"
+    name_product = "name_product"
+    name_product_desc = "-name_product"
+    email_employee = "email_employee"
+    email_employee_desc = "-email_employee"
+    email_customer = "email_customer"
+    email_customer_desc = "-email_customer"
+
+    @property
+    def column(self) -> str:
+        return self.value.lstrip("-")
+
+    @property
+    def descending(self) -> bool:
+        return self.value.startswith("-")
+
+
+class SalesRangeFilter(BaseModel):
+    """
+    Filtros de intervalo das consultas de vendas (listagem e agregações).
+
+    Atributos:
+        date_from (Optional[datetime]): Vendas a partir desta data (inclusive).
+        date_to (Optional[datetime]): Vendas até esta data (inclusive).
+        email_employee (Optional[str]): Email do vendedor.
+        email_customer (Optional[str]): Email do comprador.
+        name_product (Optional[str]): Nome do produto vendido.
+        employee_id (Optional[int]): Identificador do vendedor.
+        product_id (Optional[int]): Identificador do produto vendido.
+        min_price (Optional[float]): Valor mínimo da venda (inclusive).
+        max_price (Optional[float]): Valor máximo da venda (inclusive).
+    """
+    date_from: Optional[datetime] = None
+    date_to: Optional[datetime] = None
+    email_employee: Optional[str] = None
+    email_customer: Optional[str] = None
+    name_product: Optional[str] = None
+    employee_id: Optional[int] = None
+    product_id: Optional[int] = None
+    min_price: Optional[float] = None
+    max_price: Optional[float] = None
+
+
+class SalesListFilter(SalesRangeFilter):
+    """
+    Filtros e ordenação da listagem de vendas (GET /sales/).
+
+    Atributos:
+        order_by (SalesOrderBy): Coluna de ordenação; "-" na frente para ordem decrescente.
+    """
+    order_by: SalesOrderBy = SalesOrderBy.id
+
+
+class SalesGroupBy(str, Enum):
+    """
+    Agrupamentos aceitos por GET /sales/aggregates: faixas de data ou colunas da venda.
+    """
+    day = "day"
+    week = "week"
+    month = "month"
+    name_product = "name_product"
+    email_employee = "email_employee"
+    product_id = "product_id"
+    employee_id = "employee_id"
+
+    @property
+    def is_date_bucket(self) -> bool:
+        return self in (SalesGroupBy.day, SalesGroupBy.week, SalesGroupBy.month)
+
+
+class SalesMetric(str, Enum):
+    """
+    Métricas calculadas por GET /sales/aggregates.
+    """
+    sum_price = "sum_price"
+    sum_quantity = "sum_quantity"
+    count = "count"
+    count_distinct_product = "count_distinct_product"
+    count_distinct_customer = "count_distinct_customer"
+    count_distinct_employee = "count_distinct_employee"
+
+
+class SalesAggregate(BaseModel):
+    """
+    Uma linha do resultado de GET /sales/aggregates.
+
+    Atributos:
+        key: Início da faixa de data ou valor da coluna agrupada; ausente sem group_by.
+        Demais atributos: métricas pedidas, ausentes quando não solicitadas.
+    """
+    key: Optional[Union[datetime, int, str]] = None
+    sum_price: Optional[float] = None
+    sum_quantity: Optional[int] = None
+    count: Optional[int] = None
+    count_distinct_product: Optional[int] = None
+    count_distinct_customer: Optional[int] = None
+    count_distinct_employee: Optional[int] = None
@@ -1,7 +1,8 @@
 
-from sqlalchemy import Column, Integer, String, DateTime, ARRAY
+from sqlalchemy import Column, Integer, String, DateTime, ARRAY, Enum as SQLAlchemyEnum
 from sqlalchemy.sql import func
 from database.database import Base
+from .supplier_schema import ProductCategoriesEnum
 
 class SupplierModel(Base):
     """
@@ -15,20 +16,21 @@ class SupplierModel(Base):
         phone_number (String): Número de telefone.
         website (String): Website da empresa.
         address (String): Endereço completo.
-        product_categories (String): Lista de categorias de produtos ou serviços fornecidos.
+        product_categories (Enum): Lista de categorias de produtos ou serviços fornecidos.
         primary_product (String): Produto ou serviço principal.
         created_at (DateTime): Data e hora de criação do registro do fornecedor.
     """
 
     __tablename__ = "suppliers"
 
-    supplier_id = Column(Integer, primary_key=True, autoincrement=True, index=True)
-    company_name = Column(String, index=True, nullable=False)
+    supplier_id = Column(Integer, primary_key=True, autoincrement=True)
+    company_name = Column(String, nullable=False)
     contact_name = Column(String, nullable=False)
-    email = Column(String, index=True, nullable=False)
+    email = Column(String, unique=True, index=True, nullable=False)
     phone_number = Column(String, nullable=False)
     website = Column(String)
     address = Column(String)
-    product_categories = Column(String, index=True)    
+    # ENUM do Postgres com os rótulos de ProductCategoriesEnum
+    product_categories = Column(SQLAlchemyEnum(*[item.value for item in ProductCategoriesEnum], name="supplier_category"), index=True)
     primary_product = Column(String, nullable=False)
-    created_at = Column(DateTime(timezone=True), default=func.now(), index=True)
+    created_at = Column(DateTime(timezone=True), default=func.now())
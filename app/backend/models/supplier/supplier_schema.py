@@ -64,4 +64,16 @@ class SupplierUpdate(BaseModel):
             return v
         if v in [item.value for item in ProductCategoriesEnum]: 
             return v
-        raise ValueError("Categoria inválida")
\ No newline at end of file
+        raise ValueError("Categoria inválida")
+
+
+class SupplierFilter(BaseModel):
+    """
+    Filtros das rotas que operam sobre vários fornecedores ao mesmo tempo.
+
+    Atributos:
+        ids (Optional[List[int]]): Identificadores dos fornecedores.
+        product_categories (Optional[ProductCategoriesEnum]): Categoria de produtos dos fornecedores.
+    """
+    ids: Optional[List[int]] = None
+    product_categories: Optional[ProductCategoriesEnum] = None
@@ -1,14 +1,51 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from database.database import SessionLocal, get_db
-from models.employee.employee_schema import EmployeeResponse, EmployeeUpdate, EmployeeCreate
-from typing import List
+from models.employee.employee import EmployeeModel
+from models.employee.employee_schema import (
+    Birthday,
+    EmployeeAnalyticsFilter,
+    EmployeeCreate,
+    EmployeeResponse,
+    EmployeeUpdate,
+    GenderShare,
+    HiresMonth,
+    PayrollMonth,
+    SalaryByTitle,
+)
+from models.bulk.bulk_schema import BulkInsertResponse, BulkMutationResponse, EmployeeBulkParams
+from datetime import date
+from typing import Annotated, List, Optional
+from crud.base import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from routes.formats import (
+    LIST_RESPONSES,
+    STREAMING_MEDIA_TYPES,
+    bulk_request_body,
+    field_selection,
+    json_row_response,
+    json_rows_response,
+    negotiate,
+    read_bulk_body,
+    streaming_response,
+    validate_bulk_rows,
+)
 from crud.employee.crud import (
     create_employee,
+    create_employees_bulk,
     get_employees,
+    stream_employees,
     get_employee,
     delete_employee,
     update_employee,
+    count_employees,
+    update_employees_bulk,
+    delete_employees_bulk,
+    get_payroll,
+    get_hires_by_month,
+    get_salary_by_title,
+    get_gender_share,
+    get_birthdays,
 )
 
 router = APIRouter()
@@ -34,33 +71,216 @@ def create_employee_route(employee: EmployeeCreate, db: Session = Depends(get_db
         raise HTTPException(status_code=500, detail=f"Erro ao criar funcionário: {str(e)}")
 
 
-@router.get("/employees/", response_model=List[EmployeeResponse])
-def read_all_employees_route(db: Session = Depends(get_db)):
+@router.post("/employees/bulk", response_model=BulkInsertResponse, openapi_extra=bulk_request_body(EmployeeCreate))
+def create_employees_bulk_route(rows: List[dict] = Depends(read_bulk_body), db: Session = Depends(get_db)):
     """
-    Retorna todos os funcionários.
+    Cria vários funcionários de uma vez.
+
+    O corpo pode ser um array JSON ou NDJSON (Content-Type: application/x-ndjson), com até
+    MAX_BULK_ROWS linhas. Todas as linhas são validadas; as válidas são gravadas em uma
+    única transação e as inválidas são devolvidas em errors, sem impedir as demais.
 
     Parâmetros:
+    - rows (List[dict]): Linhas lidas do corpo da requisição.
     - db (Session): Sessão do banco de dados.
 
     Retorna:
-    - List[EmployeeResponse]: Lista de todos os funcionários.
+    - BulkInsertResponse: Quantidade e ids inseridos, e os erros de validação por linha.
+
+    Lança:
+    - HTTPException: Se o banco rejeitar o lote (ex.: email duplicado), nenhuma linha é gravada.
+    """
+    employees, errors = validate_bulk_rows(rows, EmployeeCreate)
+    try:
+        ids = create_employees_bulk(db, employees)
+    except IntegrityError as e:
+        db.rollback()
+        raise HTTPException(status_code=409, detail=f"Erro ao inserir funcionários: {str(e.orig)}")
+    return BulkInsertResponse(inserted=len(ids), ids=ids, errors=errors)
+
+
+@router.get("/employees/", response_model=List[EmployeeResponse], responses=LIST_RESPONSES)
+def read_all_employees_route(
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    fields: Optional[tuple] = Depends(field_selection(EmployeeResponse)),
+    db: Session = Depends(get_db),
+):
+    """
+    Retorna uma página de funcionários.
+
+    Parâmetros:
+    - limit (int): Quantidade máxima de itens na página.
+    - after (str): Cursor retornado pela página anterior.
+    - fields (str): Campos da resposta separados por vírgula; só essas colunas são lidas do banco.
+    - db (Session): Sessão do banco de dados.
+
+    Retorna:
+    - List[EmployeeResponse]: Página de funcionários. O cursor da próxima página vem no header X-Next-Cursor.
+    - Com o header Accept: application/x-ndjson, application/vnd.apache.arrow.stream ou application/x-parquet,
+      todas as linhas a partir de after são enviadas em streaming nesse formato.
 
     Lança:
     - HTTPException: Se não houver funcionários no banco de dados.
     """
-    employees = get_employees(db)
+    media_type = negotiate(request)
+    if media_type in STREAMING_MEDIA_TYPES:
+        return streaming_response(media_type, stream_employees, EmployeeModel, EmployeeResponse, after=after, fields=fields)
+
+    employees, next_cursor = get_employees(db, limit=limit, after=after, fields=fields)
     if not employees:
         raise HTTPException(status_code=404, detail="Não há dados no banco de dados")
-    return employees
+    return json_rows_response(employees, EmployeeResponse, next_cursor, fields)
+
+
+@router.get("/employees/analytics/payroll", response_model=List[PayrollMonth])
+def read_payroll_route(filters: EmployeeAnalyticsFilter = Depends(), db: Session = Depends(get_db)):
+    """
+    Retorna a folha salarial mensal, da primeira contratação até o mês atual.
+
+    Parâmetros:
+    - filters (EmployeeAnalyticsFilter): Intervalo de data de contratação (hire_date_from, hire_date_to).
+    - db (Session): Sessão do banco de dados.
+
+    Retorna:
+    - List[PayrollMonth]: Para cada mês, a soma dos salários e a quantidade de funcionários ativos.
+    """
+    return get_payroll(db, filters)
+
+
+@router.get("/employees/analytics/hires", response_model=List[HiresMonth])
+def read_hires_route(filters: EmployeeAnalyticsFilter = Depends(), db: Session = Depends(get_db)):
+    """
+    Retorna a quantidade de contratações por mês.
+
+    Parâmetros:
+    - filters (EmployeeAnalyticsFilter): Intervalo de data de contratação (hire_date_from, hire_date_to).
+    - db (Session): Sessão do banco de dados.
+
+    Retorna:
+    - List[HiresMonth]: Contratações de cada mês com ao menos uma contratação.
+    """
+    return get_hires_by_month(db, filters)
+
+
+@router.get("/employees/analytics/salary-by-title", response_model=List[SalaryByTitle])
+def read_salary_by_title_route(filters: EmployeeAnalyticsFilter = Depends(), db: Session = Depends(get_db)):
+    """
+    Retorna a média salarial por cargo.
+
+    Parâmetros:
+    - filters (EmployeeAnalyticsFilter): Intervalo de data de contratação (hire_date_from, hire_date_to).
+    - db (Session): Sessão do banco de dados.
+
+    Retorna:
+    - List[SalaryByTitle]: Média salarial e quantidade de funcionários de cada cargo.
+    """
+    return get_salary_by_title(db, filters)
+
+
+@router.get("/employees/analytics/gender", response_model=List[GenderShare])
+def read_gender_route(filters: EmployeeAnalyticsFilter = Depends(), db: Session = Depends(get_db)):
+    """
+    Retorna a distribuição de funcionários por gênero.
+
+    Parâmetros:
+    - filters (EmployeeAnalyticsFilter): Intervalo de data de contratação (hire_date_from, hire_date_to).
+    - db (Session): Sessão do banco de dados.
+
+    Retorna:
+    - List[GenderShare]: Quantidade e percentual de funcionários de cada gênero.
+    """
+    return get_gender_share(db, filters)
+
+
+@router.get("/employees/analytics/birthdays", response_model=List[Birthday])
+def read_birthdays_route(
+    month: Optional[int] = Query(None, ge=1, le=12),
+    filters: EmployeeAnalyticsFilter = Depends(),
+    db: Session = Depends(get_db),
+):
+    """
+    Retorna os aniversariantes de um mês.
+
+    Parâmetros:
+    - month (int): Mês de 1 a 12; o mês atual se não for informado.
+    - filters (EmployeeAnalyticsFilter): Intervalo de data de contratação (hire_date_from, hire_date_to).
+    - db (Session): Sessão do banco de dados.
+
+    Retorna:
+    - List[Birthday]: Funcionários que fazem aniversário no mês, ordenados pelo dia.
+    """
+    return get_birthdays(db, month or date.today().month, filters)
+
+
+@router.patch("/employees/", response_model=BulkMutationResponse)
+def update_employees_bulk_route(
+    params: Annotated[EmployeeBulkParams, Query()], employee: EmployeeUpdate, db: Session = Depends(get_db)
+):
+    """
+    Atualiza todos os funcionários filtrados com um único UPDATE ... WHERE ... RETURNING id.
+
+    Parâmetros:
+    - params (EmployeeBulkParams): Filtros, dry_run e chunk_size.
+    - employee (EmployeeUpdate): Campos a serem alterados.
+    - db (Session): Sessão do banco de dados.
+
+    Retorna:
+    - BulkMutationResponse: Quantidade e ids alterados, ou apenas a contagem no dry_run.
+
+    Lança:
+    - HTTPException: Se nenhum filtro ou nenhum campo for informado, ou se o banco rejeitar a alteração.
+    """
+    if not params.has_filters():
+        raise HTTPException(status_code=400, detail="Informe ao menos um filtro")
+    if not employee.model_fields_set:
+        raise HTTPException(status_code=400, detail="Informe ao menos um campo para atualizar")
+    if params.dry_run:
+        return BulkMutationResponse(matched=count_employees(db, params), ids=[], dry_run=True)
+    try:
+        ids = update_employees_bulk(db, params, employee, chunk_size=params.chunk_size)
+    except IntegrityError as e:
+        db.rollback()
+        raise HTTPException(status_code=409, detail=f"Erro ao atualizar funcionários: {str(e.orig)}")
+    return BulkMutationResponse(matched=len(ids), ids=ids, dry_run=False)
+
+
+@router.delete("/employees/", response_model=BulkMutationResponse)
+def delete_employees_bulk_route(params: Annotated[EmployeeBulkParams, Query()], db: Session = Depends(get_db)):
+    """
+    Remove todos os funcionários filtrados com um único DELETE ... WHERE ... RETURNING id.
+
+    Parâmetros:
+    - params (EmployeeBulkParams): Filtros, dry_run e chunk_size.
+    - db (Session): Sessão do banco de dados.
+
+    Retorna:
+    - BulkMutationResponse: Quantidade e ids removidos, ou apenas a contagem no dry_run.
+
+    Lança:
+    - HTTPException: Se nenhum filtro for informado.
+    """
+    if not params.has_filters():
+        raise HTTPException(status_code=400, detail="Informe ao menos um filtro")
+    if params.dry_run:
+        return BulkMutationResponse(matched=count_employees(db, params), ids=[], dry_run=True)
+    ids = delete_employees_bulk(db, params, chunk_size=params.chunk_size)
+    return BulkMutationResponse(matched=len(ids), ids=ids, dry_run=False)
 
 
 @router.get("/employees/{employee_id}", response_model=EmployeeResponse)
-def read_employee_route(employee_id: int, db: Session = Depends(get_db)):
+def read_employee_route(
+    employee_id: int,
+    fields: Optional[tuple] = Depends(field_selection(EmployeeResponse)),
+    db: Session = Depends(get_db),
+):
     """
     Retorna um funcionário específico.
 
     Parâmetros:
     - employee_id (int): ID do funcionário a ser retornado.
+    - fields (str): Campos da resposta separados por vírgula; só essas colunas são lidas do banco.
     - db (Session): Sessão do banco de dados.
 
     Retorna:
@@ -69,10 +289,10 @@ def read_employee_route(employee_id: int, db: Session = Depends(get_db)):
     Lança:
     - HTTPException: Se o funcionário não for encontrado.
     """
-    db_employee = get_employee(db, employee_id=employee_id)
+    db_employee = get_employee(db, employee_id=employee_id, fields=fields)
     if db_employee is None:
         raise HTTPException(status_code=404, detail="Funcionário não encontrado")
-    return db_employee
+    return db_employee if fields is None else json_row_response(db_employee, EmployeeResponse, fields)
 
 
 @router.delete("/employees/{employee_id}", response_model=EmployeeResponse)
@@ -97,12 +317,15 @@ def delete_employee_route(employee_id: int, db: Session = Depends(get_db)):
 
 
 @router.put("/employees/{employee_id}", response_model=EmployeeResponse)
+@router.patch("/employees/{employee_id}", response_model=EmployeeResponse)
 def update_employee_route(
     employee_id: int, employee: EmployeeUpdate, db: Session = Depends(get_db)
 ):
     """
     Atualiza um funcionário específico.
 
+    Apenas os campos enviados são alterados, com um único UPDATE ... RETURNING.
+
     Parâmetros:
     - employee_id (int): ID do funcionário a ser atualizado.
     - employee (EmployeeUpdate): Dados atualizados do funcionário.
@@ -112,9 +335,13 @@ def update_employee_route(
     - EmployeeResponse: Dados do funcionário atualizado.
 
     Lança:
-    - HTTPException: Se o funcionário não for encontrado.
+    - HTTPException: Se o funcionário não for encontrado, ou se o banco rejeitar a alteração (ex.: email duplicado).
     """
-    db_employee = update_employee(db, employee_id=employee_id, employee=employee)
+    try:
+        db_employee = update_employee(db, employee_id=employee_id, employee=employee)
+    except IntegrityError as e:
+        db.rollback()
+        raise HTTPException(status_code=409, detail=f"Erro ao atualizar funcionário: {str(e.orig)}")
     if db_employee is None:
         raise HTTPException(status_code=404, detail="Funcionário não encontrado")
     return db_employee
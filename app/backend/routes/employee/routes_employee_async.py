@@ -0,0 +1,159 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from database.database import get_async_db
+from models.employee.employee import EmployeeModel
+from models.employee.employee_schema import EmployeeResponse, EmployeeUpdate, EmployeeCreate
+from typing import List, Optional
+from crud.base import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from crud.employee.crud import stream_employees
+from routes.formats import (
+    LIST_RESPONSES,
+    STREAMING_MEDIA_TYPES,
+    field_selection,
+    json_row_response,
+    json_rows_response,
+    negotiate,
+    streaming_response,
+)
+from crud.employee.crud_async import (
+    create_employee,
+    get_employees,
+    get_employee,
+    delete_employee,
+    update_employee,
+)
+
+# Versões assíncronas das rotas de funcionários, registradas antes das síncronas quando DB_ASYNC está ativo.
+# As rotas em lote continuam no router síncrono.
+router = APIRouter()
+
+@router.post("/employees/", response_model=EmployeeResponse)
+async def create_employee_route(employee: EmployeeCreate, db: AsyncSession = Depends(get_async_db)):
+    """
+    Cria um novo funcionário.
+
+    Parâmetros:
+    - employee (EmployeeCreate): Dados do funcionário a ser criado.
+    - db (AsyncSession): Sessão assíncrona do banco de dados.
+
+    Retorna:
+    - EmployeeResponse: Dados do funcionário criado.
+
+    Lança:
+    - HTTPException: Se houver um problema ao criar o funcionário.
+    """
+    try:
+        return await create_employee(db=db, employee=employee)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Erro ao criar funcionário: {str(e)}")
+
+
+@router.get("/employees/", response_model=List[EmployeeResponse], responses=LIST_RESPONSES)
+async def read_all_employees_route(
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    fields: Optional[tuple] = Depends(field_selection(EmployeeResponse)),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Retorna uma página de funcionários.
+
+    Parâmetros:
+    - limit (int): Quantidade máxima de itens na página.
+    - after (str): Cursor retornado pela página anterior.
+    - fields (str): Campos da resposta separados por vírgula; só essas colunas são lidas do banco.
+    - db (AsyncSession): Sessão assíncrona do banco de dados.
+
+    Retorna:
+    - List[EmployeeResponse]: Página de funcionários. O cursor da próxima página vem no header X-Next-Cursor.
+    - Nos formatos em streaming a exportação usa o cursor do servidor do motor síncrono.
+
+    Lança:
+    - HTTPException: Se não houver funcionários no banco de dados.
+    """
+    media_type = negotiate(request)
+    if media_type in STREAMING_MEDIA_TYPES:
+        return streaming_response(media_type, stream_employees, EmployeeModel, EmployeeResponse, after=after, fields=fields)
+
+    employees, next_cursor = await get_employees(db, limit=limit, after=after, fields=fields)
+    if not employees:
+        raise HTTPException(status_code=404, detail="Não há dados no banco de dados")
+    return json_rows_response(employees, EmployeeResponse, next_cursor, fields)
+
+
+@router.get("/employees/{employee_id:int}", response_model=EmployeeResponse)
+async def read_employee_route(
+    employee_id: int,
+    fields: Optional[tuple] = Depends(field_selection(EmployeeResponse)),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Retorna um funcionário específico.
+
+    Parâmetros:
+    - employee_id (int): ID do funcionário a ser retornado.
+    - fields (str): Campos da resposta separados por vírgula; só essas colunas são lidas do banco.
+    - db (AsyncSession): Sessão assíncrona do banco de dados.
+
+    Retorna:
+    - EmployeeResponse: Dados do funcionário solicitado.
+
+    Lança:
+    - HTTPException: Se o funcionário não for encontrado.
+    """
+    db_employee = await get_employee(db, employee_id=employee_id, fields=fields)
+    if db_employee is None:
+        raise HTTPException(status_code=404, detail="Funcionário não encontrado")
+    return db_employee if fields is None else json_row_response(db_employee, EmployeeResponse, fields)
+
+
+@router.delete("/employees/{employee_id:int}", response_model=EmployeeResponse)
+async def delete_employee_route(employee_id: int, db: AsyncSession = Depends(get_async_db)):
+    """
+    Deleta um funcionário específico.
+
+    Parâmetros:
+    - employee_id (int): ID do funcionário a ser deletado.
+    - db (AsyncSession): Sessão assíncrona do banco de dados.
+
+    Retorna:
+    - EmployeeResponse: Dados do funcionário deletado.
+
+    Lança:
+    - HTTPException: Se o funcionário não for encontrado.
+    """
+    db_employee = await delete_employee(db, employee_id=employee_id)
+    if db_employee is None:
+        raise HTTPException(status_code=404, detail="Funcionário não encontrado")
+    return db_employee
+
+
+@router.put("/employees/{employee_id:int}", response_model=EmployeeResponse)
+@router.patch("/employees/{employee_id:int}", response_model=EmployeeResponse)
+async def update_employee_route(
+    employee_id: int, employee: EmployeeUpdate, db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Atualiza um funcionário específico com um único UPDATE ... RETURNING.
+
+    Parâmetros:
+    - employee_id (int): ID do funcionário a ser atualizado.
+    - employee (EmployeeUpdate): Dados atualizados do funcionário.
+    - db (AsyncSession): Sessão assíncrona do banco de dados.
+
+    Retorna:
+    - EmployeeResponse: Dados do funcionário atualizado.
+
+    Lança:
+    - HTTPException: Se o funcionário não for encontrado, ou se o banco rejeitar a alteração (ex.: email duplicado).
+    """
+    try:
+        db_employee = await update_employee(db, employee_id=employee_id, employee=employee)
+    except IntegrityError as e:
+        await db.rollback()
+        raise HTTPException(status_code=409, detail=f"Erro ao atualizar funcionário: {str(e.orig)}")
+    if db_employee is None:
+        raise HTTPException(status_code=404, detail="Funcionário não encontrado")
+    return db_employee
@@ -0,0 +1,383 @@
+import io
+import json
+from functools import lru_cache
+from operator import attrgetter
+import orjson
+import pyarrow as pa
+import pyarrow.parquet as pq
+from typing import Optional
+from fastapi import HTTPException, Query, Request
+from pydantic import ValidationError
+from fastapi.responses import Response, StreamingResponse
+from sqlalchemy import Boolean, Date, DateTime, Enum, Float, Integer
+from database.database import routed_session
+
+JSON_MEDIA_TYPE = "application/json"
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+PARQUET_MEDIA_TYPE = "application/x-parquet"
+
+# Formatos aceitos pelas rotas de listagem, além do JSON padrão
+SUPPORTED_MEDIA_TYPES = [JSON_MEDIA_TYPE, NDJSON_MEDIA_TYPE, ARROW_MEDIA_TYPE, PARQUET_MEDIA_TYPE]
+
+# Formatos que enviam a tabela inteira em streaming em vez de uma página
+STREAMING_MEDIA_TYPES = [NDJSON_MEDIA_TYPE, ARROW_MEDIA_TYPE, PARQUET_MEDIA_TYPE]
+
+# Quantidade mínima de linhas por row group nos arquivos Parquet
+PARQUET_ROW_GROUP_SIZE = 64 * 1024
+
+# Datas com fuso UTC saem com sufixo Z, como no JSON gerado pelo Pydantic
+ORJSON_OPTIONS = orjson.OPT_UTC_Z
+
+# Quantidade máxima de linhas aceitas por requisição nas rotas de inserção em lote
+MAX_BULK_ROWS = 50_000
+
+# Documentação dos formatos alternativos no OpenAPI das rotas de listagem
+LIST_RESPONSES = {
+    200: {
+        "content": {
+            NDJSON_MEDIA_TYPE: {"schema": {"type": "string", "description": "Um objeto JSON por linha"}},
+            ARROW_MEDIA_TYPE: {"schema": {"type": "string", "format": "binary", "description": "Arrow IPC stream"}},
+            PARQUET_MEDIA_TYPE: {"schema": {"type": "string", "format": "binary", "description": "Arquivo Parquet"}},
+        }
+    }
+}
+
+
+def negotiate(request: Request) -> str:
+    """
+    Escolhe o formato da resposta a partir do header Accept.
+
+    Considera o parâmetro q de cada item; se nenhum formato suportado for pedido,
+    retorna JSON.
+    """
+    candidates = []
+    for position, item in enumerate(request.headers.get("accept", "").split(",")):
+        media_type, *params = [part.strip() for part in item.split(";")]
+        quality = 1.0
+        for param in params:
+            if param.startswith("q="):
+                try:
+                    quality = float(param[2:])
+                except ValueError:
+                    quality = 0.0
+        if media_type in SUPPORTED_MEDIA_TYPES and quality > 0:
+            candidates.append((-quality, position, media_type))
+    if not candidates:
+        return JSON_MEDIA_TYPE
+    return min(candidates)[2]
+
+
+def _stream_with_session(stream, **kwargs):
+    """
+    Gera os blocos de linhas de uma função de streaming do CRUD.
+
+    A resposta é enviada depois que a rota retorna, então o gerador abre e fecha
+    a sua própria sessão em vez de usar a sessão da dependência get_db (no mesmo banco que ela).
+    """
+    db = routed_session()
+    try:
+        yield from stream(db, **kwargs)
+    finally:
+        db.close()
+
+
+def schema_fields(schema) -> tuple:
+    """
+    Campos de um schema de resposta, na ordem do schema, incluindo os computed_field.
+    """
+    return tuple(schema.model_fields) + tuple(schema.model_computed_fields)
+
+
+def parse_fields(fields: Optional[str], schema) -> Optional[tuple]:
+    """
+    Converte o parâmetro fields (nomes separados por vírgula) na tupla de campos pedidos,
+    na ordem do schema. Retorna None quando fields não foi informado.
+
+    Raises:
+        HTTPException: 400 se algum campo não existir no schema de resposta.
+    """
+    if fields is None:
+        return None
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    available = schema_fields(schema)
+    invalid = sorted(requested.difference(available))
+    if invalid or not requested:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Campos inválidos: {', '.join(invalid) or fields!r}. Disponíveis: {', '.join(available)}",
+        )
+    return tuple(name for name in available if name in requested)
+
+
+def field_selection(schema):
+    """
+    Cria a dependência do parâmetro fields de uma rota que responde com o schema informado.
+    """
+    def dependency(
+        fields: Optional[str] = Query(
+            None,
+            description="Campos da resposta separados por vírgula (ex.: id,email). "
+            "Somente as colunas pedidas são lidas do banco.",
+        ),
+    ) -> Optional[tuple]:
+        return parse_fields(fields, schema)
+
+    return dependency
+
+
+@lru_cache(maxsize=None)
+def row_serializer(schema, fields: tuple = None):
+    """
+    Monta, uma vez por schema (e seleção de campos), a função que converte um objeto do ORM
+    no dicionário com os campos do schema de resposta, sem validação do Pydantic.
+
+    As linhas vêm do banco e já foram validadas na escrita, então a validação por linha
+    (EmailStr, PositiveFloat, ...) só custaria CPU. Os computed_field do schema são
+    calculados chamando a própria propriedade sobre o objeto do ORM.
+    """
+    names = tuple(name for name in schema.model_fields if fields is None or name in fields)
+    computed = tuple(
+        (name, info.wrapped_property.fget)
+        for name, info in schema.model_computed_fields.items()
+        if fields is None or name in fields
+    )
+    if len(names) == 1:
+        getter = attrgetter(names[0])
+        values = lambda row: (getter(row),)
+    else:
+        values = attrgetter(*names) if names else lambda row: ()
+
+    def serialize(row) -> dict:
+        data = dict(zip(names, values(row)))
+        for name, compute in computed:
+            data[name] = compute(row)
+        return data
+
+    return serialize
+
+
+def json_rows_response(rows, schema, next_cursor: str = None, fields: tuple = None) -> Response:
+    """
+    Resposta JSON de uma página de listagem serializada direto com orjson.
+
+    Ao retornar um Response a rota não passa pelo response_model, que continua
+    descrevendo a resposta no OpenAPI.
+
+    Args:
+        rows: Objetos do ORM da página.
+        schema: Modelo Pydantic de resposta da rota, usado para escolher os campos.
+        next_cursor (str): Cursor da próxima página, enviado no header X-Next-Cursor.
+        fields (tuple): Campos pedidos no parâmetro fields; None envia todos.
+    """
+    serialize = row_serializer(schema, fields)
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+    content = orjson.dumps([serialize(row) for row in rows], option=ORJSON_OPTIONS)
+    return Response(content=content, media_type=JSON_MEDIA_TYPE, headers=headers)
+
+
+def json_row_response(row, schema, fields: tuple = None) -> Response:
+    """
+    Resposta JSON de um único objeto do ORM com os campos pedidos, usada pelas rotas de detalhe.
+    """
+    content = orjson.dumps(row_serializer(schema, fields)(row), option=ORJSON_OPTIONS)
+    return Response(content=content, media_type=JSON_MEDIA_TYPE)
+
+
+def ndjson_response(stream, schema, fields: tuple = None, **kwargs) -> StreamingResponse:
+    """
+    Resposta em NDJSON: cada linha vinda do cursor do servidor é serializada com os campos
+    do schema e enviada assim que o seu bloco chega do banco.
+
+    Args:
+        stream: Função do CRUD que recebe a sessão e gera blocos de objetos (ex.: stream_sales).
+        schema: Modelo Pydantic de resposta usado para escolher os campos de cada linha.
+        fields (tuple): Campos pedidos no parâmetro fields; None envia todos.
+        kwargs: Parâmetros repassados para a função de streaming.
+    """
+    serialize = row_serializer(schema, fields)
+    options = ORJSON_OPTIONS | orjson.OPT_APPEND_NEWLINE
+
+    def generate():
+        for rows in _stream_with_session(stream, fields=fields, **kwargs):
+            yield b"".join(orjson.dumps(serialize(row), option=options) for row in rows)
+
+    return StreamingResponse(generate(), media_type=NDJSON_MEDIA_TYPE)
+
+
+@lru_cache(maxsize=None)
+def arrow_schema(model, fields: tuple = None) -> pa.Schema:
+    """
+    Monta o schema Arrow a partir das colunas do modelo SQLAlchemy (somente as de fields,
+    quando informado).
+
+    Datas e timestamps viram tipos nativos do Arrow, então o cliente não precisa
+    converter strings de data depois de ler os dados. Colunas ENUM viram dicionários: cada
+    rótulo vai uma vez por bloco e as linhas levam só o índice.
+    """
+    columns = [column for column in model.__table__.columns if fields is None or column.key in fields]
+    fields = []
+    for column in columns:
+        if isinstance(column.type, Boolean):
+            arrow_type = pa.bool_()
+        elif isinstance(column.type, Integer):
+            arrow_type = pa.int64()
+        elif isinstance(column.type, Float):
+            arrow_type = pa.float64()
+        elif isinstance(column.type, DateTime):
+            arrow_type = pa.timestamp("us", tz="UTC" if column.type.timezone else None)
+        elif isinstance(column.type, Date):
+            arrow_type = pa.date32()
+        elif isinstance(column.type, Enum):
+            arrow_type = pa.dictionary(pa.int8(), pa.string())
+        else:
+            arrow_type = pa.string()
+        fields.append(pa.field(column.key, arrow_type, nullable=column.nullable))
+    return pa.schema(fields)
+
+
+def _record_batch(rows, schema: pa.Schema) -> pa.RecordBatch:
+    """
+    Converte um bloco de objetos do ORM em um RecordBatch colunar.
+    """
+    return pa.RecordBatch.from_arrays(
+        [pa.array([getattr(row, field.name) for row in rows], type=field.type) for field in schema],
+        schema=schema,
+    )
+
+
+def _drain(buffer: io.BytesIO) -> bytes:
+    """
+    Retorna o que foi escrito no buffer e o esvazia para o próximo bloco.
+    """
+    data = buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+    return data
+
+
+def arrow_response(stream, model, fields: tuple = None, **kwargs) -> StreamingResponse:
+    """
+    Resposta em Arrow IPC stream: um RecordBatch tipado por bloco vindo do cursor do servidor.
+
+    Args:
+        stream: Função do CRUD que recebe a sessão e gera blocos de objetos (ex.: stream_sales).
+        model: Modelo SQLAlchemy usado para montar o schema Arrow.
+        fields (tuple): Colunas pedidas no parâmetro fields; None envia todas.
+        kwargs: Parâmetros repassados para a função de streaming.
+    """
+    schema = arrow_schema(model, fields)
+
+    def generate():
+        buffer = io.BytesIO()
+        with pa.ipc.new_stream(buffer, schema) as writer:
+            yield _drain(buffer)
+            for rows in _stream_with_session(stream, fields=fields, **kwargs):
+                writer.write_batch(_record_batch(rows, schema))
+                yield _drain(buffer)
+        yield _drain(buffer)
+
+    return StreamingResponse(generate(), media_type=ARROW_MEDIA_TYPE)
+
+
+def parquet_response(stream, model, filename: str, fields: tuple = None, **kwargs) -> StreamingResponse:
+    """
+    Resposta em Parquet. Os blocos são agrupados em row groups de PARQUET_ROW_GROUP_SIZE
+    linhas e cada row group é enviado assim que é escrito; o rodapé vai no final.
+
+    Args:
+        stream: Função do CRUD que recebe a sessão e gera blocos de objetos (ex.: stream_sales).
+        model: Modelo SQLAlchemy usado para montar o schema Arrow.
+        filename: Nome sugerido para o arquivo baixado.
+        fields (tuple): Colunas pedidas no parâmetro fields; None envia todas.
+        kwargs: Parâmetros repassados para a função de streaming.
+    """
+    schema = arrow_schema(model, fields)
+
+    def generate():
+        buffer = io.BytesIO()
+        with pq.ParquetWriter(buffer, schema) as writer:
+            pending, pending_rows = [], 0
+            for rows in _stream_with_session(stream, fields=fields, **kwargs):
+                pending.append(_record_batch(rows, schema))
+                pending_rows += len(rows)
+                if pending_rows >= PARQUET_ROW_GROUP_SIZE:
+                    writer.write_table(pa.Table.from_batches(pending, schema=schema))
+                    pending, pending_rows = [], 0
+                    yield _drain(buffer)
+            if pending:
+                writer.write_table(pa.Table.from_batches(pending, schema=schema))
+        yield _drain(buffer)
+
+    headers = {"Content-Disposition": f'attachment; filename="{filename}.parquet"'}
+    return StreamingResponse(generate(), media_type=PARQUET_MEDIA_TYPE, headers=headers)
+
+
+def streaming_response(media_type: str, stream, model, schema, fields: tuple = None, **kwargs) -> StreamingResponse:
+    """
+    Escolhe a resposta em streaming correspondente ao formato negociado.
+
+    fields também é repassado para a função de streaming, que lê do banco só essas colunas.
+    """
+    if media_type == ARROW_MEDIA_TYPE:
+        return arrow_response(stream, model, fields, **kwargs)
+    if media_type == PARQUET_MEDIA_TYPE:
+        return parquet_response(stream, model, model.__tablename__, fields, **kwargs)
+    return ndjson_response(stream, schema, fields, **kwargs)
+
+
+def bulk_request_body(schema) -> dict:
+    """
+    Documentação no OpenAPI do corpo das rotas de inserção em lote, que é lido
+    diretamente da requisição por read_bulk_body.
+    """
+    item = {"$ref": f"#/components/schemas/{schema.__name__}"}
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {
+                JSON_MEDIA_TYPE: {"schema": {"type": "array", "items": item, "maxItems": MAX_BULK_ROWS}},
+                NDJSON_MEDIA_TYPE: {"schema": {"type": "string", "description": "Um objeto JSON por linha"}},
+            },
+        }
+    }
+
+
+async def read_bulk_body(request: Request) -> list:
+    """
+    Dependência que lê o corpo de uma inserção em lote como lista de dicionários.
+
+    Aceita um array JSON ou, com Content-Type: application/x-ndjson, um objeto JSON por linha.
+
+    Raises:
+        HTTPException: 400 se o corpo não puder ser decodificado, 413 se passar de MAX_BULK_ROWS linhas.
+    """
+    body = await request.body()
+    try:
+        if request.headers.get("content-type", "").startswith(NDJSON_MEDIA_TYPE):
+            rows = [json.loads(line) for line in body.splitlines() if line.strip()]
+        else:
+            rows = json.loads(body)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Corpo da requisição inválido: {str(e)}")
+    if not isinstance(rows, list):
+        raise HTTPException(status_code=400, detail="O corpo deve ser uma lista de objetos")
+    if len(rows) > MAX_BULK_ROWS:
+        raise HTTPException(status_code=413, detail=f"Máximo de {MAX_BULK_ROWS} linhas por requisição")
+    return rows
+
+
+def validate_bulk_rows(rows: list, schema):
+    """
+    Valida cada linha com o schema em uma única passada, sem interromper nas linhas inválidas.
+
+    Returns:
+        tuple: (schemas válidos, lista de erros no formato de BulkRowError)
+    """
+    valid, errors = [], []
+    for index, row in enumerate(rows):
+        try:
+            valid.append(schema.model_validate(row))
+        except ValidationError as e:
+            errors.append({"index": index, "errors": json.loads(e.json(include_url=False))})
+    return valid, errors
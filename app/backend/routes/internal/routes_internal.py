@@ -0,0 +1,70 @@
+import os
+from fastapi import APIRouter, Response
+from database.database import async_engine, engine, replica_set
+from database.pool import pool_status
+from middleware.cache import response_cache
+from middleware.etag import version_cache
+from middleware.metrics import METRICS_MEDIA_TYPE, render_metrics
+from middleware.singleflight import single_flight
+
+router = APIRouter()
+
+@router.get("/internal/pool")
+def read_pool_route():
+    """
+    Retorna o estado dos pools de conexão deste processo.
+
+    Cada worker do uvicorn tem os seus próprios pools, então o total de conexões no Postgres
+    é a soma de (size + max_overflow) de todos os workers e deve ficar abaixo de max_connections.
+
+    Retorna:
+    - dict: pid do worker e, para cada motor (sync e async), conexões em uso (checked_out),
+      livres (checked_in), overflow, quantidade de checkouts, tempo de espera e timeouts.
+    - replicas: para cada réplica de leitura, se está no rodízio, o atraso medido na última
+      verificação e os pools dela.
+    """
+    pools = {"sync": pool_status(engine)}
+    if async_engine is not None:
+        pools["async"] = pool_status(async_engine)
+    replicas = {}
+    for replica in replica_set.replicas:
+        replica_pools = {"sync": pool_status(replica.engine)}
+        if replica.async_engine is not None:
+            replica_pools["async"] = pool_status(replica.async_engine)
+        replicas[replica.name] = {**replica.status(), "pools": replica_pools}
+    return {"pid": os.getpid(), "pools": pools, "replicas": replicas}
+
+
+@router.get("/internal/cache")
+def read_cache_route():
+    """
+    Retorna os contadores do cache de respostas deste processo.
+
+    Retorna:
+    - dict: pid do worker, entradas guardadas, hits, misses, taxa de acerto, remoções por LRU
+      e invalidações (escritas pela API ou avisos de NOTIFY do Postgres), para as respostas (cache)
+      e para as versões das tabelas usadas nos ETags (versions).
+    - single_flight: GETs idênticos em andamento, executados, servidos pela execução de outra
+      requisição (coalesced) e que tiveram de executar por conta própria (fallbacks).
+    """
+    return {
+        "pid": os.getpid(),
+        "cache": response_cache.stats(),
+        "versions": version_cache.stats(),
+        "single_flight": single_flight.stats(),
+    }
+
+
+@router.get("/metrics", response_class=Response)
+def read_metrics_route():
+    """
+    Retorna as métricas das requisições deste processo no formato texto do Prometheus.
+
+    Retorna:
+    - http_request_duration_seconds: histograma do tempo de resposta por método, rota e status.
+    - http_request_db_seconds e http_db_queries_total: tempo e quantidade de consultas no banco
+      por requisição; o restante do tempo é ORM, validação e serialização.
+    - http_response_size_bytes: histograma do tamanho das respostas.
+    - http_requests_in_flight: requisições em andamento.
+    """
+    return Response(render_metrics(), media_type=METRICS_MEDIA_TYPE)
@@ -1,14 +1,35 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from database.database import SessionLocal, get_db
+from models.product.product import ProductModel
 from models.product.product_schema import ProductResponse, ProductUpdate, ProductCreate
-from typing import List
+from models.bulk.bulk_schema import BulkInsertResponse, BulkMutationResponse, ProductBulkParams
+from typing import Annotated, List, Optional
+from crud.base import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from routes.formats import (
+    LIST_RESPONSES,
+    STREAMING_MEDIA_TYPES,
+    bulk_request_body,
+    field_selection,
+    json_row_response,
+    json_rows_response,
+    negotiate,
+    read_bulk_body,
+    streaming_response,
+    validate_bulk_rows,
+)
 from crud.product.crud import (
     create_product,
+    create_products_bulk,
     get_products,
+    stream_products,
     get_product,
     delete_product,
     update_product,
+    count_products,
+    update_products_bulk,
+    delete_products_bulk,
 )
 
 router = APIRouter()
@@ -28,28 +49,131 @@ def create_product_route(product: ProductCreate, db: Session = Depends(get_db)):
     return create_product(db=db, product=product)
 
 
-@router.get("/products/", response_model=List[ProductResponse])
-def read_all_products_route(db: Session = Depends(get_db)):
+@router.post("/products/bulk", response_model=BulkInsertResponse, openapi_extra=bulk_request_body(ProductCreate))
+def create_products_bulk_route(rows: List[dict] = Depends(read_bulk_body), db: Session = Depends(get_db)):
+    """
+    Cria vários produtos de uma vez.
+
+    O corpo pode ser um array JSON ou NDJSON (Content-Type: application/x-ndjson), com até
+    MAX_BULK_ROWS linhas. Todas as linhas são validadas; as válidas são gravadas em uma
+    única transação e as inválidas são devolvidas em errors, sem impedir as demais.
+
+    Parâmetros:
+    - rows (List[dict]): Linhas lidas do corpo da requisição.
+    - db (Session): Sessão do banco de dados.
+
+    Retorna:
+    - BulkInsertResponse: Quantidade e ids inseridos, e os erros de validação por linha.
+
+    Lança:
+    - HTTPException: Se o banco rejeitar o lote (ex.: email duplicado), nenhuma linha é gravada.
+    """
+    products, errors = validate_bulk_rows(rows, ProductCreate)
+    try:
+        ids = create_products_bulk(db, products)
+    except IntegrityError as e:
+        db.rollback()
+        raise HTTPException(status_code=409, detail=f"Erro ao inserir produtos: {str(e.orig)}")
+    return BulkInsertResponse(inserted=len(ids), ids=ids, errors=errors)
+
+
+@router.get("/products/", response_model=List[ProductResponse], responses=LIST_RESPONSES)
+def read_all_products_route(
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    fields: Optional[tuple] = Depends(field_selection(ProductResponse)),
+    db: Session = Depends(get_db),
+):
+    """
+    Retorna uma página de produtos.
+
+    Parâmetros:
+    - limit (int): Quantidade máxima de itens na página.
+    - after (str): Cursor retornado pela página anterior.
+    - fields (str): Campos da resposta separados por vírgula; só essas colunas são lidas do banco.
+    - db (Session): Sessão do banco de dados.
+
+    Retorna:
+    - List[ProductResponse]: Página de produtos. O cursor da próxima página vem no header X-Next-Cursor.
+    - Com o header Accept: application/x-ndjson, application/vnd.apache.arrow.stream ou application/x-parquet,
+      todas as linhas a partir de after são enviadas em streaming nesse formato.
+    """
+    media_type = negotiate(request)
+    if media_type in STREAMING_MEDIA_TYPES:
+        return streaming_response(media_type, stream_products, ProductModel, ProductResponse, after=after, fields=fields)
+
+    products, next_cursor = get_products(db, limit=limit, after=after, fields=fields)
+    return json_rows_response(products, ProductResponse, next_cursor, fields)
+
+
+@router.patch("/products/", response_model=BulkMutationResponse)
+def update_products_bulk_route(
+    params: Annotated[ProductBulkParams, Query()], product: ProductUpdate, db: Session = Depends(get_db)
+):
     """
-    Retorna todos os produtos.
+    Atualiza todos os produtos filtrados com um único UPDATE ... WHERE ... RETURNING id.
 
     Parâmetros:
+    - params (ProductBulkParams): Filtros, dry_run e chunk_size.
+    - product (ProductUpdate): Campos a serem alterados.
     - db (Session): Sessão do banco de dados.
 
     Retorna:
-    - List[ProductResponse]: Lista de todos os produtos.
+    - BulkMutationResponse: Quantidade e ids alterados, ou apenas a contagem no dry_run.
+
+    Lança:
+    - HTTPException: Se nenhum filtro ou nenhum campo for informado, ou se o banco rejeitar a alteração.
+    """
+    if not params.has_filters():
+        raise HTTPException(status_code=400, detail="Informe ao menos um filtro")
+    if not product.model_fields_set:
+        raise HTTPException(status_code=400, detail="Informe ao menos um campo para atualizar")
+    if params.dry_run:
+        return BulkMutationResponse(matched=count_products(db, params), ids=[], dry_run=True)
+    try:
+        ids = update_products_bulk(db, params, product, chunk_size=params.chunk_size)
+    except IntegrityError as e:
+        db.rollback()
+        raise HTTPException(status_code=409, detail=f"Erro ao atualizar produtos: {str(e.orig)}")
+    return BulkMutationResponse(matched=len(ids), ids=ids, dry_run=False)
+
+
+@router.delete("/products/", response_model=BulkMutationResponse)
+def delete_products_bulk_route(params: Annotated[ProductBulkParams, Query()], db: Session = Depends(get_db)):
     """
-    products = get_products(db)
-    return products
+    Remove todos os produtos filtrados com um único DELETE ... WHERE ... RETURNING id.
+
+    Parâmetros:
+    - params (ProductBulkParams): Filtros, dry_run e chunk_size.
+    - db (Session): Sessão do banco de dados.
+
+    Retorna:
+    - BulkMutationResponse: Quantidade e ids removidos, ou apenas a contagem no dry_run.
+
+    Lança:
+    - HTTPException: Se nenhum filtro for informado.
+    """
+    if not params.has_filters():
+        raise HTTPException(status_code=400, detail="Informe ao menos um filtro")
+    if params.dry_run:
+        return BulkMutationResponse(matched=count_products(db, params), ids=[], dry_run=True)
+    ids = delete_products_bulk(db, params, chunk_size=params.chunk_size)
+    return BulkMutationResponse(matched=len(ids), ids=ids, dry_run=False)
 
 
 @router.get("/products/{product_id}", response_model=ProductResponse)
-def read_product_route(product_id: int, db: Session = Depends(get_db)):
+def read_product_route(
+    product_id: int,
+    fields: Optional[tuple] = Depends(field_selection(ProductResponse)),
+    db: Session = Depends(get_db),
+):
     """
     Retorna um produto específico.
 
     Parâmetros:
     - product_id (int): ID do produto a ser retornado.
+    - fields (str): Campos da resposta separados por vírgula; só essas colunas são lidas do banco.
     - db (Session): Sessão do banco de dados.
 
     Retorna:
@@ -58,10 +182,10 @@ def read_product_route(product_id: int, db: Session = Depends(get_db)):
     Lança:
     - HTTPException: Se o produto não for encontrado.
     """
-    db_product = get_product(db, product_id=product_id)
+    db_product = get_product(db, product_id=product_id, fields=fields)
     if db_product is None:
         raise HTTPException(status_code=404, detail="Product not found")
-    return db_product
+    return db_product if fields is None else json_row_response(db_product, ProductResponse, fields)
 
 
 @router.delete("/products/{product_id}", response_model=ProductResponse)
@@ -86,12 +210,15 @@ def detele_product_route(product_id: int, db: Session = Depends(get_db)):
 
 
 @router.put("/products/{product_id}", response_model=ProductResponse)
+@router.patch("/products/{product_id}", response_model=ProductResponse)
 def update_product_route(
     product_id: int, product: ProductUpdate, db: Session = Depends(get_db)
 ):
     """
     Atualiza um produto específico.
 
+    Apenas os campos enviados são alterados, com um único UPDATE ... RETURNING.
+
     Parâmetros:
     - product_id (int): ID do produto a ser atualizado.
     - product (ProductUpdate): Dados atualizados do produto.
@@ -101,9 +228,13 @@ def update_product_route(
     - ProductResponse: Dados do produto atualizado.
 
     Lança:
-    - HTTPException: Se o produto não for encontrado.
+    - HTTPException: Se o produto não for encontrado, ou se o banco rejeitar a alteração (ex.: email duplicado).
     """
-    db_product = update_product(db, product_id=product_id, product=product)
+    try:
+        db_product = update_product(db, product_id=product_id, product=product)
+    except IntegrityError as e:
+        db.rollback()
+        raise HTTPException(status_code=409, detail=f"Erro ao atualizar produto: {str(e.orig)}")
     if db_product is None:
         raise HTTPException(status_code=404, detail="Product not found")
     return db_product
\ No newline at end of file
@@ -0,0 +1,148 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from database.database import get_async_db
+from models.product.product import ProductModel
+from models.product.product_schema import ProductResponse, ProductUpdate, ProductCreate
+from typing import List, Optional
+from crud.base import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from crud.product.crud import stream_products
+from routes.formats import (
+    LIST_RESPONSES,
+    STREAMING_MEDIA_TYPES,
+    field_selection,
+    json_row_response,
+    json_rows_response,
+    negotiate,
+    streaming_response,
+)
+from crud.product.crud_async import (
+    create_product,
+    get_products,
+    get_product,
+    delete_product,
+    update_product,
+)
+
+# Versões assíncronas das rotas de produtos, registradas antes das síncronas quando DB_ASYNC está ativo.
+# As rotas em lote continuam no router síncrono.
+router = APIRouter()
+
+@router.post("/products/", response_model=ProductResponse)
+async def create_product_route(product: ProductCreate, db: AsyncSession = Depends(get_async_db)):
+    """
+    Cria um novo produto.
+
+    Parâmetros:
+    - product (ProductCreate): Dados do produto a ser criado.
+    - db (AsyncSession): Sessão assíncrona do banco de dados.
+
+    Retorna:
+    - ProductResponse: Dados do produto criado.
+    """
+    return await create_product(db=db, product=product)
+
+
+@router.get("/products/", response_model=List[ProductResponse], responses=LIST_RESPONSES)
+async def read_all_products_route(
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    fields: Optional[tuple] = Depends(field_selection(ProductResponse)),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Retorna uma página de produtos.
+
+    Parâmetros:
+    - limit (int): Quantidade máxima de itens na página.
+    - after (str): Cursor retornado pela página anterior.
+    - fields (str): Campos da resposta separados por vírgula; só essas colunas são lidas do banco.
+    - db (AsyncSession): Sessão assíncrona do banco de dados.
+
+    Retorna:
+    - List[ProductResponse]: Página de produtos. O cursor da próxima página vem no header X-Next-Cursor.
+    - Nos formatos em streaming a exportação usa o cursor do servidor do motor síncrono.
+    """
+    media_type = negotiate(request)
+    if media_type in STREAMING_MEDIA_TYPES:
+        return streaming_response(media_type, stream_products, ProductModel, ProductResponse, after=after, fields=fields)
+
+    products, next_cursor = await get_products(db, limit=limit, after=after, fields=fields)
+    return json_rows_response(products, ProductResponse, next_cursor, fields)
+
+
+@router.get("/products/{product_id:int}", response_model=ProductResponse)
+async def read_product_route(
+    product_id: int,
+    fields: Optional[tuple] = Depends(field_selection(ProductResponse)),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Retorna um produto específico.
+
+    Parâmetros:
+    - product_id (int): ID do produto a ser retornado.
+    - fields (str): Campos da resposta separados por vírgula; só essas colunas são lidas do banco.
+    - db (AsyncSession): Sessão assíncrona do banco de dados.
+
+    Retorna:
+    - ProductResponse: Dados do produto solicitado.
+
+    Lança:
+    - HTTPException: Se o produto não for encontrado.
+    """
+    db_product = await get_product(db, product_id=product_id, fields=fields)
+    if db_product is None:
+        raise HTTPException(status_code=404, detail="Product not found")
+    return db_product if fields is None else json_row_response(db_product, ProductResponse, fields)
+
+
+@router.delete("/products/{product_id:int}", response_model=ProductResponse)
+async def delete_product_route(product_id: int, db: AsyncSession = Depends(get_async_db)):
+    """
+    Deleta um produto específico.
+
+    Parâmetros:
+    - product_id (int): ID do produto a ser deletado.
+    - db (AsyncSession): Sessão assíncrona do banco de dados.
+
+    Retorna:
+    - ProductResponse: Dados do produto deletado.
+
+    Lança:
+    - HTTPException: Se o produto não for encontrado.
+    """
+    db_product = await delete_product(db, product_id=product_id)
+    if db_product is None:
+        raise HTTPException(status_code=404, detail="Product not found")
+    return db_product
+
+
+@router.put("/products/{product_id:int}", response_model=ProductResponse)
+@router.patch("/products/{product_id:int}", response_model=ProductResponse)
+async def update_product_route(
+    product_id: int, product: ProductUpdate, db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Atualiza um produto específico com um único UPDATE ... RETURNING.
+
+    Parâmetros:
+    - product_id (int): ID do produto a ser atualizado.
+    - product (ProductUpdate): Dados atualizados do produto.
+    - db (AsyncSession): Sessão assíncrona do banco de dados.
+
+    Retorna:
+    - ProductResponse: Dados do produto atualizado.
+
+    Lança:
+    - HTTPException: Se o produto não for encontrado, ou se o banco rejeitar a alteração (ex.: email duplicado).
+    """
+    try:
+        db_product = await update_product(db, product_id=product_id, product=product)
+    except IntegrityError as e:
+        await db.rollback()
+        raise HTTPException(status_code=409, detail=f"Erro ao atualizar produto: {str(e.orig)}")
+    if db_product is None:
+        raise HTTPException(status_code=404, detail="Product not found")
+    return db_product
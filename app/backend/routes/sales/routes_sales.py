@@ -1,14 +1,46 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from database.database import SessionLocal, get_db
-from models.sales.sales_schema import SalesResponse, SalesUpdate, SalesCreate
-from typing import List
+from models.sales.sales import SalesModel
+from models.sales.sales_schema import (
+    SalesAggregate,
+    SalesCreate,
+    SalesGroupBy,
+    SalesListFilter,
+    SalesMetric,
+    SalesRangeFilter,
+    SalesResponse,
+    SalesUpdate,
+)
+from models.bulk.bulk_schema import BulkInsertResponse, BulkMutationResponse, SalesBulkParams
+from typing import Annotated, List, Optional
+from crud.base import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from routes.formats import (
+    LIST_RESPONSES,
+    STREAMING_MEDIA_TYPES,
+    bulk_request_body,
+    field_selection,
+    json_row_response,
+    json_rows_response,
+    negotiate,
+    read_bulk_body,
+    streaming_response,
+    validate_bulk_rows,
+)
 from crud.sales.crud import (
     create_sales,
+    create_sales_bulk,
     get_sales,
+    get_sales_history,
+    stream_sales,
     get_sales_by_id,
     delete_sales,
     update_sales,
+    count_sales,
+    update_sales_bulk,
+    delete_sales_bulk,
+    aggregate_sales,
 )
 
 router = APIRouter()
@@ -28,28 +60,190 @@ def create_sales_route(sales: SalesCreate, db: Session = Depends(get_db)):
     return create_sales(db=db, sales=sales)
 
 
-@router.get("/sales/", response_model=List[SalesResponse])
-def read_all_sales_route(db: Session = Depends(get_db)):
+@router.post("/sales/bulk", response_model=BulkInsertResponse, openapi_extra=bulk_request_body(SalesCreate))
+def create_sales_bulk_route(rows: List[dict] = Depends(read_bulk_body), db: Session = Depends(get_db)):
+    """
+    Cria várias vendas de uma vez.
+
+    O corpo pode ser um array JSON ou NDJSON (Content-Type: application/x-ndjson), com até
+    MAX_BULK_ROWS linhas. Todas as linhas são validadas; as válidas são gravadas em uma
+    única transação e as inválidas são devolvidas em errors, sem impedir as demais.
+
+    Parâmetros:
+    - rows (List[dict]): Linhas lidas do corpo da requisição.
+    - db (Session): Sessão do banco de dados.
+
+    Retorna:
+    - BulkInsertResponse: Quantidade e ids inseridos, e os erros de validação por linha.
+
+    Lança:
+    - HTTPException: Se o banco rejeitar o lote (ex.: email duplicado), nenhuma linha é gravada.
+    """
+    sales, errors = validate_bulk_rows(rows, SalesCreate)
+    try:
+        ids = create_sales_bulk(db, sales)
+    except IntegrityError as e:
+        db.rollback()
+        raise HTTPException(status_code=409, detail=f"Erro ao inserir vendas: {str(e.orig)}")
+    return BulkInsertResponse(inserted=len(ids), ids=ids, errors=errors)
+
+
+@router.get("/sales/", response_model=List[SalesResponse], responses=LIST_RESPONSES)
+def read_all_sales_route(
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    filters: SalesListFilter = Depends(),
+    fields: Optional[tuple] = Depends(field_selection(SalesResponse)),
+    db: Session = Depends(get_db),
+):
+    """
+    Retorna uma página de vendas, filtrada e ordenada no banco.
+
+    Parâmetros:
+    - limit (int): Quantidade máxima de itens na página.
+    - after (str): Cursor retornado pela página anterior.
+    - filters (SalesListFilter): date_from, date_to, email_employee, email_customer, name_product,
+      employee_id, product_id, min_price, max_price e order_by (ex.: -date para as vendas mais recentes primeiro).
+    - fields (str): Campos da resposta separados por vírgula; só essas colunas são lidas do banco.
+    - db (Session): Sessão do banco de dados.
+
+    Retorna:
+    - List[SalesResponse]: Página de vendas. O cursor da próxima página vem no header X-Next-Cursor.
+    - Com o header Accept: application/x-ndjson, application/vnd.apache.arrow.stream ou application/x-parquet,
+      todas as linhas a partir de after são enviadas em streaming nesse formato.
+    """
+    media_type = negotiate(request)
+    if media_type in STREAMING_MEDIA_TYPES:
+        return streaming_response(
+            media_type, stream_sales, SalesModel, SalesResponse, after=after, fields=fields, filters=filters
+        )
+
+    sales, next_cursor = get_sales(db, limit=limit, after=after, filters=filters, fields=fields)
+    return json_rows_response(sales, SalesResponse, next_cursor, fields)
+
+
+@router.get("/sales/aggregates", response_model=List[SalesAggregate], response_model_exclude_none=True)
+def read_sales_aggregates_route(
+    group_by: Optional[SalesGroupBy] = None,
+    metrics: List[SalesMetric] = Query([SalesMetric.sum_price, SalesMetric.count]),
+    top: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    filters: SalesRangeFilter = Depends(),
+    db: Session = Depends(get_db),
+):
+    """
+    Retorna métricas de vendas agregadas no banco com GROUP BY.
+
+    Parâmetros:
+    - group_by (SalesGroupBy): day, week ou month (faixas de data) ou name_product, email_employee,
+      product_id, employee_id.
+      Sem group_by, retorna uma única linha com o total.
+    - metrics (List[SalesMetric]): Métricas a calcular (repetir o parâmetro para mais de uma).
+    - top (int): Retorna somente os N grupos com o maior valor da primeira métrica.
+    - filters (SalesRangeFilter): Os mesmos filtros da listagem (date_from, date_to, ...).
+    - db (Session): Sessão do banco de dados.
+
+    Retorna:
+    - List[SalesAggregate]: Uma linha por grupo, com a chave (key) e as métricas pedidas.
+    """
+    return aggregate_sales(db, metrics=metrics, group_by=group_by, top=top, filters=filters)
+
+
+@router.get("/sales/history", response_model=List[SalesResponse])
+def read_sales_history_route(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    filters: SalesListFilter = Depends(),
+    fields: Optional[tuple] = Depends(field_selection(SalesResponse)),
+    db: Session = Depends(get_db),
+):
+    """
+    Retorna uma página de vendas incluindo as já arquivadas em Parquet (python -m database.archive).
+
+    Aceita os mesmos filtros, ordenação e cursor de GET /sales/; as vendas do Postgres e as
+    arquivadas vêm intercaladas na mesma ordem.
+
+    Parâmetros:
+    - limit (int): Quantidade máxima de itens na página.
+    - after (str): Cursor retornado pela página anterior.
+    - filters (SalesListFilter): Os mesmos filtros e order_by da listagem.
+    - fields (str): Campos da resposta separados por vírgula.
+    - db (Session): Sessão do banco de dados.
+
+    Retorna:
+    - List[SalesResponse]: Página de vendas. O cursor da próxima página vem no header X-Next-Cursor.
+    """
+    sales, next_cursor = get_sales_history(db, limit=limit, after=after, filters=filters, fields=fields)
+    return json_rows_response(sales, SalesResponse, next_cursor, fields)
+
+
+@router.patch("/sales/", response_model=BulkMutationResponse)
+def update_sales_bulk_route(
+    params: Annotated[SalesBulkParams, Query()], sales: SalesUpdate, db: Session = Depends(get_db)
+):
+    """
+    Atualiza todas as vendas filtradas com um único UPDATE ... WHERE ... RETURNING id.
+
+    Parâmetros:
+    - params (SalesBulkParams): Filtros, dry_run e chunk_size.
+    - sales (SalesUpdate): Campos a serem alterados.
+    - db (Session): Sessão do banco de dados.
+
+    Retorna:
+    - BulkMutationResponse: Quantidade e ids alterados, ou apenas a contagem no dry_run.
+
+    Lança:
+    - HTTPException: Se nenhum filtro ou nenhum campo for informado, ou se o banco rejeitar a alteração.
+    """
+    if not params.has_filters():
+        raise HTTPException(status_code=400, detail="Informe ao menos um filtro")
+    if not sales.model_fields_set:
+        raise HTTPException(status_code=400, detail="Informe ao menos um campo para atualizar")
+    if params.dry_run:
+        return BulkMutationResponse(matched=count_sales(db, params), ids=[], dry_run=True)
+    try:
+        ids = update_sales_bulk(db, params, sales, chunk_size=params.chunk_size)
+    except IntegrityError as e:
+        db.rollback()
+        raise HTTPException(status_code=409, detail=f"Erro ao atualizar vendas: {str(e.orig)}")
+    return BulkMutationResponse(matched=len(ids), ids=ids, dry_run=False)
+
+
+@router.delete("/sales/", response_model=BulkMutationResponse)
+def delete_sales_bulk_route(params: Annotated[SalesBulkParams, Query()], db: Session = Depends(get_db)):
     """
-    Retorna todas as vendas.
+    Remove todas as vendas filtradas com um único DELETE ... WHERE ... RETURNING id.
 
     Parâmetros:
+    - params (SalesBulkParams): Filtros, dry_run e chunk_size.
     - db (Session): Sessão do banco de dados.
 
     Retorna:
-    - List[ProductResponse]: Lista de todos os produtos.
+    - BulkMutationResponse: Quantidade e ids removidos, ou apenas a contagem no dry_run.
+
+    Lança:
+    - HTTPException: Se nenhum filtro for informado.
     """
-    sales = get_sales(db)
-    return sales
+    if not params.has_filters():
+        raise HTTPException(status_code=400, detail="Informe ao menos um filtro")
+    if params.dry_run:
+        return BulkMutationResponse(matched=count_sales(db, params), ids=[], dry_run=True)
+    ids = delete_sales_bulk(db, params, chunk_size=params.chunk_size)
+    return BulkMutationResponse(matched=len(ids), ids=ids, dry_run=False)
 
 
 @router.get("/sales/{sales_id}", response_model=SalesResponse)
-def read_sales_route(sales_id: int, db: Session = Depends(get_db)):
+def read_sales_route(
+    sales_id: int,
+    fields: Optional[tuple] = Depends(field_selection(SalesResponse)),
+    db: Session = Depends(get_db),
+):
     """
     Retorna uma venda específica.
 
     Parâmetros:
     - sales_id (int): ID da venda a ser retornada.
+    - fields (str): Campos da resposta separados por vírgula; só essas colunas são lidas do banco.
     - db (Session): Sessão do banco de dados.
 
     Retorna:
@@ -58,10 +252,10 @@ def read_sales_route(sales_id: int, db: Session = Depends(get_db)):
     Lança:
     - HTTPException: Se a venda não for encontrada.
     """
-    db_sales = get_sales_by_id(db, sales_id=sales_id)
+    db_sales = get_sales_by_id(db, sales_id=sales_id, fields=fields)
     if db_sales is None:
         raise HTTPException(status_code=404, detail="Venda não encontrada")
-    return db_sales
+    return db_sales if fields is None else json_row_response(db_sales, SalesResponse, fields)
 
 
 @router.delete("/sales/{sales_id}", response_model=SalesResponse)
@@ -86,12 +280,15 @@ def detele_sales_route(sales_id: int, db: Session = Depends(get_db)):
 
 
 @router.put("/sales/{sales_id}", response_model=SalesResponse)
+@router.patch("/sales/{sales_id}", response_model=SalesResponse)
 def update_sales_route(
     sales_id: int, sales: SalesUpdate, db: Session = Depends(get_db)
 ):
     """
     Atualiza uma venda específica.
 
+    Apenas os campos enviados são alterados, com um único UPDATE ... RETURNING.
+
     Parâmetros:
     - sales_id (int): ID da venda a ser atualizada.
     - sales (SalesUpdate): Dados atualizados da venda.
@@ -101,9 +298,13 @@ def update_sales_route(
     - SalesResponse: Dados da venda atualizada.
 
     Lança:
-    - HTTPException: Se a venda não for encontrada.
+    - HTTPException: Se a venda não for encontrada, ou se o banco rejeitar a alteração (ex.: data sem partição).
     """
-    db_sales = update_sales(db, sales_id=sales_id, sales=sales)
+    try:
+        db_sales = update_sales(db, sales_id=sales_id, sales=sales)
+    except IntegrityError as e:
+        db.rollback()
+        raise HTTPException(status_code=409, detail=f"Erro ao atualizar venda: {str(e.orig)}")
     if db_sales is None:
         raise HTTPException(status_code=404, detail="Venda não encontrada")
     return db_sales
\ No newline at end of file
@@ -0,0 +1,153 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from database.database import get_async_db
+from models.sales.sales import SalesModel
+from models.sales.sales_schema import SalesResponse, SalesUpdate, SalesCreate, SalesListFilter
+from typing import List, Optional
+from crud.base import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from crud.sales.crud import stream_sales
+from routes.formats import (
+    LIST_RESPONSES,
+    STREAMING_MEDIA_TYPES,
+    field_selection,
+    json_row_response,
+    json_rows_response,
+    negotiate,
+    streaming_response,
+)
+from crud.sales.crud_async import (
+    create_sales,
+    get_sales,
+    get_sales_by_id,
+    delete_sales,
+    update_sales,
+)
+
+# Versões assíncronas das rotas de vendas, registradas antes das síncronas quando DB_ASYNC está ativo.
+# As rotas em lote continuam no router síncrono.
+router = APIRouter()
+
+@router.post("/sales/", response_model=SalesResponse)
+async def create_sales_route(sales: SalesCreate, db: AsyncSession = Depends(get_async_db)):
+    """
+    Cria uma nova venda.
+
+    Parâmetros:
+    - sales (SalesCreate): Dados da venda a ser criada.
+    - db (AsyncSession): Sessão assíncrona do banco de dados.
+
+    Retorna:
+    - SalesResponse: Dados da venda criada.
+    """
+    return await create_sales(db=db, sales=sales)
+
+
+@router.get("/sales/", response_model=List[SalesResponse], responses=LIST_RESPONSES)
+async def read_all_sales_route(
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    filters: SalesListFilter = Depends(),
+    fields: Optional[tuple] = Depends(field_selection(SalesResponse)),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Retorna uma página de vendas, filtrada e ordenada no banco.
+
+    Parâmetros:
+    - limit (int): Quantidade máxima de itens na página.
+    - after (str): Cursor retornado pela página anterior.
+    - filters (SalesListFilter): date_from, date_to, email_employee, email_customer, name_product,
+      employee_id, product_id, min_price, max_price e order_by (ex.: -date para as vendas mais recentes primeiro).
+    - fields (str): Campos da resposta separados por vírgula; só essas colunas são lidas do banco.
+    - db (AsyncSession): Sessão assíncrona do banco de dados.
+
+    Retorna:
+    - List[SalesResponse]: Página de vendas. O cursor da próxima página vem no header X-Next-Cursor.
+    - Nos formatos em streaming a exportação usa o cursor do servidor do motor síncrono.
+    """
+    media_type = negotiate(request)
+    if media_type in STREAMING_MEDIA_TYPES:
+        return streaming_response(
+            media_type, stream_sales, SalesModel, SalesResponse, after=after, fields=fields, filters=filters
+        )
+
+    sales, next_cursor = await get_sales(db, limit=limit, after=after, filters=filters, fields=fields)
+    return json_rows_response(sales, SalesResponse, next_cursor, fields)
+
+
+@router.get("/sales/{sales_id:int}", response_model=SalesResponse)
+async def read_sales_route(
+    sales_id: int,
+    fields: Optional[tuple] = Depends(field_selection(SalesResponse)),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Retorna uma venda específica.
+
+    Parâmetros:
+    - sales_id (int): ID da venda a ser retornada.
+    - fields (str): Campos da resposta separados por vírgula; só essas colunas são lidas do banco.
+    - db (AsyncSession): Sessão assíncrona do banco de dados.
+
+    Retorna:
+    - SalesResponse: Dados da venda solicitada.
+
+    Lança:
+    - HTTPException: Se a venda não for encontrada.
+    """
+    db_sales = await get_sales_by_id(db, sales_id=sales_id, fields=fields)
+    if db_sales is None:
+        raise HTTPException(status_code=404, detail="Venda não encontrada")
+    return db_sales if fields is None else json_row_response(db_sales, SalesResponse, fields)
+
+
+@router.delete("/sales/{sales_id:int}", response_model=SalesResponse)
+async def delete_sales_route(sales_id: int, db: AsyncSession = Depends(get_async_db)):
+    """
+    Deleta uma venda específica.
+
+    Parâmetros:
+    - sales_id (int): ID da venda a ser deletada.
+    - db (AsyncSession): Sessão assíncrona do banco de dados.
+
+    Retorna:
+    - SalesResponse: Dados da venda deletada.
+
+    Lança:
+    - HTTPException: Se a venda não for encontrada.
+    """
+    db_sales = await delete_sales(db, sales_id=sales_id)
+    if db_sales is None:
+        raise HTTPException(status_code=404, detail="Venda não encontrada")
+    return db_sales
+
+
+@router.put("/sales/{sales_id:int}", response_model=SalesResponse)
+@router.patch("/sales/{sales_id:int}", response_model=SalesResponse)
+async def update_sales_route(
+    sales_id: int, sales: SalesUpdate, db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Atualiza uma venda específica com um único UPDATE ... RETURNING.
+
+    Parâmetros:
+    - sales_id (int): ID da venda a ser atualizada.
+    - sales (SalesUpdate): Dados atualizados da venda.
+    - db (AsyncSession): Sessão assíncrona do banco de dados.
+
+    Retorna:
+    - SalesResponse: Dados da venda atualizada.
+
+    Lança:
+    - HTTPException: Se a venda não for encontrada, ou se o banco rejeitar a alteração (ex.: data sem partição).
+    """
+    try:
+        db_sales = await update_sales(db, sales_id=sales_id, sales=sales)
+    except IntegrityError as e:
+        await db.rollback()
+        raise HTTPException(status_code=409, detail=f"Erro ao atualizar venda: {str(e.orig)}")
+    if db_sales is None:
+        raise HTTPException(status_code=404, detail="Venda não encontrada")
+    return db_sales
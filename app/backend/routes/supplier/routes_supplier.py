@@ -1,14 +1,35 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from database.database import SessionLocal, get_db
+from models.supplier.supplier import SupplierModel
 from models.supplier.supplier_schema import SupplierResponse, SupplierUpdate, SupplierCreate
-from typing import List
+from models.bulk.bulk_schema import BulkInsertResponse, BulkMutationResponse, SupplierBulkParams
+from typing import Annotated, List, Optional
+from crud.base import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from routes.formats import (
+    LIST_RESPONSES,
+    STREAMING_MEDIA_TYPES,
+    bulk_request_body,
+    field_selection,
+    json_row_response,
+    json_rows_response,
+    negotiate,
+    read_bulk_body,
+    streaming_response,
+    validate_bulk_rows,
+)
 from crud.supplier.crud import (
     create_supplier,
+    create_suppliers_bulk,
     get_suppliers,
+    stream_suppliers,
     get_supplier,
     delete_supplier,
     update_supplier,
+    count_suppliers,
+    update_suppliers_bulk,
+    delete_suppliers_bulk,
 )
 
 router = APIRouter()
@@ -27,27 +48,130 @@ def create_supplier_route(supplier: SupplierCreate, db: Session = Depends(get_db
     """
     return create_supplier(db=db, supplier=supplier)
 
-@router.get("/suppliers/", response_model=List[SupplierResponse])
-def read_all_suppliers_route(db: Session = Depends(get_db)):
+@router.post("/suppliers/bulk", response_model=BulkInsertResponse, openapi_extra=bulk_request_body(SupplierCreate))
+def create_suppliers_bulk_route(rows: List[dict] = Depends(read_bulk_body), db: Session = Depends(get_db)):
+    """
+    Cria vários fornecedores de uma vez.
+
+    O corpo pode ser um array JSON ou NDJSON (Content-Type: application/x-ndjson), com até
+    MAX_BULK_ROWS linhas. Todas as linhas são validadas; as válidas são gravadas em uma
+    única transação e as inválidas são devolvidas em errors, sem impedir as demais.
+
+    Parâmetros:
+    - rows (List[dict]): Linhas lidas do corpo da requisição.
+    - db (Session): Sessão do banco de dados.
+
+    Retorna:
+    - BulkInsertResponse: Quantidade e ids inseridos, e os erros de validação por linha.
+
+    Lança:
+    - HTTPException: Se o banco rejeitar o lote (ex.: email duplicado), nenhuma linha é gravada.
+    """
+    suppliers, errors = validate_bulk_rows(rows, SupplierCreate)
+    try:
+        ids = create_suppliers_bulk(db, suppliers)
+    except IntegrityError as e:
+        db.rollback()
+        raise HTTPException(status_code=409, detail=f"Erro ao inserir fornecedores: {str(e.orig)}")
+    return BulkInsertResponse(inserted=len(ids), ids=ids, errors=errors)
+
+
+@router.get("/suppliers/", response_model=List[SupplierResponse], responses=LIST_RESPONSES)
+def read_all_suppliers_route(
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    fields: Optional[tuple] = Depends(field_selection(SupplierResponse)),
+    db: Session = Depends(get_db),
+):
+    """
+    Retorna uma página de fornecedores.
+
+    Parâmetros:
+    - limit (int): Quantidade máxima de itens na página.
+    - after (str): Cursor retornado pela página anterior.
+    - fields (str): Campos da resposta separados por vírgula; só essas colunas são lidas do banco.
+    - db (Session): Sessão do banco de dados.
+
+    Retorna:
+    - List[SupplierResponse]: Página de fornecedores. O cursor da próxima página vem no header X-Next-Cursor.
+    - Com o header Accept: application/x-ndjson, application/vnd.apache.arrow.stream ou application/x-parquet,
+      todas as linhas a partir de after são enviadas em streaming nesse formato.
+    """
+    media_type = negotiate(request)
+    if media_type in STREAMING_MEDIA_TYPES:
+        return streaming_response(media_type, stream_suppliers, SupplierModel, SupplierResponse, after=after, fields=fields)
+
+    suppliers, next_cursor = get_suppliers(db, limit=limit, after=after, fields=fields)
+    return json_rows_response(suppliers, SupplierResponse, next_cursor, fields)
+
+@router.patch("/suppliers/", response_model=BulkMutationResponse)
+def update_suppliers_bulk_route(
+    params: Annotated[SupplierBulkParams, Query()], supplier: SupplierUpdate, db: Session = Depends(get_db)
+):
     """
-    Retorna todos os fornecedores.
+    Atualiza todos os fornecedores filtrados com um único UPDATE ... WHERE ... RETURNING id.
 
     Parâmetros:
+    - params (SupplierBulkParams): Filtros, dry_run e chunk_size.
+    - supplier (SupplierUpdate): Campos a serem alterados.
     - db (Session): Sessão do banco de dados.
 
     Retorna:
-    - List[SupplierResponse]: Lista de todos os fornecedores.
+    - BulkMutationResponse: Quantidade e ids alterados, ou apenas a contagem no dry_run.
+
+    Lança:
+    - HTTPException: Se nenhum filtro ou nenhum campo for informado, ou se o banco rejeitar a alteração.
     """
-    suppliers = get_suppliers(db)
-    return suppliers
+    if not params.has_filters():
+        raise HTTPException(status_code=400, detail="Informe ao menos um filtro")
+    if not supplier.model_fields_set:
+        raise HTTPException(status_code=400, detail="Informe ao menos um campo para atualizar")
+    if params.dry_run:
+        return BulkMutationResponse(matched=count_suppliers(db, params), ids=[], dry_run=True)
+    try:
+        ids = update_suppliers_bulk(db, params, supplier, chunk_size=params.chunk_size)
+    except IntegrityError as e:
+        db.rollback()
+        raise HTTPException(status_code=409, detail=f"Erro ao atualizar fornecedores: {str(e.orig)}")
+    return BulkMutationResponse(matched=len(ids), ids=ids, dry_run=False)
+
+
+@router.delete("/suppliers/", response_model=BulkMutationResponse)
+def delete_suppliers_bulk_route(params: Annotated[SupplierBulkParams, Query()], db: Session = Depends(get_db)):
+    """
+    Remove todos os fornecedores filtrados com um único DELETE ... WHERE ... RETURNING id.
+
+    Parâmetros:
+    - params (SupplierBulkParams): Filtros, dry_run e chunk_size.
+    - db (Session): Sessão do banco de dados.
+
+    Retorna:
+    - BulkMutationResponse: Quantidade e ids removidos, ou apenas a contagem no dry_run.
+
+    Lança:
+    - HTTPException: Se nenhum filtro for informado.
+    """
+    if not params.has_filters():
+        raise HTTPException(status_code=400, detail="Informe ao menos um filtro")
+    if params.dry_run:
+        return BulkMutationResponse(matched=count_suppliers(db, params), ids=[], dry_run=True)
+    ids = delete_suppliers_bulk(db, params, chunk_size=params.chunk_size)
+    return BulkMutationResponse(matched=len(ids), ids=ids, dry_run=False)
+
 
 @router.get("/suppliers/{supplier_id}", response_model=SupplierResponse)
-def read_supplier_route(supplier_id: int, db: Session = Depends(get_db)):
+def read_supplier_route(
+    supplier_id: int,
+    fields: Optional[tuple] = Depends(field_selection(SupplierResponse)),
+    db: Session = Depends(get_db),
+):
     """
     Retorna um fornecedor específico.
 
     Parâmetros:
     - supplier_id (int): ID do fornecedor a ser retornado.
+    - fields (str): Campos da resposta separados por vírgula; só essas colunas são lidas do banco.
     - db (Session): Sessão do banco de dados.
 
     Retorna:
@@ -56,10 +180,10 @@ def read_supplier_route(supplier_id: int, db: Session = Depends(get_db)):
     Lança:
     - HTTPException: Se o fornecedor não for encontrado.
     """
-    db_supplier = get_supplier(db, supplier_id=supplier_id)
+    db_supplier = get_supplier(db, supplier_id=supplier_id, fields=fields)
     if db_supplier is None:
         raise HTTPException(status_code=404, detail="Supplier not found")
-    return db_supplier
+    return db_supplier if fields is None else json_row_response(db_supplier, SupplierResponse, fields)
 
 @router.delete("/suppliers/{supplier_id}", response_model=SupplierResponse)
 def delete_supplier_route(supplier_id: int, db: Session = Depends(get_db)):
@@ -82,12 +206,15 @@ def delete_supplier_route(supplier_id: int, db: Session = Depends(get_db)):
     return db_supplier
 
 @router.put("/suppliers/{supplier_id}", response_model=SupplierResponse)
+@router.patch("/suppliers/{supplier_id}", response_model=SupplierResponse)
 def update_supplier_route(
     supplier_id: int, supplier: SupplierUpdate, db: Session = Depends(get_db)
 ):
     """
     Atualiza um fornecedor específico.
 
+    Apenas os campos enviados são alterados, com um único UPDATE ... RETURNING.
+
     Parâmetros:
     - supplier_id (int): ID do fornecedor a ser atualizado.
     - supplier (SupplierUpdate): Dados atualizados do fornecedor.
@@ -97,9 +224,13 @@ def update_supplier_route(
     - SupplierResponse: Dados do fornecedor atualizado.
 
     Lança:
-    - HTTPException: Se o fornecedor não for encontrado.
+    - HTTPException: Se o fornecedor não for encontrado, ou se o banco rejeitar a alteração (ex.: email duplicado).
     """
-    db_supplier = update_supplier(db, supplier_id=supplier_id, supplier=supplier)
+    try:
+        db_supplier = update_supplier(db, supplier_id=supplier_id, supplier=supplier)
+    except IntegrityError as e:
+        db.rollback()
+        raise HTTPException(status_code=409, detail=f"Erro ao atualizar fornecedor: {str(e.orig)}")
     if db_supplier is None:
         raise HTTPException(status_code=404, detail="Supplier not found")
     return db_supplier
@@ -0,0 +1,148 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from database.database import get_async_db
+from models.supplier.supplier import SupplierModel
+from models.supplier.supplier_schema import SupplierResponse, SupplierUpdate, SupplierCreate
+from typing import List, Optional
+from crud.base import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from crud.supplier.crud import stream_suppliers
+from routes.formats import (
+    LIST_RESPONSES,
+    STREAMING_MEDIA_TYPES,
+    field_selection,
+    json_row_response,
+    json_rows_response,
+    negotiate,
+    streaming_response,
+)
+from crud.supplier.crud_async import (
+    create_supplier,
+    get_suppliers,
+    get_supplier,
+    delete_supplier,
+    update_supplier,
+)
+
+# Versões assíncronas das rotas de fornecedores, registradas antes das síncronas quando DB_ASYNC está ativo.
+# As rotas em lote continuam no router síncrono.
+router = APIRouter()
+
+@router.post("/suppliers/", response_model=SupplierResponse)
+async def create_supplier_route(supplier: SupplierCreate, db: AsyncSession = Depends(get_async_db)):
+    """
+    Cria um novo fornecedor.
+
+    Parâmetros:
+    - supplier (SupplierCreate): Dados do fornecedor a ser criado.
+    - db (AsyncSession): Sessão assíncrona do banco de dados.
+
+    Retorna:
+    - SupplierResponse: Dados do fornecedor criado.
+    """
+    return await create_supplier(db=db, supplier=supplier)
+
+
+@router.get("/suppliers/", response_model=List[SupplierResponse], responses=LIST_RESPONSES)
+async def read_all_suppliers_route(
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    fields: Optional[tuple] = Depends(field_selection(SupplierResponse)),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Retorna uma página de fornecedores.
+
+    Parâmetros:
+    - limit (int): Quantidade máxima de itens na página.
+    - after (str): Cursor retornado pela página anterior.
+    - fields (str): Campos da resposta separados por vírgula; só essas colunas são lidas do banco.
+    - db (AsyncSession): Sessão assíncrona do banco de dados.
+
+    Retorna:
+    - List[SupplierResponse]: Página de fornecedores. O cursor da próxima página vem no header X-Next-Cursor.
+    - Nos formatos em streaming a exportação usa o cursor do servidor do motor síncrono.
+    """
+    media_type = negotiate(request)
+    if media_type in STREAMING_MEDIA_TYPES:
+        return streaming_response(media_type, stream_suppliers, SupplierModel, SupplierResponse, after=after, fields=fields)
+
+    suppliers, next_cursor = await get_suppliers(db, limit=limit, after=after, fields=fields)
+    return json_rows_response(suppliers, SupplierResponse, next_cursor, fields)
+
+
+@router.get("/suppliers/{supplier_id:int}", response_model=SupplierResponse)
+async def read_supplier_route(
+    supplier_id: int,
+    fields: Optional[tuple] = Depends(field_selection(SupplierResponse)),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Retorna um fornecedor específico.
+
+    Parâmetros:
+    - supplier_id (int): ID do fornecedor a ser retornado.
+    - fields (str): Campos da resposta separados por vírgula; só essas colunas são lidas do banco.
+    - db (AsyncSession): Sessão assíncrona do banco de dados.
+
+    Retorna:
+    - SupplierResponse: Dados do fornecedor solicitado.
+
+    Lança:
+    - HTTPException: Se o fornecedor não for encontrado.
+    """
+    db_supplier = await get_supplier(db, supplier_id=supplier_id, fields=fields)
+    if db_supplier is None:
+        raise HTTPException(status_code=404, detail="Supplier not found")
+    return db_supplier if fields is None else json_row_response(db_supplier, SupplierResponse, fields)
+
+
+@router.delete("/suppliers/{supplier_id:int}", response_model=SupplierResponse)
+async def delete_supplier_route(supplier_id: int, db: AsyncSession = Depends(get_async_db)):
+    """
+    Deleta um fornecedor específico.
+
+    Parâmetros:
+    - supplier_id (int): ID do fornecedor a ser deletado.
+    - db (AsyncSession): Sessão assíncrona do banco de dados.
+
+    Retorna:
+    - SupplierResponse: Dados do fornecedor deletado.
+
+    Lança:
+    - HTTPException: Se o fornecedor não for encontrado.
+    """
+    db_supplier = await delete_supplier(db, supplier_id=supplier_id)
+    if db_supplier is None:
+        raise HTTPException(status_code=404, detail="Supplier not found")
+    return db_supplier
+
+
+@router.put("/suppliers/{supplier_id:int}", response_model=SupplierResponse)
+@router.patch("/suppliers/{supplier_id:int}", response_model=SupplierResponse)
+async def update_supplier_route(
+    supplier_id: int, supplier: SupplierUpdate, db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Atualiza um fornecedor específico com um único UPDATE ... RETURNING.
+
+    Parâmetros:
+    - supplier_id (int): ID do fornecedor a ser atualizado.
+    - supplier (SupplierUpdate): Dados atualizados do fornecedor.
+    - db (AsyncSession): Sessão assíncrona do banco de dados.
+
+    Retorna:
+    - SupplierResponse: Dados do fornecedor atualizado.
+
+    Lança:
+    - HTTPException: Se o fornecedor não for encontrado, ou se o banco rejeitar a alteração (ex.: email duplicado).
+    """
+    try:
+        db_supplier = await update_supplier(db, supplier_id=supplier_id, supplier=supplier)
+    except IntegrityError as e:
+        await db.rollback()
+        raise HTTPException(status_code=409, detail=f"Erro ao atualizar fornecedor: {str(e.orig)}")
+    if db_supplier is None:
+        raise HTTPException(status_code=404, detail="Supplier not found")
+    return db_supplier
@@ -10,6 +10,7 @@ import pandas as pd
 import requests
 from datetime import datetime, time, date
 from utils import show_response_message
+from tracing import page_span, setup_tracing
 
 from employee import create as create_employee, delete as delete_employee, read_all as read_all_employee, read_employee, update as update_employee
 from product import create as create_product, delete as delete_product, read_all as read_all_product, read_product, update as update_product
@@ -17,6 +18,9 @@ from sales import create as create_sale, delete as delete_sale, read_all as read
 from supplier import create as create_supplier, delete as delete_supplier, read_all as read_all_supplier, read_supplier, update as update_supplier
 from dashboard import dashboard
 
+# Traces do OpenTelemetry, quando OTEL_TRACES_EXPORTER está configurado
+setup_tracing()
+
 
 
 class Dashboard:
@@ -43,21 +47,22 @@ class Dashboard:
                     }
                 )
             
-        # Menu Lateral
-        if selected=="Home":
-            self.home()
-        elif selected=="Funcionário":
-            self.employee() 
-        elif selected=="Fornecedor":
-            self.supplier()     
-        elif selected=="Produto":
-            self.product()
-        elif selected=="Vendas":
-            self.sales()
-        elif selected=='Dashboard':
-            self.dashboard()
-        else:
-            self.about() 
+        # Menu Lateral. Cada execução da tela é um trace, com as requisições ao backend dentro dele
+        with page_span(f"tela {selected}"):
+            if selected=="Home":
+                self.home()
+            elif selected=="Funcionário":
+                self.employee() 
+            elif selected=="Fornecedor":
+                self.supplier()     
+            elif selected=="Produto":
+                self.product()
+            elif selected=="Vendas":
+                self.sales()
+            elif selected=='Dashboard':
+                self.dashboard()
+            else:
+                self.about() 
 
     def home(self):
         st.title('📊 LiftOff Data')
@@ -1,10 +1,13 @@
 import streamlit as st
-import requests
+from utils import conditional_get
+from tracing import traced
 import duckdb
 import os
 import pandas as pd
+import pyarrow as pa
 from dotenv import load_dotenv
 from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime
@@ -12,18 +15,60 @@ from datetime import datetime
 # Carrega o arquivo .env usando um caminho relativo
 load_dotenv(os.path.join(os.path.dirname(__file__), '..', '.env'))
 
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+
 # Função para exibir uma mensagem em caso de erro
 def show_response_message(response):
     st.error(f"Erro {response.status_code}: {response.json().get('detail', 'Erro desconhecido')}")
 
-# Função para fazer requisições assíncronas e retornar dados JSON
-def fetch_data(api_url):
-    response = requests.get(api_url)
+# As funções fetch_* rodam nas threads do ThreadPoolExecutor, que não têm o contexto do Streamlit:
+# em vez de exibir o erro, retornam (dados, resposta com erro), e future_result exibe a mensagem
+
+# Função para fazer requisições assíncronas e retornar os dados em um DataFrame.
+# Os dados vêm em Arrow IPC, já tipados (datas como timestamp), sem passar por JSON.
+def fetch_data(api_url, params=None):
+    response = conditional_get(api_url, params=params, headers={"Accept": ARROW_MEDIA_TYPE})
     if response.status_code == 200:
-        return response.json()
+        return pa.ipc.open_stream(response.content).read_all().to_pandas(date_as_object=False), None
     else:
-        show_response_message(response)
-        return None
+        return None, response
+
+# Função que busca a primeira e a última data de venda, ordenando no backend em vez de baixar a tabela
+def fetch_date_bounds(api_url):
+    bounds = []
+    for order_by in ("date", "-date"):
+        response = conditional_get(api_url, params={"order_by": order_by, "limit": 1})
+        if response.status_code != 200:
+            return None, response
+        if not response.json():
+            return None, None
+        bounds.append(pd.Timestamp(response.json()[0]["date"]).tz_localize(None).to_pydatetime())
+    return tuple(bounds), None
+
+# Função que busca métricas já agregadas pelo backend (GET /sales/aggregates). Com key_name, renomeia
+# a chave do grupo e a receita para os nomes de coluna usados nos gráficos
+def fetch_aggregates(api_url, params, key_name=None):
+    response = conditional_get(api_url, params=params)
+    if response.status_code != 200:
+        return pd.DataFrame(), response
+    df = pd.DataFrame(response.json())
+    if key_name:
+        df = df.rename(columns={'key': key_name, 'sum_price': 'price'})
+    return df, None
+
+# Função que busca uma das análises de funcionários (GET /employees/analytics/<nome>) em um DataFrame
+def fetch_employee_analytics(name, params):
+    response = conditional_get(f"{os.getenv('BACKEND_URL')}/employees/analytics/{name}", params=params)
+    if response.status_code != 200:
+        return pd.DataFrame(), response
+    return pd.DataFrame(response.json()), None
+
+# Função que espera uma busca feita no ThreadPoolExecutor e, na thread do script, exibe o erro dela
+def future_result(future):
+    data, error = future.result()
+    if error is not None:
+        show_response_message(error)
+    return data
 
 # Função para registrar e exibir dados JSON diretamente no DuckDB
 def show_table_from_data(data, table_name):
@@ -38,35 +83,12 @@ def show_table_from_data(data, table_name):
     else:
         st.warning(f"Sem dados disponíveis para '{table_name}'.")
 
-# Função para exibir métricas
-def display_metrics(sales_df, employee_df):
-    # Verifica se a coluna 'produto' está presente
-    if 'name_product' in sales_df.columns:
-        num_produtos = sales_df['name_product'].nunique()
-    else:
-        num_produtos = 0
-        st.warning("⚠️ Coluna 'name_product' ausente no DataFrame de vendas.")
-
-    # Verifica se a coluna 'valor' está presente
-    if 'price' in sales_df.columns:
-        receita_total = sales_df['price'].sum()
-    else:
-        receita_total = 0.0
-        st.warning("⚠️ Coluna 'price' ausente no DataFrame de vendas.")
-
-    # Verifica se a coluna 'id' está presente
-    if 'id' in sales_df.columns:
-        num_vendas = sales_df['id'].nunique()
-    else:
-        num_vendas = 0
-        st.warning("⚠️ Coluna 'id' ausente no DataFrame de vendas.")
-
-    # Verifica se a coluna 'quantidade' está presente
-    if 'quantidade' in sales_df.columns:
-        total_itens = sales_df['quantidade'].sum()
-    else:
-        total_itens = 0
-        st.warning("⚠️ Coluna 'quantidade' ausente no DataFrame de vendas.")
+# Função para exibir métricas, calculadas no backend sobre as vendas do intervalo selecionado
+def display_metrics(sales_totals, employee_df):
+    num_produtos = sales_totals.get('count_distinct_product') or 0
+    receita_total = sales_totals.get('sum_price') or 0.0
+    num_vendas = sales_totals.get('count') or 0
+    total_itens = sales_totals.get('sum_quantity') or 0
 
     # Verifica se a coluna 'employee_id' está presente no employee_df
     if 'employee_id' in employee_df.columns:
@@ -122,20 +144,10 @@ def display_metrics(sales_df, employee_df):
             st.markdown("<div class='metric-container'><h4>👥 Funcionários</h4><div class='metric-value'>{}</div></div>".format(num_funcionarios), unsafe_allow_html=True)
 
 
-# Função para gerar e exibir gráficos
-def display_charts(sales_df, employee_df):
-    if 'birth_date' in employee_df.columns:
-        employee_df['birth_date'] = pd.to_datetime(employee_df['birth_date'], errors='coerce')
-
-    if 'hire_date' in employee_df.columns:
-        # Garantir que 'hire_date' esteja no formato datetime
-        employee_df['hire_date'] = pd.to_datetime(employee_df['hire_date'], errors='coerce')
-        # Remover fuso horário se existir
-        employee_df['hire_date'] = employee_df['hire_date'].dt.tz_localize(None)
-
+# Função para gerar e exibir gráficos. Os gráficos de vendas recebem os grupos já agregados pelo backend.
+def display_charts(sales_by_date, sales_by_product, top_vendedores, employee_df):
     # Gráfico de Vendas por Data
-    if 'date' in sales_df.columns:
-        sales_by_date = sales_df.groupby(sales_df['date'].dt.date)['price'].sum().reset_index()
+    if 'date' in sales_by_date.columns:
         # Transformar em gráfico de área
         fig_sales_date = px.area(sales_by_date, x='date', y='price')
         # Calcular a média
@@ -151,14 +163,12 @@ def display_charts(sales_df, employee_df):
         st.warning("A coluna 'date' não está presente nos dados de vendas.")
 
     # Gráfico de Vendas por Produto
-    sales_by_product = sales_df.groupby('name_product')['price'].sum().reset_index()
     fig_sales_product = px.bar(sales_by_product, x='name_product', y='price')
     st.subheader("Vendas por Produto")
     st.write("Este gráfico apresenta o total de vendas por produto, destacando quais produtos geraram mais receita.")
     st.plotly_chart(fig_sales_product)
 
     # Top 10 Melhores Vendedores
-    top_vendedores = sales_df.groupby('email_employee')['price'].sum().nlargest(10).reset_index()
     fig_top_vendedores = px.bar(top_vendedores, x='email_employee', y='price')
     st.subheader("Top 10 Melhores Vendedores")
     st.write("Este gráfico mostra os 10 vendedores com maior volume de vendas, reconhecendo a performance individual.")
@@ -181,7 +191,8 @@ def display_charts(sales_df, employee_df):
         </div>
     """, unsafe_allow_html=True)
 
-    # Conversão de colunas de data para datetime no employee_df
+    # Conversão de colunas de data para datetime no employee_df, usadas apenas nos limites do filtro
+    analytics_params = {}
     if 'hire_date' in employee_df.columns:
         employee_df['hire_date'] = pd.to_datetime(employee_df['hire_date'], errors='coerce')
         # Remover fuso horário se existir
@@ -201,72 +212,36 @@ def display_charts(sales_df, employee_df):
             key='hire_date_range'
         )
 
-        # Filtrar o DataFrame de funcionários com base no intervalo selecionado
+        # O filtro é aplicado pelo backend em todas as análises de funcionários
         if date_range_hire:
             start_datetime_hire, end_datetime_hire = date_range_hire
-            employee_df = employee_df[(employee_df['hire_date'] >= start_datetime_hire) & (employee_df['hire_date'] <= end_datetime_hire)]
+            analytics_params = {
+                "hire_date_from": start_datetime_hire.date().isoformat(),
+                "hire_date_to": end_datetime_hire.date().isoformat(),
+            }
     else:
         st.warning("A coluna 'hire_date' não está presente nos dados de funcionários.")
-    
-    # Gráfico de Folha Salarial Mensal
-    if 'hire_date' in employee_df.columns:
-        # Cálculo da folha salarial mensal considerando todos os funcionários
-        employee_df['hire_date'] = pd.to_datetime(employee_df['hire_date'], errors='coerce')
-        employee_df['termination_date'] = pd.to_datetime(employee_df['termination_date'], errors='coerce')
-        # Remover fuso horário se existir
-        employee_df['hire_date'] = employee_df['hire_date'].dt.tz_localize(None)
-        employee_df['termination_date'] = employee_df['termination_date'].dt.tz_localize(None)
-        
-        # Remover registros com 'hire_date' nulo
-        employee_df = employee_df[employee_df['hire_date'].notnull()]
-        
-        # Remover duplicatas
-        employee_df = employee_df.drop_duplicates(subset='employee_id')
-        
-        # Converter 'salary' para numérico
-        employee_df['salary'] = pd.to_numeric(employee_df['salary'], errors='coerce')
-        
-        # Remover registros com 'salary' nulo ou negativo
-        employee_df = employee_df[employee_df['salary'] > 0]
-        
-        # Criar DataFrame auxiliar para armazenar os resultados
-        folha_mensal_df = pd.DataFrame()
-        
-        # Gerar o intervalo de meses desde a primeira contratação até o mês atual
-        start_month = employee_df['hire_date'].min().to_period('M')
-        end_month = pd.Timestamp.today().to_period('M')
-        
-        # Gerar todos os meses no intervalo
-        all_months = pd.period_range(start=start_month, end=end_month, freq='M')
-        
-        # Lista para armazenar os resultados
-        folha_mensal = []
-        
-        for month in all_months:
-            # Definir o início e fim do mês
-            start_of_month = month.to_timestamp()
-            end_of_month = month.to_timestamp(how='end')
-            
-            # Filtrar funcionários ativos no mês
-            active_employees = employee_df[
-                (employee_df['hire_date'] <= end_of_month) &
-                ((employee_df['termination_date'].isna()) | (employee_df['termination_date'] >= start_of_month))
+
+    # As análises são calculadas no banco, cada uma com uma única consulta
+    with ThreadPoolExecutor() as executor:
+        futures = {
+            name: executor.submit(copy_context().run, fetch_employee_analytics, name, params)
+            for name, params in [
+                ("payroll", analytics_params),
+                ("gender", analytics_params),
+                ("salary-by-title", analytics_params),
+                ("hires", analytics_params),
+                ("birthdays", {**analytics_params, "month": pd.to_datetime("today").month}),
             ]
-            
-            # Somar os salários mensais dos funcionários ativos
-            total_salary = active_employees['salary'].sum()
-            folha_mensal.append({'mes': str(month), 'salary': total_salary})
-        
-        folha_mensal_df = pd.DataFrame(folha_mensal)
-        
-        # Converter 'mes' para datetime para ordenar corretamente
-        folha_mensal_df['mes'] = pd.to_datetime(folha_mensal_df['mes'])
-        
-        # Ordenar por mês
-        folha_mensal_df = folha_mensal_df.sort_values('mes')
-        
+        }
+    analytics = {name: future_result(future) for name, future in futures.items()}
+
+    # Gráfico de Folha Salarial Mensal
+    folha_mensal_df = analytics["payroll"]
+    if not folha_mensal_df.empty:
+        folha_mensal_df['month'] = pd.to_datetime(folha_mensal_df['month'])
         # Criar o gráfico
-        fig_folha_mensal = px.bar(folha_mensal_df, x='mes', y='salary')
+        fig_folha_mensal = px.bar(folha_mensal_df, x='month', y='salary')
         # Calcular a média
         media_folha = folha_mensal_df['salary'].mean()
         # Adicionar linha de média vermelha
@@ -277,34 +252,33 @@ def display_charts(sales_df, employee_df):
         st.write("Este gráfico apresenta o total mensal da folha salarial, indicando os custos com pessoal ao longo do tempo.")
         st.plotly_chart(fig_folha_mensal)
     else:
-        st.warning("A coluna 'hire_date' não está presente nos dados de funcionários.")
+        st.warning("Sem dados de contratação para calcular a folha salarial.")
 
     # Gráfico de Percentual de Funcionários por Gênero
-    genero_percent = employee_df['gender'].value_counts(normalize=True) * 100
-    fig_genero = px.pie(values=genero_percent, names=genero_percent.index)
-    st.subheader("Percentual de Funcionários por Gênero")
-    st.write("Este gráfico ilustra a distribuição percentual de funcionários por gênero na empresa.")
-    st.plotly_chart(fig_genero)
+    genero_df = analytics["gender"]
+    if not genero_df.empty:
+        fig_genero = px.pie(genero_df, values='percent', names='gender')
+        st.subheader("Percentual de Funcionários por Gênero")
+        st.write("Este gráfico ilustra a distribuição percentual de funcionários por gênero na empresa.")
+        st.plotly_chart(fig_genero)
 
     # Média Salarial por Cargo
-    salario_por_cargo = employee_df.groupby('job_title')['salary'].mean().reset_index()
-    fig_salario_cargo = px.bar(salario_por_cargo, x='job_title', y='salary')
-    st.subheader("Média Salarial por Cargo")
-    st.write("Este gráfico mostra a média salarial para cada cargo, permitindo comparar remunerações entre posições.")
-    st.plotly_chart(fig_salario_cargo)
+    salario_por_cargo = analytics["salary-by-title"]
+    if not salario_por_cargo.empty:
+        fig_salario_cargo = px.bar(salario_por_cargo, x='job_title', y='avg_salary')
+        st.subheader("Média Salarial por Cargo")
+        st.write("Este gráfico mostra a média salarial para cada cargo, permitindo comparar remunerações entre posições.")
+        st.plotly_chart(fig_salario_cargo)
 
     # Gráfico de Contratações por Mês
-    if 'hire_date' in employee_df.columns:
-        employee_df['hire_mes'] = employee_df['hire_date'].dt.to_period('M').astype(str)
-        contratacoes_mes = employee_df.groupby('hire_mes')['employee_id'].count().reset_index()
-
-        # Converter 'hire_mes' para datetime para ordenar corretamente
-        contratacoes_mes['hire_mes'] = pd.to_datetime(contratacoes_mes['hire_mes'])
+    contratacoes_mes = analytics["hires"]
+    if not contratacoes_mes.empty:
+        contratacoes_mes['month'] = pd.to_datetime(contratacoes_mes['month'])
 
         # Transformar em gráfico de área
-        fig_contratacoes = px.area(contratacoes_mes, x='hire_mes', y='employee_id')
+        fig_contratacoes = px.area(contratacoes_mes, x='month', y='hires')
         # Calcular a média
-        media_contratacoes = contratacoes_mes['employee_id'].mean()
+        media_contratacoes = contratacoes_mes['hires'].mean()
         # Adicionar linha de média vermelha
         fig_contratacoes.add_hline(y=media_contratacoes, line_dash="dash", line_color="red",
                                    annotation_text=f"Média: {media_contratacoes:.2f}",
@@ -313,20 +287,20 @@ def display_charts(sales_df, employee_df):
         st.write("Este gráfico mostra o número de funcionários contratados a cada mês, indicando o ritmo de crescimento da equipe.")
         st.plotly_chart(fig_contratacoes)
     else:
-        st.warning("A coluna 'hire_date' não está presente nos dados de funcionários")
+        st.warning("Sem contratações no intervalo selecionado.")
 
     # Tabela com aniversariantes do mês atual
-    if 'birth_date' in employee_df.columns:
-        current_month = pd.to_datetime("today").month
-        aniversariantes = employee_df[employee_df['birth_date'].dt.month == current_month]
-        st.header("Aniversariantes do Mês")
-        st.write("Esta tabela lista os funcionários que fazem aniversário no mês atual.")
+    aniversariantes = analytics["birthdays"]
+    st.header("Aniversariantes do Mês")
+    st.write("Esta tabela lista os funcionários que fazem aniversário no mês atual.")
+    if not aniversariantes.empty:
         st.dataframe(aniversariantes[['first_name', 'last_name', 'email', 'birth_date']], use_container_width=True)
     else:
-        st.warning("A coluna 'birth_date' não está presente nos dados de funcionários.")
+        st.info("Nenhum aniversariante neste mês.")
 
 
 # Função principal do dashboard
+@traced("dashboard")
 def dashboard():
     st.title("Dashboard LiftOff")
 
@@ -337,48 +311,64 @@ def dashboard():
     # URLs das APIs
     api_urls = {
         "sales": f"{os.getenv('BACKEND_URL')}/sales/",
+        "sales_aggregates": f"{os.getenv('BACKEND_URL')}/sales/aggregates",
         "employees": f"{os.getenv('BACKEND_URL')}/employees/"
     }
 
-    # Requisições em paralelo para obter dados
+    # Requisições em paralelo: funcionários e o intervalo de datas das vendas. copy_context leva o span
+    # da tela para as threads, para as requisições ficarem no mesmo trace
     with ThreadPoolExecutor() as executor:
-        results = executor.map(fetch_data, api_urls.values())
-
-    # Transformar dados em DataFrames
-    sales_data = next(results)
-    employee_data = next(results)
-    sales_df = pd.DataFrame(sales_data)
-    employee_df = pd.DataFrame(employee_data)
-
-    # Conversão de colunas de data para datetime
-    if 'date' in sales_df.columns:
-        sales_df['date'] = pd.to_datetime(sales_df['date'], errors='coerce')
-        # Remover fuso horário das datas
-        sales_df['date'] = sales_df['date'].dt.tz_localize(None)
-
-        min_date_sales = sales_df['date'].min().to_pydatetime()
-        max_date_sales = sales_df['date'].max().to_pydatetime()
-
-        # Seletor de intervalo de datas para vendas usando slider
-        st.header("Filtro de Data para Vendas")
-        date_range_sales = st.slider(
-            "Selecione o intervalo de datas para vendas:",
-            min_value=min_date_sales,
-            max_value=max_date_sales,
-            value=(min_date_sales, max_date_sales),
-            format="DD/MM/YYYY"
-        )
-
-        # Filtrar o DataFrame de vendas com base no intervalo selecionado
-        if date_range_sales:
-            start_datetime_sales, end_datetime_sales = date_range_sales
-            sales_df = sales_df[(sales_df['date'] >= start_datetime_sales) & (sales_df['date'] <= end_datetime_sales)]
-    else:
-        st.warning("A coluna 'date' não está presente nos dados de vendas.")
+        employee_future = executor.submit(copy_context().run, fetch_data, api_urls["employees"])
+        bounds_future = executor.submit(copy_context().run, fetch_date_bounds, api_urls["sales"])
+    employee_df = pd.DataFrame(future_result(employee_future))
+    date_bounds = future_result(bounds_future)
+
+    if not date_bounds:
+        st.warning("Sem dados de vendas disponíveis.")
+        conn.close()
+        return
+
+    min_date_sales, max_date_sales = date_bounds
+
+    # Seletor de intervalo de datas para vendas usando slider
+    st.header("Filtro de Data para Vendas")
+    date_range_sales = st.slider(
+        "Selecione o intervalo de datas para vendas:",
+        min_value=min_date_sales,
+        max_value=max_date_sales,
+        value=(min_date_sales, max_date_sales),
+        format="DD/MM/YYYY"
+    )
+
+    # O filtro e as agregações são feitos no backend: cada gráfico recebe só as linhas já agrupadas
+    start_datetime_sales, end_datetime_sales = date_range_sales
+    date_range = {"date_from": start_datetime_sales.isoformat(), "date_to": end_datetime_sales.isoformat()}
+    aggregates_url = api_urls["sales_aggregates"]
+    with ThreadPoolExecutor() as executor:
+        totals_future = executor.submit(copy_context().run, fetch_aggregates, aggregates_url, {
+            **date_range, "metrics": ["sum_price", "sum_quantity", "count", "count_distinct_product"],
+        })
+        by_date_future = executor.submit(copy_context().run, fetch_aggregates, aggregates_url, {
+            **date_range, "group_by": "day", "metrics": "sum_price",
+        }, "date")
+        by_product_future = executor.submit(copy_context().run, fetch_aggregates, aggregates_url, {
+            **date_range, "group_by": "name_product", "metrics": "sum_price",
+        }, "name_product")
+        top_sellers_future = executor.submit(copy_context().run, fetch_aggregates, aggregates_url, {
+            **date_range, "group_by": "email_employee", "metrics": "sum_price", "top": 10,
+        }, "email_employee")
+
+    sales_totals = future_result(totals_future)
+    sales_by_date = future_result(by_date_future)
+    if 'date' in sales_by_date.columns:
+        sales_by_date['date'] = pd.to_datetime(sales_by_date['date'], utc=True).dt.tz_localize(None)
 
     # Exibir métricas e gráficos
-    display_metrics(sales_df, employee_df)
-    display_charts(sales_df, employee_df)
+    display_metrics(
+        sales_totals.iloc[0].to_dict() if not sales_totals.empty else {},
+        employee_df,
+    )
+    display_charts(sales_by_date, future_result(by_product_future), future_result(top_sellers_future), employee_df)
 
     # Fechar a conexão DuckDB
     conn.close()
@@ -5,16 +5,15 @@ from datetime import datetime, time, date
 import os
 from dotenv import load_dotenv
 
-from utils import show_response_message
+from utils import show_response_message, get_all_pages
 
 # Carrega o arquivo .env usando um caminho relativo
 load_dotenv(os.path.join(os.path.dirname(__file__), '..', '.env'))
 
 def read_all():
     if st.button("Exibir Todos os Funcionários"):
-        response = requests.get(f"{os.getenv('BACKEND_URL')}/employees/")
+        response, employees = get_all_pages(f"{os.getenv('BACKEND_URL')}/employees/")
         if response.status_code == 200:
-            employees = response.json()
             # Verifica se o JSON está vazio
             if not employees:
                 st.warning("⚠️ Nenhum Funcionário encontrado!")
@@ -5,7 +5,7 @@ from datetime import datetime, time, date
 import os
 from dotenv import load_dotenv
 
-from utils import show_response_message
+from utils import show_response_message, get_all_pages
 
 # Carrega o arquivo .env usando um caminho relativo
 load_dotenv(os.path.join(os.path.dirname(__file__), '..', '.env'))
@@ -34,10 +34,9 @@ def read_employee():
             st.warning("Digite uma valor para ser pesquisado!")
         else:
             if not input_disabled and search_field:
-                response = requests.get(f"{os.getenv('BACKEND_URL')}/employees/")
+                response, employee = get_all_pages(f"{os.getenv('BACKEND_URL')}/employees/")
 
                 if response.status_code == 200:
-                    employee = response.json()
                     # Verifica se o JSON está vazio
                     if not employee:
                         st.warning("⚠️ Nenhum Funcionário encontrado!")
@@ -5,16 +5,15 @@ from datetime import datetime, time, date
 import os
 from dotenv import load_dotenv
 
-from utils import show_response_message
+from utils import show_response_message, get_all_pages
 
 # Carrega o arquivo .env usando um caminho relativo
 load_dotenv(os.path.join(os.path.dirname(__file__), '..', '.env'))
 
 def create():
     # Buscar a lista de fornecedores
-    response_suppliers = requests.get(f"{os.getenv('BACKEND_URL')}/suppliers/")
+    response_suppliers, suppliers = get_all_pages(f"{os.getenv('BACKEND_URL')}/suppliers/", params={"fields": "email"})
     if response_suppliers.status_code == 200:
-        suppliers = response_suppliers.json()
         # Extrair os emails dos fornecedores
         supplier_emails = [supplier['email'] for supplier in suppliers]
         # Inserir "Selecione o Email do Fornecedor" no início da lista
@@ -4,16 +4,15 @@ import requests
 from datetime import datetime, time, date
 import os
 from dotenv import load_dotenv
-from utils import show_response_message
+from utils import show_response_message, get_all_pages
 
 # Carrega o arquivo .env usando um caminho relativo
 load_dotenv(os.path.join(os.path.dirname(__file__), '..', '.env'))
 
 def read_all():
     if st.button("Exibir Todos os Produtos"):
-        response = requests.get(f"{os.getenv('BACKEND_URL')}/products/")
+        response, product = get_all_pages(f"{os.getenv('BACKEND_URL')}/products/")
         if response.status_code == 200:
-            product = response.json()
 
             # Verifica se o JSON está vazio
             if not product:
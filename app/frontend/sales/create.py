@@ -5,15 +5,16 @@ from datetime import datetime, time, date
 import os
 from dotenv import load_dotenv
 
-from utils import show_response_message
+from utils import show_response_message, get_all_pages
+from tracing import traced
 # Carrega o arquivo .env usando um caminho relativo
 load_dotenv(os.path.join(os.path.dirname(__file__), '..', '.env'))
 
+@traced("sales.create")
 def create():
     # Buscar a lista de funcionários
-    response_employees = requests.get(f"{os.getenv('BACKEND_URL')}/employees/")
+    response_employees, employees = get_all_pages(f"{os.getenv('BACKEND_URL')}/employees/", params={"fields": "email"})
     if response_employees.status_code == 200:
-        employees = response_employees.json()
         # Extrair os emails dos funcionários
         emails = [employee['email'] for employee in employees]
         # Inserir "Selecione o Email" no início da lista
@@ -23,9 +24,8 @@ def create():
         emails = ["Selecione o Email"]
 
     # Buscar a lista de produtos
-    response_products = requests.get(f"{os.getenv('BACKEND_URL')}/products/")
+    response_products, products = get_all_pages(f"{os.getenv('BACKEND_URL')}/products/", params={"fields": "name"})
     if response_products.status_code == 200:
-        products = response_products.json()
         # Extrair os nomes dos produtos
         product_names = [product['name'] for product in products]
         # Inserir "Selecione o Produto" no início da lista
@@ -5,6 +5,8 @@ import os
 from dotenv import load_dotenv
 from datetime import datetime, timezone
 
+from utils import get_all_pages
+
 # Carrega o arquivo .env usando um caminho relativo
 load_dotenv(os.path.join(os.path.dirname(__file__), '..', '.env'))
 
@@ -52,18 +54,16 @@ def update():
             st.session_state['id_sales_upd'] = update_id
 
     # Buscar emails dos vendedores
-    response_employees = requests.get(f"{os.getenv('BACKEND_URL')}/employees/")
+    response_employees, employees = get_all_pages(f"{os.getenv('BACKEND_URL')}/employees/", params={"fields": "email"})
     if response_employees.status_code == 200:
-        employees = response_employees.json()
         emails = [employee['email'] for employee in employees]
     else:
         emails = []
         st.warning("Não foi possível buscar os emails dos vendedores.")
 
     # Buscar nomes dos produtos
-    response_products = requests.get(f"{os.getenv('BACKEND_URL')}/products/")
+    response_products, products = get_all_pages(f"{os.getenv('BACKEND_URL')}/products/", params={"fields": "name"})
     if response_products.status_code == 200:
-        products = response_products.json()
         product_names = [product['name'] for product in products]
     else:
         product_names = []
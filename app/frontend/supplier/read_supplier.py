@@ -4,7 +4,7 @@ import requests
 from datetime import datetime, time, date
 import os
 from dotenv import load_dotenv
-from utils import show_response_message
+from utils import show_response_message, get_all_pages
 
 # Carrega o arquivo .env usando um caminho relativo
 load_dotenv(os.path.join(os.path.dirname(__file__), '..', '.env'))
@@ -33,10 +33,9 @@ def read_supplier():
             st.warning("Digite uma valor para ser pesquisado!")
         else:
             if not input_disabled and search_field:
-                response = requests.get(f"{os.getenv('BACKEND_URL')}/suppliers/")
+                response, supplier = get_all_pages(f"{os.getenv('BACKEND_URL')}/suppliers/")
 
                 if response.status_code == 200:
-                    supplier = response.json()
                     # Verifica se o JSON está vazio
                     if not supplier:
                         st.warning("⚠️ Nenhum Fornecedor encontrado!")
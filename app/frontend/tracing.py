@@ -0,0 +1,69 @@
+# tracing.py
+import os
+from contextlib import nullcontext
+from functools import wraps
+import streamlit as st
+from dotenv import load_dotenv
+
+# Carrega o arquivo .env usando um caminho relativo
+load_dotenv(os.path.join(os.path.dirname(__file__), '.env'))
+
+# none (padrão), console, file (um span por linha em OTEL_TRACES_FILE) ou otlp (OTEL_EXPORTER_OTLP_ENDPOINT).
+# A amostragem segue OTEL_TRACES_SAMPLER e OTEL_TRACES_SAMPLER_ARG, e o backend segue a decisão do frontend
+OTEL_TRACES_EXPORTER = os.getenv("OTEL_TRACES_EXPORTER", "none").strip().lower()
+OTEL_TRACES_FILE = os.getenv("OTEL_TRACES_FILE", "traces.jsonl")
+SERVICE_NAME = "liftoff-frontend"
+
+
+def _span_exporter():
+    if OTEL_TRACES_EXPORTER == "console":
+        from opentelemetry.sdk.trace.export import ConsoleSpanExporter
+        return ConsoleSpanExporter()
+    if OTEL_TRACES_EXPORTER == "file":
+        from opentelemetry.sdk.trace.export import ConsoleSpanExporter
+        return ConsoleSpanExporter(
+            out=open(OTEL_TRACES_FILE, "a", encoding="utf-8"),
+            formatter=lambda span: span.to_json(indent=None) + os.linesep,
+        )
+    if OTEL_TRACES_EXPORTER == "otlp":
+        from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
+        return OTLPSpanExporter()
+    raise ValueError(f"OTEL_TRACES_EXPORTER inválido: {OTEL_TRACES_EXPORTER} (use none, console, file ou otlp)")
+
+
+# Configura o OpenTelemetry uma vez por processo (o Streamlit executa os scripts de novo a cada interação).
+# As chamadas feitas com requests viram spans e levam o header traceparent até o backend
+@st.cache_resource
+def setup_tracing():
+    if OTEL_TRACES_EXPORTER == "none":
+        return None
+    from opentelemetry import trace
+    from opentelemetry.instrumentation.requests import RequestsInstrumentor
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor
+
+    provider = TracerProvider(resource=Resource.create({"service.name": SERVICE_NAME}))
+    provider.add_span_processor(BatchSpanProcessor(_span_exporter()))
+    trace.set_tracer_provider(provider)
+    RequestsInstrumentor().instrument(tracer_provider=provider)
+    return provider
+
+
+# Span de uma tela: as requisições ao backend feitas dentro dele ficam no mesmo trace
+def page_span(name):
+    if setup_tracing() is None:
+        return nullcontext()
+    from opentelemetry import trace
+    return trace.get_tracer(__name__).start_as_current_span(name)
+
+
+# Decorador que executa a função de uma tela dentro de page_span
+def traced(name):
+    def decorator(function):
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            with page_span(name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
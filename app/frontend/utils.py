@@ -1,5 +1,10 @@
    # utils.py
 import streamlit as st
+import requests
+
+# Tamanho de página pedido ao backend ao percorrer uma listagem inteira
+PAGE_SIZE = 1000
+
 
 def show_response_message(response):
        if response.status_code == 200:
@@ -14,4 +19,47 @@ def show_response_message(response):
                    else:
                        st.error(f"Erro: {data['detail']}")
            except ValueError:
-               st.error("Erro desconhecido. Não foi possível decodificar a resposta.")
\ No newline at end of file
+               st.error("Erro desconhecido. Não foi possível decodificar a resposta.")
+
+
+# Última resposta 200 de cada GET (url, parâmetros e Accept), reaproveitada quando o backend responde 304
+_etag_responses = {}
+
+
+def conditional_get(url, params=None, headers=None):
+    """
+    Faz um GET enviando o ETag da última resposta no If-None-Match. Se o backend responder
+    304 Not Modified, devolve a resposta guardada, sem baixar os dados de novo.
+    """
+    headers = dict(headers or {})
+    query = tuple(sorted((name, tuple(value) if isinstance(value, list) else value) for name, value in (params or {}).items()))
+    key = (url, query, headers.get("Accept"))
+    cached = _etag_responses.get(key)
+    if cached is not None:
+        headers["If-None-Match"] = cached.headers["ETag"]
+    response = requests.get(url, params=params, headers=headers)
+    if response.status_code == 304 and cached is not None:
+        return cached
+    if response.status_code == 200 and "ETag" in response.headers:
+        _etag_responses[key] = response
+    return response
+
+
+def get_all_pages(url, params=None):
+    """
+    Percorre todas as páginas de uma rota de listagem seguindo o header X-Next-Cursor.
+
+    Retorna uma tupla (response, itens), onde response é a última resposta recebida,
+    usada para checar o status_code e exibir mensagens de erro.
+    """
+    params = dict(params or {}, limit=PAGE_SIZE)
+    items = []
+    while True:
+        response = conditional_get(url, params=params)
+        if response.status_code != 200:
+            return response, items
+        items.extend(response.json())
+        next_cursor = response.headers.get("X-Next-Cursor")
+        if not next_cursor:
+            return response, items
+        params["after"] = next_cursor
@@ -0,0 +1,304 @@
+import json
+import os
+import sys
+from datetime import datetime, timezone
+from typing import List
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+# As rotas usam os imports do backend (database.*, models.*), relativos a app/backend.
+# Importá-los cria o motor do banco, sem conectar; a porta só precisa ser um número
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "app", "backend"))
+os.environ.setdefault("DB_PORT_PROD", "5432")
+
+import routes.formats as formats_module
+from crud.base import bulk_delete, bulk_update, settable_values
+from crud.sales.crud import create_sales_bulk
+from database.database import Base, get_db
+from models.employee.employee import EmployeeModel
+from models.product.product import ProductModel
+from models.sales.sales import SalesModel
+from models.sales.sales_schema import SalesCreate
+from models.supplier.supplier import SupplierModel  # noqa: F401 (alvo da chave estrangeira de products)
+from routes.formats import NDJSON_MEDIA_TYPE, read_bulk_body, validate_bulk_rows
+from routes.sales.routes_sales import router as sales_router
+from routes.supplier.routes_supplier import router as supplier_router
+
+
+def venda(**campos):
+    dados = {
+        "email_employee": "vendedor@empresa.com", "email_customer": "cliente@email.com",
+        "first_name": "Ana", "last_name": "Souza", "phone_number": "1199999",
+        "date": "2024-05-01T10:00:00", "price": 99.9, "quantity": 2, "name_product": "ZapFlow com Gemini",
+    }
+    dados.update(campos)
+    return dados
+
+
+def criar_cliente():
+    app = FastAPI()
+
+    @app.post("/bulk")
+    def receber(rows: List[dict] = Depends(read_bulk_body)):
+        return {"linhas": rows}
+
+    return TestClient(app)
+
+
+def test_le_array_json():
+    resposta = criar_cliente().post("/bulk", content=json.dumps([venda(), venda(quantity=3)]))
+    assert resposta.status_code == 200
+    assert [linha["quantity"] for linha in resposta.json()["linhas"]] == [2, 3]
+
+
+def test_le_ndjson_ignorando_linhas_vazias():
+    corpo = "\n".join([json.dumps(venda()), "", "   ", json.dumps(venda(quantity=5)), ""])
+    resposta = criar_cliente().post("/bulk", content=corpo, headers={"content-type": f"{NDJSON_MEDIA_TYPE}; charset=utf-8"})
+    assert resposta.status_code == 200
+    assert [linha["quantity"] for linha in resposta.json()["linhas"]] == [2, 5]
+
+
+def test_corpo_invalido_retorna_400():
+    cliente = criar_cliente()
+    assert cliente.post("/bulk", content="[{").status_code == 400
+    ndjson = json.dumps(venda()) + "\n{quebrado"
+    assert cliente.post("/bulk", content=ndjson, headers={"content-type": NDJSON_MEDIA_TYPE}).status_code == 400
+
+
+def test_corpo_que_nao_e_lista_retorna_400():
+    resposta = criar_cliente().post("/bulk", content=json.dumps(venda()))
+    assert resposta.status_code == 400
+    assert resposta.json()["detail"] == "O corpo deve ser uma lista de objetos"
+
+
+def test_limite_de_linhas(monkeypatch):
+    monkeypatch.setattr(formats_module, "MAX_BULK_ROWS", 3)
+    cliente = criar_cliente()
+    assert cliente.post("/bulk", content=json.dumps([venda()] * 3)).status_code == 200
+    assert cliente.post("/bulk", content=json.dumps([venda()] * 4)).status_code == 413
+    ndjson = "\n".join(json.dumps(venda()) for _ in range(4))
+    assert cliente.post("/bulk", content=ndjson, headers={"content-type": NDJSON_MEDIA_TYPE}).status_code == 413
+
+
+def test_validate_bulk_rows_separa_erros_por_linha():
+    linhas = [venda(), venda(price=-1), venda(email_customer="invalido", quantity=0), venda(quantity=7), "texto"]
+    validas, erros = validate_bulk_rows(linhas, SalesCreate)
+
+    assert [venda_valida.quantity for venda_valida in validas] == [2, 7]
+    assert all(isinstance(venda_valida, SalesCreate) for venda_valida in validas)
+    assert [erro["index"] for erro in erros] == [1, 2, 4]
+    assert [item["loc"] for item in erros[0]["errors"]] == [["price"]]
+    assert sorted(item["loc"][0] for item in erros[1]["errors"]) == ["email_customer", "quantity"]
+    assert all("url" not in item for erro in erros for item in erro["errors"])
+    # Os erros precisam ser serializáveis como JSON na resposta (BulkRowError)
+    json.dumps(erros)
+
+
+def test_validate_bulk_rows_sem_linhas():
+    assert validate_bulk_rows([], SalesCreate) == ([], [])
+
+
+@pytest.fixture
+def banco():
+    """
+    Banco SQLite em memória com as tabelas dos modelos e 10 vendas, metade de cada vendedor.
+    Guarda os comandos executados em banco.comandos.
+    """
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    Sessao = sessionmaker(bind=engine)
+    with Sessao() as db:
+        db.add_all(
+            SupplierModel(
+                company_name="Empresa", contact_name="Contato", email=f"fornecedor{i}@empresa.com",
+                phone_number="1", website="empresa.com", address="Rua", product_categories="Categoria 1",
+                primary_product="Produto",
+            )
+            for i in (1, 2)
+        )
+        db.add_all(
+            SalesModel(
+                email_employee="ana@empresa.com" if i % 2 else "bia@empresa.com", email_customer="c@email.com",
+                first_name="C", last_name="D", phone_number="1", price=10.0 * i, quantity=i,
+                name_product="ZapFlow com Gemini", date=datetime(2024, 5, i, tzinfo=timezone.utc),
+            )
+            for i in range(1, 11)
+        )
+        db.commit()
+    Sessao.comandos = []
+    event.listen(engine, "before_cursor_execute", lambda *args: Sessao.comandos.append(args[2]))
+    yield Sessao
+    engine.dispose()
+
+
+def precos(Sessao):
+    with Sessao() as db:
+        return dict(db.execute(select(SalesModel.id, SalesModel.price)).all())
+
+
+def test_bulk_update_em_um_comando(banco):
+    with banco() as db:
+        ids = bulk_update(db, SalesModel, SalesModel.id, [SalesModel.email_employee == "ana@empresa.com"], {"price": 1.0})
+    assert sorted(ids) == [1, 3, 5, 7, 9]
+    assert len([sql for sql in banco.comandos if sql.startswith("UPDATE")]) == 1
+    assert sorted(id for id, preco in precos(banco).items() if preco == 1.0) == [1, 3, 5, 7, 9]
+
+
+def test_bulk_update_em_blocos(banco):
+    with banco() as db:
+        ids = bulk_update(
+            db, SalesModel, SalesModel.id, [SalesModel.quantity > 2], {"price": 1.0}, chunk_size=3,
+        )
+    # 8 linhas em blocos de 3: 3 + 3 + 2, um UPDATE e um commit por bloco, na ordem da chave
+    assert ids == [3, 4, 5, 6, 7, 8, 9, 10]
+    assert len([sql for sql in banco.comandos if sql.startswith("UPDATE")]) == 3
+    assert all(precos(banco)[id] == 1.0 for id in ids)
+    assert precos(banco)[1] == 10.0 and precos(banco)[2] == 20.0
+
+
+def test_bulk_update_em_blocos_exatos_para_no_bloco_vazio(banco):
+    with banco() as db:
+        ids = bulk_update(db, SalesModel, SalesModel.id, [SalesModel.quantity > 4], {"price": 1.0}, chunk_size=3)
+    assert ids == [5, 6, 7, 8, 9, 10]
+    assert len([sql for sql in banco.comandos if sql.startswith("UPDATE")]) == 3
+
+
+def test_bulk_delete_em_blocos(banco):
+    with banco() as db:
+        ids = bulk_delete(db, SalesModel, SalesModel.id, [SalesModel.email_employee == "bia@empresa.com"], chunk_size=2)
+    assert ids == [2, 4, 6, 8, 10]
+    assert sorted(precos(banco)) == [1, 3, 5, 7, 9]
+
+
+def test_bulk_delete_sem_linhas(banco):
+    with banco() as db:
+        assert bulk_delete(db, SalesModel, SalesModel.id, [SalesModel.quantity > 100], chunk_size=2) == []
+    assert len(precos(banco)) == 10
+
+
+def cliente_vendas(Sessao):
+    app = FastAPI()
+    app.include_router(sales_router)
+    app.include_router(supplier_router)
+
+    def sessao():
+        with Sessao() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = sessao
+    return TestClient(app)
+
+
+def test_rotas_em_lote_exigem_filtro(banco):
+    cliente = cliente_vendas(banco)
+    for resposta in [
+        cliente.patch("/sales/", json={"price": 1.0}),
+        cliente.patch("/sales/", params={"dry_run": True, "chunk_size": 2}, json={"price": 1.0}),
+        cliente.delete("/sales/"),
+        cliente.delete("/sales/", params={"dry_run": True}),
+    ]:
+        assert resposta.status_code == 400
+        assert resposta.json()["detail"] == "Informe ao menos um filtro"
+    assert len(precos(banco)) == 10
+
+
+def test_patch_sem_campos_retorna_400(banco):
+    resposta = cliente_vendas(banco).patch("/sales/", params={"ids": [1]}, json={})
+    assert resposta.status_code == 400
+
+
+def test_dry_run_so_conta(banco):
+    cliente = cliente_vendas(banco)
+    filtro = {"email_employee": "ana@empresa.com", "dry_run": True}
+
+    resposta = cliente.patch("/sales/", params=filtro, json={"price": 1.0})
+    assert resposta.json() == {"matched": 5, "ids": [], "dry_run": True}
+    resposta = cliente.delete("/sales/", params=filtro)
+    assert resposta.json() == {"matched": 5, "ids": [], "dry_run": True}
+
+    assert not [sql for sql in banco.comandos if sql.startswith(("UPDATE", "DELETE"))]
+    assert precos(banco)[1] == 10.0 and len(precos(banco)) == 10
+
+
+def test_rotas_em_lote_com_chunk_size(banco):
+    cliente = cliente_vendas(banco)
+    resposta = cliente.patch("/sales/", params={"ids": [1, 2, 3, 4, 5], "chunk_size": 2}, json={"price": 1.0})
+    assert resposta.json() == {"matched": 5, "ids": [1, 2, 3, 4, 5], "dry_run": False}
+    resposta = cliente.delete("/sales/", params={"email_employee": "bia@empresa.com", "chunk_size": 4})
+    assert resposta.json() == {"matched": 5, "ids": [2, 4, 6, 8, 10], "dry_run": False}
+    assert precos(banco) == {1: 1.0, 3: 1.0, 5: 1.0, 7: 70.0, 9: 90.0}
+
+
+def test_settable_values_ignora_null_em_coluna_not_null():
+    valores = {"date": None, "price": None, "name_product": "X"}
+    assert settable_values(SalesModel, valores) == {"price": None, "name_product": "X"}
+    assert settable_values(SalesModel, {"date": None}) == {}
+
+
+def test_null_em_coluna_not_null_nao_altera_a_venda(banco):
+    cliente = cliente_vendas(banco)
+    antes = cliente.get("/sales/3").json()
+
+    resposta = cliente.put("/sales/3", json={"date": None, "price": 5.0})
+    assert resposta.status_code == 200
+    assert resposta.json()["date"] == antes["date"]
+    assert resposta.json()["price"] == 5.0
+
+    resposta = cliente.patch("/sales/3", json={"date": None})
+    assert resposta.status_code == 200
+    assert resposta.json()["date"] == antes["date"]
+
+
+def test_null_em_coluna_not_null_na_atualizacao_em_lote(banco):
+    cliente = cliente_vendas(banco)
+    resposta = cliente.patch("/sales/", params={"ids": [1, 2]}, json={"date": None})
+    assert resposta.json() == {"matched": 2, "ids": [1, 2], "dry_run": False}
+    resposta = cliente.patch("/sales/", params={"ids": [1, 2]}, json={"date": None, "quantity": 9})
+    assert resposta.json() == {"matched": 2, "ids": [1, 2], "dry_run": False}
+    with banco() as db:
+        assert db.scalars(select(SalesModel.date).where(SalesModel.id == 1)).one() is not None
+        assert db.scalars(select(SalesModel.quantity).where(SalesModel.id == 1)).one() == 9
+
+
+def test_atualizacao_recusada_pelo_banco_retorna_409(banco):
+    cliente = cliente_vendas(banco)
+
+    resposta = cliente.put("/suppliers/2", json={"email": "fornecedor1@empresa.com"})
+    assert resposta.status_code == 409
+    resposta = cliente.patch("/suppliers/", params={"ids": [1, 2]}, json={"email": "mesmo@empresa.com"})
+    assert resposta.status_code == 409
+
+    # A sessão volta a funcionar depois do rollback
+    assert cliente.put("/suppliers/2", json={"email": "novo@empresa.com"}).json()["email"] == "novo@empresa.com"
+
+
+def test_insercao_em_lote_preenche_os_ids_com_um_select_por_tabela(banco):
+    with banco() as db:
+        db.add_all([EmployeeModel(email="ana@empresa.com"), EmployeeModel(email="bia@empresa.com")])
+        db.add_all([ProductModel(name="ZapFlow com Gemini"), ProductModel(name="ZapFlow com Gemini"), ProductModel(name="Outro")])
+        db.commit()
+        funcionarios = dict(db.execute(select(EmployeeModel.email, EmployeeModel.employee_id)).all())
+    banco.comandos.clear()
+
+    vendas = [
+        SalesCreate(**venda(email_employee="bia@empresa.com")),
+        SalesCreate(**venda(email_employee="ana@empresa.com", name_product="Outro")),
+        SalesCreate(**venda(email_employee="novo@empresa.com", name_product="Sem cadastro")),
+        SalesCreate(**venda(email_employee="bia@empresa.com")),
+    ]
+    with banco() as db:
+        ids = create_sales_bulk(db, vendas)
+        linhas = db.execute(
+            select(SalesModel.employee_id, SalesModel.product_id).where(SalesModel.id.in_(ids)).order_by(SalesModel.id)
+        ).all()
+
+    assert linhas == [
+        (funcionarios["bia@empresa.com"], 1), (funcionarios["ana@empresa.com"], 3), (None, None),
+        (funcionarios["bia@empresa.com"], 1),
+    ]
+    selects = [comando for comando in banco.comandos if comando.lstrip().upper().startswith("SELECT")]
+    assert len(selects) == 3  # funcionários, produtos e a conferência acima
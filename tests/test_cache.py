@@ -0,0 +1,94 @@
+import os
+import sys
+from types import SimpleNamespace
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+# O middleware usa os imports do backend (database.*, routes.*), relativos a app/backend.
+# Importá-los cria o motor do banco, sem conectar; a porta só precisa ser um número
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "app", "backend"))
+os.environ.setdefault("DB_PORT_PROD", "5432")
+
+import middleware.cache as cache_module
+from middleware.cache import ResponseCache, ResponseCacheMiddleware
+
+
+def test_cache_remove_o_menos_usado():
+    cache = ResponseCache(ttl=60, max_entries=2)
+    cache.set("a", "sales", 0, "A")
+    cache.set("b", "sales", 0, "B")
+    assert cache.get("a") == "A"
+    cache.set("c", "sales", 0, "C")
+    assert cache.get("b") is None
+    assert cache.get("a") == "A"
+    assert cache.get("c") == "C"
+    assert cache.stats()["evictions"] == 1
+
+
+def test_cache_expira_pelo_ttl(monkeypatch):
+    relogio = [100.0]
+    monkeypatch.setattr(cache_module, "time", SimpleNamespace(monotonic=lambda: relogio[0]))
+    cache = ResponseCache(ttl=30, max_entries=10)
+    cache.set("a", "sales", 0, "A")
+    relogio[0] += 29
+    assert cache.get("a") == "A"
+    relogio[0] += 2
+    assert cache.get("a") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_cache_descarta_resposta_lida_antes_de_uma_escrita():
+    cache = ResponseCache(ttl=60, max_entries=10)
+    geracao = cache.generation("sales")
+    cache.invalidate("sales")
+    cache.set("a", "sales", geracao, "A")
+    assert cache.get("a") is None
+    cache.set("a", "sales", cache.generation("sales"), "A")
+    assert cache.get("a") == "A"
+
+
+def test_invalidate_remove_so_a_tabela():
+    cache = ResponseCache(ttl=60, max_entries=10)
+    cache.set("vendas", "sales", 0, "V")
+    cache.set("produtos", "products", 0, "P")
+    cache.invalidate("sales")
+    assert cache.get("vendas") is None
+    assert cache.get("produtos") == "P"
+
+
+def criar_app(cache):
+    app = FastAPI()
+    estado = {"leituras": 0}
+
+    @app.get("/sales/")
+    def listar():
+        estado["leituras"] += 1
+        return {"leituras": estado["leituras"]}
+
+    @app.post("/sales/")
+    def criar(falhar: bool = False):
+        if falhar:
+            raise HTTPException(status_code=400, detail="inválido")
+        return {}
+
+    app.add_middleware(ResponseCacheMiddleware, cache=cache)
+    return app
+
+
+def test_middleware_guarda_get_e_invalida_na_escrita():
+    cliente = TestClient(criar_app(ResponseCache(ttl=60, max_entries=10)))
+
+    primeira = cliente.get("/sales/")
+    segunda = cliente.get("/sales/")
+    assert primeira.headers["x-cache"] == "MISS"
+    assert segunda.headers["x-cache"] == "HIT"
+    assert segunda.json() == {"leituras": 1}
+
+    # Escrita com erro não invalida
+    assert cliente.post("/sales/", params={"falhar": True}).status_code == 400
+    assert cliente.get("/sales/").headers["x-cache"] == "HIT"
+
+    assert cliente.post("/sales/").status_code == 200
+    depois = cliente.get("/sales/")
+    assert depois.headers["x-cache"] == "MISS"
+    assert depois.json() == {"leituras": 2}
@@ -33,7 +33,9 @@ def test_read_data_and_check_schema_sales():
         'quantity': 'int64',
         'name_product': 'object',
         'date': 'datetime64[ns, UTC]',
-        'created_at': 'datetime64[ns, UTC]'
+        'created_at': 'datetime64[ns, UTC]',
+        'employee_id': 'float64',
+        'product_id': 'float64'
     }
 
     # Verificar o schema
@@ -92,7 +94,8 @@ def test_read_data_and_check_schema_products():
         'price': 'float64',
         'categoria': 'object',
         'email_fornecedor': 'object',
-        'created_at': 'datetime64[ns, UTC]'
+        'created_at': 'datetime64[ns, UTC]',
+        'supplier_id': 'float64'
     }
 
     print("Schema do DataFrame:", df.dtypes.to_dict())
@@ -0,0 +1,221 @@
+import io
+import os
+import sys
+from datetime import date, datetime, timezone
+import orjson
+import pyarrow as pa
+import pyarrow.parquet as pq
+from fastapi import FastAPI, Request as FastAPIRequest
+from fastapi.testclient import TestClient
+from starlette.requests import Request
+
+# As rotas usam os imports do backend (database.*, models.*), relativos a app/backend.
+# Importá-los cria o motor do banco, sem conectar; a porta só precisa ser um número
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "app", "backend"))
+os.environ.setdefault("DB_PORT_PROD", "5432")
+
+from models.employee.employee import EmployeeModel
+from models.employee.employee_schema import EmployeeResponse
+from models.product.product import ProductModel
+from models.product.product_schema import ProductResponse
+from models.supplier.supplier import SupplierModel  # noqa: F401 (alvo da chave estrangeira de products)
+import routes.formats as formats_module
+from routes.formats import (
+    ARROW_MEDIA_TYPE, JSON_MEDIA_TYPE, NDJSON_MEDIA_TYPE, PARQUET_MEDIA_TYPE,
+    arrow_schema, json_row_response, json_rows_response, negotiate, row_serializer, streaming_response,
+)
+
+
+def pedido(accept=None):
+    headers = [(b"accept", accept.encode())] if accept is not None else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+def funcionario(**campos):
+    dados = dict(
+        employee_id=1, manager_id=None, first_name="Ana", last_name="Souza", email="ana@empresa.com",
+        phone_number="1199999", hire_date=date(2020, 1, 15), department_id=3, job_title="Analista",
+        location="SP", birth_date=date(1990, 5, 2), gender="Feminino", nationality="Brasileira",
+        start_date=date(2020, 2, 1), salary=5500.5, termination_date=date(2023, 3, 20),
+    )
+    dados.update(campos)
+    return EmployeeModel(**dados)
+
+
+def produto(**campos):
+    dados = dict(
+        id=7, name="Geladeira", description=None, price=3200.0, categoria="Eletrodoméstico",
+        email_fornecedor="vendas@fornecedor.com", supplier_id=2,
+        created_at=datetime(2024, 6, 1, 12, 30, tzinfo=timezone.utc),
+    )
+    dados.update(campos)
+    return ProductModel(**dados)
+
+
+def test_negotiate_sem_accept_retorna_json():
+    assert negotiate(pedido()) == JSON_MEDIA_TYPE
+    assert negotiate(pedido("*/*")) == JSON_MEDIA_TYPE
+    assert negotiate(pedido("text/html, application/xml")) == JSON_MEDIA_TYPE
+
+
+def test_negotiate_escolhe_o_maior_q():
+    accept = f"{NDJSON_MEDIA_TYPE};q=0.5, {ARROW_MEDIA_TYPE};q=0.9, {JSON_MEDIA_TYPE};q=0.1"
+    assert negotiate(pedido(accept)) == ARROW_MEDIA_TYPE
+
+
+def test_negotiate_desempata_pela_ordem_do_header():
+    assert negotiate(pedido(f"{PARQUET_MEDIA_TYPE}, {NDJSON_MEDIA_TYPE}")) == PARQUET_MEDIA_TYPE
+    assert negotiate(pedido(f"text/html, {NDJSON_MEDIA_TYPE}, {ARROW_MEDIA_TYPE}")) == NDJSON_MEDIA_TYPE
+
+
+def test_negotiate_ignora_q_zero_e_q_invalido():
+    assert negotiate(pedido(f"{ARROW_MEDIA_TYPE};q=0, {NDJSON_MEDIA_TYPE};q=0.2")) == NDJSON_MEDIA_TYPE
+    assert negotiate(pedido(f"{ARROW_MEDIA_TYPE};q=abc")) == JSON_MEDIA_TYPE
+
+
+def test_row_serializer_inclui_computed_field():
+    dados = row_serializer(EmployeeResponse)(funcionario())
+    assert list(dados) == list(EmployeeResponse.model_fields) + ["service_duration"]
+    assert dados["service_duration"] == "3 anos, 2 meses e 5 dias"
+
+
+def test_row_serializer_com_um_campo():
+    assert row_serializer(ProductResponse, ("id",))(produto()) == {"id": 7}
+
+
+def test_json_rows_response_igual_ao_pydantic():
+    linhas = [funcionario(), funcionario(employee_id=2, email="bia@empresa.com", termination_date=None)]
+    resposta = json_rows_response(linhas, EmployeeResponse, next_cursor="abc")
+    esperado = [EmployeeResponse.model_validate(linha).model_dump(mode="json") for linha in linhas]
+    assert orjson.loads(resposta.body) == esperado
+    assert resposta.headers["x-next-cursor"] == "abc"
+    assert resposta.media_type == JSON_MEDIA_TYPE
+
+
+def test_json_rows_response_com_fields_igual_ao_pydantic():
+    for schema, linha, campos in [
+        (ProductResponse, produto(), ("id", "price", "created_at")),
+        (ProductResponse, produto(), ("description", "supplier_id")),
+        (EmployeeResponse, funcionario(), ("email", "hire_date", "service_duration")),
+    ]:
+        resposta = json_rows_response([linha], schema, fields=campos)
+        esperado = schema.model_validate(linha).model_dump(mode="json", include=set(campos))
+        assert orjson.loads(resposta.body) == [esperado]
+        assert list(orjson.loads(resposta.body)[0]) == list(esperado)
+        assert "x-next-cursor" not in resposta.headers
+
+
+def test_json_row_response_igual_ao_pydantic():
+    linha = produto()
+    resposta = json_row_response(linha, ProductResponse)
+    assert resposta.body == ProductResponse.model_validate(linha).model_dump_json().encode()
+
+
+class SessaoFalsa:
+    def __init__(self):
+        self.fechada = False
+
+    def close(self):
+        self.fechada = True
+
+
+def produtos_em_blocos():
+    categorias = ["Eletrônico", "Móveis", None, "Eletrônico", "Roupas"]
+    return [
+        [produto(id=1, categoria=categorias[0]), produto(id=2, categoria=categorias[1], price=None)],
+        [produto(id=3, categoria=categorias[2], description="Sem categoria")],
+        [produto(id=4, categoria=categorias[3]), produto(id=5, categoria=categorias[4])],
+    ]
+
+
+def baixar(monkeypatch, accept, fields=None, blocos=None):
+    """
+    Chama uma rota que responde com streaming_response sobre os blocos informados.
+    Retorna a resposta, os parâmetros recebidos pela função de streaming e a sessão usada.
+    """
+    sessao, recebidos = SessaoFalsa(), {}
+    monkeypatch.setattr(formats_module, "routed_session", lambda: sessao)
+    blocos = produtos_em_blocos() if blocos is None else blocos
+
+    def stream(db, **kwargs):
+        assert db is sessao
+        recebidos.update(kwargs)
+        yield from blocos
+
+    app = FastAPI()
+
+    @app.get("/products/")
+    def listar(request: FastAPIRequest):
+        return streaming_response(negotiate(request), stream, ProductModel, ProductResponse, fields, limite=10)
+
+    resposta = TestClient(app).get("/products/", headers={"accept": accept})
+    return resposta, recebidos, sessao
+
+
+def test_ndjson_envia_uma_linha_por_objeto(monkeypatch):
+    blocos = [[produto(id=1), produto(id=2, categoria="Móveis")], [produto(id=3, description="Duas portas")]]
+    resposta, recebidos, sessao = baixar(monkeypatch, NDJSON_MEDIA_TYPE, blocos=blocos)
+    assert resposta.headers["content-type"] == NDJSON_MEDIA_TYPE
+    linhas = [orjson.loads(linha) for linha in resposta.content.splitlines()]
+    esperado = [ProductResponse.model_validate(linha).model_dump(mode="json") for bloco in blocos for linha in bloco]
+    assert linhas == esperado
+    assert recebidos == {"fields": None, "limite": 10}
+    assert sessao.fechada
+
+
+def test_ndjson_com_fields(monkeypatch):
+    resposta, recebidos, _ = baixar(monkeypatch, NDJSON_MEDIA_TYPE, fields=("id", "categoria"))
+    linhas = [orjson.loads(linha) for linha in resposta.content.splitlines()]
+    assert linhas[:3] == [
+        {"id": 1, "categoria": "Eletrônico"}, {"id": 2, "categoria": "Móveis"}, {"id": 3, "categoria": None},
+    ]
+    assert recebidos["fields"] == ("id", "categoria")
+
+
+def test_ndjson_sem_linhas(monkeypatch):
+    resposta, _, sessao = baixar(monkeypatch, NDJSON_MEDIA_TYPE, blocos=[])
+    assert resposta.status_code == 200
+    assert resposta.content == b""
+    assert sessao.fechada
+
+
+def test_arrow_schema_usa_tipos_nativos_e_dicionario_no_enum():
+    schema = arrow_schema(ProductModel)
+    assert schema.field("id").type == pa.int64()
+    assert schema.field("price").type == pa.float64()
+    assert schema.field("created_at").type == pa.timestamp("us", tz="UTC")
+    assert schema.field("categoria").type == pa.dictionary(pa.int8(), pa.string())
+    assert arrow_schema(ProductModel, ("id", "categoria")).names == ["id", "categoria"]
+
+
+def test_arrow_stream_com_varios_blocos(monkeypatch):
+    resposta, _, sessao = baixar(monkeypatch, ARROW_MEDIA_TYPE)
+    assert resposta.headers["content-type"] == ARROW_MEDIA_TYPE
+    leitor = pa.ipc.open_stream(resposta.content)
+    assert leitor.schema == arrow_schema(ProductModel)
+    lotes = list(leitor)
+    assert [lote.num_rows for lote in lotes] == [2, 1, 2]
+
+    tabela = pa.Table.from_batches(lotes)
+    assert tabela.column("id").to_pylist() == [1, 2, 3, 4, 5]
+    assert tabela.column("price").to_pylist() == [3200.0, None, 3200.0, 3200.0, 3200.0]
+    assert tabela.column("created_at").to_pylist()[0] == datetime(2024, 6, 1, 12, 30, tzinfo=timezone.utc)
+    categorias = tabela.column("categoria")
+    assert pa.types.is_dictionary(categorias.type)
+    assert categorias.to_pylist() == ["Eletrônico", "Móveis", None, "Eletrônico", "Roupas"]
+    assert sessao.fechada
+
+
+def test_arrow_stream_sem_linhas_envia_o_schema(monkeypatch):
+    resposta, _, _ = baixar(monkeypatch, ARROW_MEDIA_TYPE, fields=("id", "categoria"), blocos=[])
+    leitor = pa.ipc.open_stream(resposta.content)
+    assert leitor.schema.names == ["id", "categoria"]
+    assert leitor.read_all().num_rows == 0
+
+
+def test_parquet_com_varios_blocos(monkeypatch):
+    resposta, _, _ = baixar(monkeypatch, PARQUET_MEDIA_TYPE, fields=("id", "categoria"))
+    assert resposta.headers["content-disposition"] == 'attachment; filename="products.parquet"'
+    tabela = pq.read_table(io.BytesIO(resposta.content))
+    assert tabela.column("id").to_pylist() == [1, 2, 3, 4, 5]
+    assert tabela.column("categoria").to_pylist() == ["Eletrônico", "Móveis", None, "Eletrônico", "Roupas"]
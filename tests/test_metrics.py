@@ -0,0 +1,29 @@
+import threading
+from app.backend.middleware.metrics import Counter, Histogram
+
+
+def test_histograma_acumula_buckets():
+    histograma = Histogram("latencia", "Latência.", ("route",), (0.1, 1.0))
+    for valor in (0.05, 0.1, 0.5, 3.0):
+        histograma.observe(("/sales/",), valor)
+    linhas = histograma.render()
+    assert 'latencia_bucket{route="/sales/",le="0.1"} 2' in linhas
+    assert 'latencia_bucket{route="/sales/",le="1.0"} 3' in linhas
+    assert 'latencia_bucket{route="/sales/",le="+Inf"} 4' in linhas
+    assert 'latencia_sum{route="/sales/"} 3.65' in linhas
+    assert 'latencia_count{route="/sales/"} 4' in linhas
+
+
+def test_contador_soma_as_threads():
+    contador = Counter("requisicoes", "Requisições.", ("method",))
+
+    def incrementa():
+        for _ in range(1000):
+            contador.inc(("GET",))
+
+    threads = [threading.Thread(target=incrementa) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert 'requisicoes{method="GET"} 4000' in contador.render()
@@ -86,7 +86,7 @@ def test_employee_com_dados_invalidos():
         "job_title": "Analista de Dados",
         "location": "São Paulo, Brasil",
         "birth_date": "não é uma data",
-        "gender": "Inexistente", # Não há validação direta, mas poderia ter
+        "gender": "Inexistente", # Gênero fora de GenderEnum
         "nationality": "Brasileira",
         "start_date": "não é uma data",
         "salary": -1000.0, # Valor negativo
@@ -0,0 +1,123 @@
+import pytest
+from datetime import datetime, timezone
+from sqlalchemy import Column, DateTime, Float, Integer, create_engine
+from sqlalchemy.orm import Session, declarative_base
+from app.backend.crud.base import (
+    InvalidCursorError,
+    decode_cursor,
+    encode_cursor,
+    list_statement,
+    paginate,
+    split_page,
+)
+
+Base = declarative_base()
+
+
+class Venda(Base):
+    __tablename__ = "vendas"
+    id = Column(Integer, primary_key=True)
+    price = Column(Float)
+    date = Column(DateTime)
+
+
+class Linha:
+    def __init__(self, id, date=None):
+        self.id = id
+        self.date = date
+
+
+def test_cursor_ida_e_volta():
+    for chave in [1, 123456789, [10.5, 3], ["2024-11-02T10:00:00+00:00", 42]]:
+        cursor = encode_cursor(chave)
+        assert "=" not in cursor
+        assert decode_cursor(cursor) == chave
+
+
+def test_cursor_invalido():
+    with pytest.raises(InvalidCursorError):
+        decode_cursor("não é um cursor")
+
+
+def test_split_page_com_proxima_pagina():
+    linhas = [Linha(i) for i in range(1, 5)]
+
+    pagina, proximo = split_page(linhas, "id", 3)
+
+    assert [linha.id for linha in pagina] == [1, 2, 3]
+    assert decode_cursor(proximo) == 3
+
+
+def test_split_page_ultima_pagina():
+    linhas = [Linha(i) for i in range(1, 3)]
+
+    pagina, proximo = split_page(linhas, "id", 3)
+
+    assert len(pagina) == 2
+    assert proximo is None
+
+
+def test_split_page_ordenada_por_outra_coluna():
+    data = datetime(2024, 11, 2, 10, tzinfo=timezone.utc)
+    linhas = [Linha(42, data), Linha(7, data)]
+
+    pagina, proximo = split_page(linhas, "id", 1, sort_attr="date")
+
+    assert len(pagina) == 1
+    assert decode_cursor(proximo) == ["2024-11-02T10:00:00+00:00", 42]
+
+
+def test_list_statement_carrega_so_os_campos_pedidos():
+    sql = str(list_statement(Venda, Venda.id, fields=("price",), sort_column=Venda.date))
+
+    assert "vendas.price" in sql and "vendas.id" in sql and "vendas.date" in sql
+
+    sql = str(list_statement(Venda, Venda.id, fields=("price",)))
+
+    assert "vendas.date" not in sql
+
+
+@pytest.fixture
+def vendas_com_nulos():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    precos = [30.0, None, 10.0, 30.0, None, 20.0, None, 10.0]
+    with Session(engine) as db:
+        db.add_all(Venda(id=i, price=preco) for i, preco in enumerate(precos, start=1))
+        db.commit()
+        yield db
+
+
+def todas_as_paginas(db, limite, **kwargs):
+    ids, cursor = [], None
+    while True:
+        pagina, cursor = paginate(db, Venda, Venda.id, limit=limite, after=cursor, **kwargs)
+        ids.extend(venda.id for venda in pagina)
+        if cursor is None:
+            return ids
+
+
+def test_paginacao_com_nulos_na_coluna_de_ordenacao(vendas_com_nulos):
+    db = vendas_com_nulos
+    vendas = db.query(Venda).all()
+    for descending in (False, True):
+        # Mesma ordem usada por get_sales_history: nulos por último na crescente e primeiro na decrescente
+        esperado = [
+            venda.id for venda in sorted(
+                vendas, key=lambda venda: (venda.price is None, venda.price, venda.id), reverse=descending,
+            )
+        ]
+        for limite in (1, 2, 3, 8):
+            assert todas_as_paginas(db, limite, sort_column=Venda.price, descending=descending) == esperado
+
+
+def test_cursor_com_valor_nulo(vendas_com_nulos):
+    db = vendas_com_nulos
+    pagina, proximo = paginate(db, Venda, Venda.id, limit=5, sort_column=Venda.price)
+
+    assert [venda.id for venda in pagina] == [3, 8, 6, 1, 4]
+    pagina, proximo = paginate(db, Venda, Venda.id, limit=1, after=proximo, sort_column=Venda.price)
+    assert decode_cursor(proximo) == [None, 2]
+    pagina, proximo = paginate(db, Venda, Venda.id, limit=5, after=proximo, sort_column=Venda.price)
+    assert [venda.id for venda in pagina] == [5, 7]
+    assert proximo is None
@@ -0,0 +1,28 @@
+import pytest
+from sqlalchemy import create_engine, exc
+from app.backend.database.pool import InstrumentedQueuePool, pool_options, pool_status
+
+
+def test_pool_options_do_ambiente(monkeypatch):
+    monkeypatch.setenv("DB_POOL_SIZE", "20")
+    monkeypatch.setenv("DB_POOL_PRE_PING", "false")
+    opcoes = pool_options()
+    assert opcoes["pool_size"] == 20
+    assert opcoes["max_overflow"] == 10
+    assert opcoes["pool_pre_ping"] is False
+
+
+def test_pool_conta_checkouts_e_timeouts(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool, pool_size=1, max_overflow=0, pool_timeout=0.05,
+    )
+    conexao = engine.connect()
+    with pytest.raises(exc.TimeoutError):
+        engine.connect()
+    status = pool_status(engine)
+    assert status["checked_out"] == 1
+    assert status["checkouts"] == 1
+    assert status["timeouts"] == 1
+    conexao.close()
+    assert pool_status(engine)["checked_in"] == 1
@@ -0,0 +1,113 @@
+import os
+import sys
+from types import SimpleNamespace
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+# O middleware usa os imports do backend (database.*, routes.*), relativos a app/backend.
+# Importá-los cria o motor do banco, sem conectar; a porta só precisa ser um número
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "app", "backend"))
+os.environ.setdefault("DB_PORT_PROD", "5432")
+
+import database.replicas as replicas_module
+from database.replicas import READ_YOUR_WRITES_COOKIE, READ_YOUR_WRITES_SECONDS, ReplicaSet, current_replica
+from middleware.replica import ReplicaRoutingMiddleware
+
+
+def replica(nome, saudavel=True):
+    return SimpleNamespace(name=nome, healthy=saudavel)
+
+
+def relogio(monkeypatch, inicio=1000.0):
+    agora = [inicio]
+    monkeypatch.setattr(replicas_module, "time", SimpleNamespace(monotonic=lambda: agora[0]))
+    return agora
+
+
+def test_choose_alterna_entre_as_saudaveis():
+    replicas = ReplicaSet([replica("a"), replica("b", saudavel=False), replica("c")])
+    assert [replicas.choose().name for _ in range(4)] == ["a", "c", "a", "c"]
+
+
+def test_choose_sem_replica_saudavel_retorna_none():
+    assert ReplicaSet([replica("a", saudavel=False)]).choose() is None
+    assert ReplicaSet([]).choose() is None
+    assert not ReplicaSet([])
+
+
+def test_recently_changed_dura_a_janela_de_leitura_no_primario(monkeypatch):
+    agora = relogio(monkeypatch)
+    replicas = ReplicaSet([replica("a")])
+    assert not replicas.recently_changed("sales")
+
+    replicas.mark_changed("sales")
+    assert replicas.recently_changed("sales")
+    assert not replicas.recently_changed("products")
+
+    agora[0] += READ_YOUR_WRITES_SECONDS - 0.1
+    assert replicas.recently_changed("sales")
+    agora[0] += 0.2
+    assert not replicas.recently_changed("sales")
+
+
+def test_mark_changed_sem_tabela_vale_para_todas(monkeypatch):
+    relogio(monkeypatch)
+    replicas = ReplicaSet([replica("a")])
+    replicas.mark_changed()
+    assert replicas.recently_changed("sales")
+    assert replicas.recently_changed("employees")
+
+
+def criar_cliente(replicas, status_escrita=201):
+    app = FastAPI()
+
+    @app.get("/sales/")
+    def listar():
+        escolhida = current_replica.get()
+        return {"replica": None if escolhida is None else escolhida.name}
+
+    @app.post("/sales/", status_code=status_escrita)
+    def criar():
+        return {"replica": current_replica.get()}
+
+    app.add_middleware(ReplicaRoutingMiddleware, replicas=replicas)
+    return TestClient(app)
+
+
+def test_get_le_de_uma_replica_em_rodizio():
+    cliente = criar_cliente(ReplicaSet([replica("a"), replica("b")]))
+    assert [cliente.get("/sales/").json()["replica"] for _ in range(3)] == ["a", "b", "a"]
+
+
+def test_get_sem_replica_saudavel_le_do_primario():
+    cliente = criar_cliente(ReplicaSet([replica("a", saudavel=False)]))
+    assert cliente.get("/sales/").json()["replica"] is None
+
+
+def test_escrita_envia_o_cookie_e_o_cliente_passa_a_ler_do_primario(monkeypatch):
+    relogio(monkeypatch)
+    replicas = ReplicaSet([replica("a")])
+    cliente = criar_cliente(replicas)
+
+    resposta = cliente.post("/sales/")
+    assert resposta.json() == {"replica": None}
+    cookie = resposta.headers["set-cookie"]
+    assert cookie.startswith(f"{READ_YOUR_WRITES_COOKIE}=1;")
+    assert f"Max-Age={int(READ_YOUR_WRITES_SECONDS) + 1}" in cookie
+    assert replicas.recently_changed("sales")
+
+    # O TestClient guarda o cookie, como o navegador durante o Max-Age
+    assert cliente.get("/sales/").json()["replica"] is None
+    cliente.cookies.clear()
+    assert cliente.get("/sales/").json()["replica"] == "a"
+
+
+def test_escrita_recusada_nao_envia_o_cookie(monkeypatch):
+    relogio(monkeypatch)
+    replicas = ReplicaSet([replica("a")])
+    cliente = criar_cliente(replicas, status_escrita=409)
+
+    resposta = cliente.post("/sales/")
+    assert "set-cookie" not in resposta.headers
+    assert not replicas.recently_changed("sales")
+    assert cliente.get("/sales/").json()["replica"] == "a"
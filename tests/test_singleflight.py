@@ -0,0 +1,67 @@
+import asyncio
+import os
+import sys
+import httpx
+from fastapi import FastAPI
+
+# O middleware usa os imports do backend (database.*, routes.*), relativos a app/backend.
+# Importá-los cria o motor do banco, sem conectar; a porta só precisa ser um número
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "app", "backend"))
+os.environ.setdefault("DB_PORT_PROD", "5432")
+
+from middleware.singleflight import SingleFlight, SingleFlightMiddleware
+
+
+def criar_app(flights, liberar):
+    app = FastAPI()
+    estado = {"execucoes": 0}
+
+    @app.get("/sales/")
+    async def listar():
+        estado["execucoes"] += 1
+        await liberar.wait()
+        return {"execucoes": estado["execucoes"]}
+
+    app.add_middleware(SingleFlightMiddleware, flights=flights)
+    return app, estado
+
+
+async def buscar_juntos(app, liberar, quantidade, antes_de_liberar=None):
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://teste") as cliente:
+        pedidos = [asyncio.create_task(cliente.get("/sales/")) for _ in range(quantidade)]
+        # Deixa todas as requisições chegarem ao middleware antes de o líder terminar
+        await asyncio.sleep(0.05)
+        if antes_de_liberar is not None:
+            antes_de_liberar()
+            pedidos.append(asyncio.create_task(cliente.get("/sales/")))
+            await asyncio.sleep(0.05)
+        liberar.set()
+        return await asyncio.gather(*pedidos)
+
+
+def test_gets_simultaneos_executam_a_rota_uma_vez():
+    async def cenario():
+        flights, liberar = SingleFlight(), asyncio.Event()
+        app, estado = criar_app(flights, liberar)
+        respostas = await buscar_juntos(app, liberar, 5)
+        return flights, estado, respostas
+
+    flights, estado, respostas = asyncio.run(cenario())
+    assert estado["execucoes"] == 1
+    assert all(resposta.json() == {"execucoes": 1} for resposta in respostas)
+    assert flights.stats()["executed"] == 1
+    assert flights.stats()["coalesced"] == 4
+    assert flights.stats()["in_flight"] == 0
+
+
+def test_get_depois_de_uma_escrita_nao_aproveita_a_consulta_anterior():
+    async def cenario():
+        flights, liberar = SingleFlight(), asyncio.Event()
+        app, estado = criar_app(flights, liberar)
+        respostas = await buscar_juntos(app, liberar, 2, antes_de_liberar=lambda: flights.invalidate("sales"))
+        return flights, estado, respostas
+
+    flights, estado, respostas = asyncio.run(cenario())
+    assert estado["execucoes"] == 2
+    assert flights.stats()["executed"] == 2
+    assert flights.stats()["coalesced"] == 1